@@ -0,0 +1,110 @@
+import io
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas as reportlab_canvas
+from constants import BATCH_EXPORT_WORKERS, BATCH_EXPORT_PAGE_SIZE, BATCH_EXPORT_CANCEL_POLL
+from shelf_renderer import render_bay_image, draw_page_header
+from instrumentation import get_logger
+
+log = get_logger("batch_export")
+
+def build_export_jobs(model, bays, category_colors, aspect_ratio=None):
+    """Return one picklable render job per bay: (section, aisle, side, grid, max_level, max_shelf, colors, aspect_ratio).
+
+    aspect_ratio is the cell width/height ratio of the Shelf View. Only the colors used by a bay are passed along, to keep what is sent to each worker small.
+    """
+    jobs = []
+    for section, aisle, side in bays:
+        filtered_df = model.get_filtered_data(section, aisle, side)
+        if filtered_df is None:
+            continue
+        grid = model.get_bay_grid(section, aisle, side)
+        keys = {f"{family}|{category}" for family, category in grid.values() if category}
+        colors = {key: category_colors[key] for key in keys if key in category_colors}
+        jobs.append((
+            section, aisle, side, grid,
+            int(filtered_df['Level'].max()), int(filtered_df['Shelf'].max()), colors, aspect_ratio
+        ))
+    return jobs
+
+def render_page_image(job):
+    """Render one bay to PNG bytes; runs in a worker process."""
+    section, aisle, side, grid, max_level, max_shelf, colors, aspect_ratio = job
+    width, height = BATCH_EXPORT_PAGE_SIZE
+    image = render_bay_image(
+        grid, max_level, max_shelf, colors, width=width, height=height, aspect_ratio=aspect_ratio
+    )
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=False)
+    return buffer.getvalue()
+
+def draw_image_page(pdf, png_bytes, section, aisle, side):
+    """Add one landscape letter page with the bay header and its rendered layout."""
+    x, y, width, height = draw_page_header(pdf, section, aisle, side)
+    pdf.drawImage(
+        ImageReader(io.BytesIO(png_bytes)), x, y, width=width, height=height,
+        preserveAspectRatio=True, anchor="n"
+    )
+    pdf.showPage()
+
+class BatchExport:
+    """Exports many bays to one multi-page PDF, rendering the pages in a process pool.
+
+    The export runs on a background thread that hands render jobs to worker processes
+    and writes the finished pages in bay order, straight from memory into the PDF.
+    Progress is posted to self.events as ("progress", done, total) and the outcome as
+    ("done", message), ("cancelled", message) or ("error", message); the UI polls the
+    queue from the main thread.
+    """
+
+    def __init__(self, file_path, jobs, max_workers=BATCH_EXPORT_WORKERS):
+        self.file_path = file_path
+        self.jobs = jobs
+        self.max_workers = max_workers
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Start the export in the background."""
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        """Ask the export to stop; pages not yet rendered are dropped without waiting for them."""
+        self.cancel_event.set()
+
+    def _run(self):
+        """Render the pages in worker processes and write them in order."""
+        total = len(self.jobs)
+        try:
+            pdf = reportlab_canvas.Canvas(self.file_path, pagesize=landscape(letter))
+            pdf.setTitle("Shelf Layouts")
+            # This process runs Tk and other threads, which forked workers must not inherit
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            try:
+                futures = [executor.submit(render_page_image, job) for job in self.jobs]
+                for done, (job, future) in enumerate(zip(self.jobs, futures), start=1):
+                    while not future.done() and not self.cancel_event.is_set():
+                        wait([future], timeout=BATCH_EXPORT_CANCEL_POLL)
+                    if self.cancel_event.is_set():
+                        log.info("Batch export cancelled after %s of %s pages", done - 1, total)
+                        self.events.put(("cancelled", f"Export cancelled after {done - 1} of {total} pages"))
+                        return
+                    draw_image_page(pdf, future.result(), *job[:3])
+                    self.events.put(("progress", done, total))
+            finally:
+                # Drop queued renders and leave any in flight to finish on their own
+                executor.shutdown(wait=False, cancel_futures=True)
+            pdf.save()
+            log.info("Exported %s shelf layouts to %s", total, self.file_path)
+            self.events.put(("done", f"Exported {total} shelf layouts to {self.file_path}"))
+        except Exception as e:
+            log.error("Error exporting shelf layouts: %s", e)
+            self.events.put(("error", f"Error exporting shelf layouts: {str(e)}"))
@@ -0,0 +1,131 @@
+import tkinter as tk
+from tkinter import ttk, filedialog
+from constants import LARGE_FONT, BUTTON_STYLE
+from batch_export import BatchExport, build_export_jobs
+
+class BatchExportDialog:
+    """Dialog to pick sections, aisles and sides, then export their layouts to one PDF."""
+
+    def __init__(self, root, controller, view):
+        self.root = root
+        self.controller = controller
+        self.view = view
+        self.bays = controller.model.get_bays()
+        self.export = None
+        self.poll_id = None
+
+        self.dialog = tk.Toplevel(root)
+        self.dialog.title("Export Shelf Layouts to PDF")
+        self.dialog.transient(root)
+        self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+
+        ttk.Label(self.dialog, text="Select the bays to export:", font=LARGE_FONT).pack(pady=10)
+        lists_frame = ttk.Frame(self.dialog)
+        lists_frame.pack(padx=20, fill="both", expand=True)
+        sections = sorted({section for section, _, _ in self.bays})
+        aisles = sorted({aisle for _, aisle, _ in self.bays})
+        sides = sorted({side for _, _, side in self.bays})
+        self.section_list = self.create_list(lists_frame, "Sections", sections)
+        self.aisle_list = self.create_list(lists_frame, "Aisles", aisles)
+        self.side_list = self.create_list(lists_frame, "Sides", sides)
+
+        self.status_label = ttk.Label(self.dialog, text="")
+        self.status_label.pack(pady=(10, 0))
+        self.progress_bar = ttk.Progressbar(self.dialog, mode="determinate", length=300)
+        self.progress_bar.pack(pady=5)
+
+        button_frame = ttk.Frame(self.dialog)
+        button_frame.pack(pady=10)
+        self.export_button = ttk.Button(button_frame, text="Export...", command=self.start_export, style=BUTTON_STYLE)
+        self.export_button.pack(side="left", padx=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.close, style=BUTTON_STYLE)
+        self.cancel_button.pack(side="left", padx=5)
+        self.update_status()
+
+    def create_list(self, parent, title, values):
+        """Create a titled multi-select list with every value selected."""
+        frame = ttk.Frame(parent)
+        frame.pack(side="left", padx=5, fill="both", expand=True)
+        ttk.Label(frame, text=title).pack()
+        listbox = tk.Listbox(frame, selectmode="extended", exportselection=False, height=10)
+        listbox.pack(side="left", fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=listbox.yview)
+        scrollbar.pack(side="right", fill="y")
+        listbox.config(yscrollcommand=scrollbar.set)
+        listbox.values = values
+        for value in values:
+            listbox.insert("end", value)
+        listbox.select_set(0, "end")
+        listbox.bind("<<ListboxSelect>>", lambda event: self.update_status())
+        return listbox
+
+    def selected_bays(self):
+        """Return the existing bays that match the selected sections, aisles and sides."""
+        def selected(listbox):
+            return {listbox.values[i] for i in listbox.curselection()}
+        sections, aisles, sides = selected(self.section_list), selected(self.aisle_list), selected(self.side_list)
+        return [bay for bay in self.bays if bay[0] in sections and bay[1] in aisles and bay[2] in sides]
+
+    def update_status(self):
+        """Show how many pages the current selection will produce."""
+        if self.export is None:
+            self.status_label.config(text=f"{len(self.selected_bays())} bays selected")
+
+    def start_export(self):
+        """Ask for the output file and start rendering the selected bays."""
+        bays = self.selected_bays()
+        if not bays:
+            self.view.show_message("Warning", "Please select at least one Section, Aisle and Side.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            parent=self.dialog,
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf")],
+            title="Export Shelf Layouts to PDF"
+        )
+        if not file_path:
+            return
+
+        # Assign colors for every bay up front so pages match the on-screen view
+        model = self.controller.model
+        self.view.shelf_tab.assign_category_colors(
+            assignment for bay in bays for assignment in model.get_bay_grid(*bay).values()
+        )
+        jobs = build_export_jobs(model, bays, self.view.category_colors, self.view.shelf_tab.initial_aspect_ratio)
+        self.export = BatchExport(file_path, jobs)
+        self.export.start()
+        self.export_button.config(state="disabled")
+        self.progress_bar.config(maximum=len(jobs), value=0)
+        self.status_label.config(text=f"Rendering 0 of {len(jobs)} pages...")
+        self.poll_id = self.dialog.after(100, self.poll_export)
+
+    def poll_export(self):
+        """Show progress posted by the export thread until it finishes."""
+        self.poll_id = None
+        while not self.export.events.empty():
+            event = self.export.events.get_nowait()
+            if event[0] == "progress":
+                _, done, total = event
+                self.progress_bar.config(value=done)
+                self.status_label.config(text=f"Rendering {done} of {total} pages...")
+                continue
+            kind, message = event
+            self.export = None
+            self.dialog.destroy()
+            if kind == "done":
+                self.view.show_message("Success", message)
+            elif kind == "error":
+                self.view.show_message("Error", message)
+            # A cancelled export is logged by BatchExport
+            return
+        self.poll_id = self.dialog.after(100, self.poll_export)
+
+    def close(self):
+        """Cancel a running export, or close the dialog if nothing is running."""
+        if self.export is not None:
+            self.export.cancel()
+            self.cancel_button.config(state="disabled")
+            self.status_label.config(text="Cancelling...")
+            return
+        self.dialog.destroy()
@@ -0,0 +1 @@
+# Benchmarks for the model and views on synthetic stores; run with: python -m benchmarks.run --help
@@ -0,0 +1,271 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# The app's modules live in the repository root next to this package
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import pandas as pd
+from constants import WORKING_FILE, CATALOG_CACHE_FILE, JOURNAL_FILE, ZOOM_STEP
+from instrumentation import configure_logging
+from benchmarks.synthetic_store import StoreConfig, write_store
+from benchmarks.stand_ins import RecordingCanvas, make_shelf_tab, make_table_tab
+
+def measure(func, repeat, setup=None):
+    """Run func repeat times, calling setup before each run untimed; returns timings in seconds."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def summarize(timings, **extra):
+    """Return the summary statistics of a list of timings, in milliseconds."""
+    ms = [t * 1000 for t in timings]
+    return dict(
+        runs=len(ms), min_ms=min(ms), median_ms=statistics.median(ms), mean_ms=statistics.fmean(ms),
+        max_ms=max(ms), **extra
+    )
+
+def remove_files(*paths):
+    """Delete data files written by a previous run, if present."""
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+def git_revision():
+    """Return the commit the benchmarked code is at, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(config, repeat, rng):
+    """Run every benchmark from the current directory, which must hold a synthetic store."""
+    from model import ShelfModel
+    from controller import ShelfController
+
+    results = {}
+
+    # Loading: from the Excel output file, then from the working file with a warm catalog cache
+    def load_excel_setup():
+        remove_files(WORKING_FILE, CATALOG_CACHE_FILE, JOURNAL_FILE)
+    results["load_excel"] = summarize(measure(lambda: ShelfModel(), repeat, load_excel_setup))
+    results["load_working_file"] = summarize(measure(lambda: ShelfModel(), repeat))
+
+    model = ShelfModel()
+    model.save_worker.wait()
+    controller = ShelfController(None, model, None)
+    bays = model.get_bays()
+
+    def generate():
+        model.generate_shelf_assignment()
+        model.save_worker.wait()
+    results["generate"] = summarize(measure(generate, repeat), rows=len(model.df))
+
+    # Generating overwrote the working file with an empty layout; re-import the filled-in
+    # assignments from the Excel output file for the remaining benchmarks
+    remove_files(WORKING_FILE, JOURNAL_FILE)
+    model = ShelfModel()
+    model.save_worker.wait()
+    controller.model = model
+
+    def pick_bay():
+        return bays[rng.integers(len(bays))]
+
+    def filter_cold():
+        model.bay_frames.clear()
+        model.bay_grids.clear()
+        for bay in bays:
+            model.get_filtered_data(*bay)
+            model.get_bay_grid(*bay)
+    results["filter_all_bays_cold"] = summarize(measure(filter_cold, repeat), bays=len(bays))
+
+    def random_selection():
+        first_level, last_level = sorted(rng.integers(1, config.levels + 1, 2))
+        first_shelf, last_shelf = sorted(rng.integers(1, config.shelves + 1, 2))
+        return {
+            (level, shelf)
+            for level in range(first_level, last_level + 1)
+            for shelf in range(first_shelf, last_shelf + 1)
+        }
+
+    def apply():
+        family = model.families[rng.integers(len(model.families))]
+        categories = model.categories[family]
+        category = categories[rng.integers(len(categories))]
+        model.apply_selection(random_selection(), *pick_bay(), family, category)
+    results["apply_selection"] = summarize(measure(apply, repeat * 10))
+
+    def save():
+        success, message = model.save_data()
+        model.save_worker.wait()
+    results["save"] = summarize(measure(save, repeat))
+
+    # Table View: refill the virtual window, then refresh it after a single edit
+    table_tab = make_table_tab(controller)
+    results["update_treeview"] = summarize(measure(table_tab.update_treeview, repeat * 10))
+
+    def edit_first_row():
+        model.update_cell("0", "Family", model.families[rng.integers(len(model.families))])
+    results["refresh_treeview_after_edit"] = summarize(
+        measure(table_tab.refresh_treeview, repeat * 10, edit_first_row)
+    )
+
+    # Shelf View: first visits build each bay's scene, revisits reuse the cached scene
+    canvas = RecordingCanvas()
+    shelf_tab = make_shelf_tab(controller, canvas)
+    visits = [pick_bay() for _ in range(repeat * 10)]
+
+    def draw(bay):
+        shelf_tab.draw_shelf_view(model.get_filtered_data(*bay), *bay)
+
+    timings = []
+    start_calls = canvas.calls
+    for bay in bays:
+        shelf_tab.scene_cache.clear()
+        timings.extend(measure(lambda: draw(bay), 1))
+    results["draw_shelf_view_new_bay"] = summarize(
+        timings, canvas_calls_per_draw=(canvas.calls - start_calls) / len(bays)
+    )
+
+    start_calls = canvas.calls
+    timings = [measure(lambda: draw(bay), 1)[0] for bay in visits]
+    results["draw_shelf_view_revisit"] = summarize(
+        timings, canvas_calls_per_draw=(canvas.calls - start_calls) / len(visits)
+    )
+
+    # Zooming scales the displayed scene with canvas transforms; settling refits labels and images
+    zoom_steps = iter(range(1 << 30))
+
+    def zoom():
+        factor = ZOOM_STEP if next(zoom_steps) % 2 == 0 else 1 / ZOOM_STEP
+        shelf_tab.zoom_at(canvas.width / 2, canvas.height / 2, factor)
+    start_calls = canvas.calls
+    runs = repeat * 10
+    results["zoom_step"] = summarize(measure(zoom, runs), canvas_calls_per_draw=(canvas.calls - start_calls) / runs)
+
+    def zoom_and_settle():
+        zoom()
+        shelf_tab.settle_view()
+    start_calls = canvas.calls
+    results["zoom_and_settle"] = summarize(
+        measure(zoom_and_settle, runs), canvas_calls_per_draw=(canvas.calls - start_calls) / runs
+    )
+    shelf_tab.reset_zoom()
+
+    def apply_and_repaint():
+        bay = shelf_tab.bay_key
+        cells = random_selection()
+        model.apply_selection(cells, *bay, model.families[0], model.categories[model.families[0]][0])
+        shelf_tab.repaint_cells(model.get_filtered_data(*bay), cells)
+    start_calls = canvas.calls
+    runs = repeat * 10
+    results["apply_and_repaint"] = summarize(
+        measure(apply_and_repaint, runs), canvas_calls_per_draw=(canvas.calls - start_calls) / runs
+    )
+
+    # Panorama: open a whole section, then pan through it; only bays near the window have items
+    section = bays[0][0]
+    shelf_tab.panorama_mode = "section"
+
+    def open_panorama():
+        shelf_tab.close_panorama()
+        shelf_tab.draw_panorama(section, 1)
+    start_calls = canvas.calls
+    results["panorama_open_section"] = summarize(
+        measure(open_panorama, repeat), canvas_calls_per_draw=(canvas.calls - start_calls) / repeat
+    )
+
+    pan_step = 20  # Pixels per pan event
+    height = shelf_tab.panorama.size()[1]
+    max_items = 0
+
+    def pan():
+        nonlocal max_items
+        canvas.view_y = (canvas.view_y + pan_step) % height
+        shelf_tab.cull_panorama()
+        max_items = max(max_items, len(canvas.items))
+    runs = int(height // pan_step)
+    start_calls = canvas.calls
+    timings = measure(pan, runs)
+    results["panorama_pan_step"] = summarize(
+        timings, canvas_calls_per_draw=(canvas.calls - start_calls) / runs, max_canvas_items=max_items,
+        section_bays=sum(len(row) for row in shelf_tab.panorama.rows)
+    )
+    shelf_tab.close_panorama()
+    shelf_tab.panorama_mode = None
+
+    model.save_worker.wait()
+    return results
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the shelf assignment app on a synthetic store.")
+    defaults = StoreConfig()
+    for name in ("sections", "aisles", "sides", "levels", "shelves", "families", "categories_per_family", "seed"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=getattr(defaults, name))
+    parser.add_argument("--fill", type=float, default=defaults.fill, help="Fraction of shelves with a category")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each slow benchmark (fast ones run 10x)")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write the results to")
+    parser.add_argument("--keep-store", metavar="DIR", help="Write the synthetic store to DIR and keep it")
+    parser.add_argument("--log-level", default="WARNING", help="Console log level while benchmarking")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = StoreConfig(
+        sections=args.sections, aisles=args.aisles, sides=args.sides, levels=args.levels,
+        shelves=args.shelves, families=args.families, categories_per_family=args.categories_per_family,
+        fill=args.fill, seed=args.seed
+    )
+    output_path = os.path.abspath(args.output)
+    configure_logging(args.log_level)
+
+    store_dir = args.keep_store or tempfile.mkdtemp(prefix="shelf_benchmark_")
+    print(f"Writing synthetic store with {config.shelf_count()} shelves to {store_dir}")
+    write_store(config, store_dir)
+
+    # The app resolves its data files relative to the working directory
+    previous_dir = os.getcwd()
+    os.chdir(store_dir)
+    try:
+        results = run_benchmarks(config, args.repeat, np.random.default_rng(config.seed))
+    finally:
+        os.chdir(previous_dir)
+        if not args.keep_store:
+            shutil.rmtree(store_dir, ignore_errors=True)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "store": config.to_dict(),
+        "results": results
+    }
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in results.items():
+        print(f"{name:30s} median {result['median_ms']:10.2f} ms   min {result['min_ms']:10.2f} ms")
+    print(f"Wrote benchmark results to {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+import types
+from constants import CATEGORY_PALETTE
+
+class RecordingCanvas:
+    """Headless stand-in for tk.Canvas that keeps items in a dict and counts calls.
+
+    Supports the calls the shelf view makes: item creation, coords, itemconfig, tags
+    (including "a&&b" tag expressions), delete, move/scale, scrolling and the size queries. Tags are indexed,
+    so lookups cost about what they would in Tk rather than a scan in Python.
+    """
+
+    def __init__(self, width=1000, height=600):
+        self.width = width
+        self.height = height
+        self.items = {}
+        self.tag_index = {}  # Maps each tag to the set of item IDs carrying it
+        self.next_id = 0
+        self.calls = 0
+        self.scroll_region = (0, 0, width, height)
+        self.view_x = 0  # Canvas coordinates at the window's top-left corner
+        self.view_y = 0
+
+    def _create(self, kind, coords, options):
+        self.calls += 1
+        self.next_id += 1
+        tags = options.pop("tags", ())
+        options["tags"] = (tags,) if isinstance(tags, str) else tuple(tags)
+        self.items[self.next_id] = dict(options, kind=kind, coords=list(coords))
+        for tag in options["tags"]:
+            self.tag_index.setdefault(tag, set()).add(self.next_id)
+        return self.next_id
+
+    def create_polygon(self, *coords, **options):
+        return self._create("polygon", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create("image", coords, options)
+
+    def find_withtag(self, tag_or_id):
+        """Return the IDs of the items matching an item ID, a tag, "all" or a "&&" expression."""
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        if tag_or_id == "all":
+            return list(self.items)
+        matches = None
+        for part in tag_or_id.split("&&"):
+            tagged = self.tag_index.get(part, set())
+            matches = set(tagged) if matches is None else matches & tagged
+        return sorted(matches)
+
+    def coords(self, tag_or_id, *coords):
+        self.calls += 1
+        item_ids = self.find_withtag(tag_or_id)
+        if not coords:
+            return self.items[item_ids[0]]["coords"] if item_ids else []
+        for item_id in item_ids:
+            self.items[item_id]["coords"] = list(coords)
+
+    def itemconfig(self, tag_or_id, **options):
+        self.calls += 1
+        for item_id in self.find_withtag(tag_or_id):
+            self.items[item_id].update(options)
+
+    itemconfigure = itemconfig
+
+    def addtag_withtag(self, new_tag, tag_or_id):
+        self.calls += 1
+        for item_id in self.find_withtag(tag_or_id):
+            if new_tag not in self.items[item_id]["tags"]:
+                self.items[item_id]["tags"] += (new_tag,)
+                self.tag_index.setdefault(new_tag, set()).add(item_id)
+
+    def dtag(self, tag_or_id, old_tag):
+        self.calls += 1
+        for item_id in self.find_withtag(tag_or_id):
+            self.items[item_id]["tags"] = tuple(tag for tag in self.items[item_id]["tags"] if tag != old_tag)
+            self.tag_index.get(old_tag, set()).discard(item_id)
+
+    def delete(self, tag_or_id):
+        self.calls += 1
+        for item_id in self.find_withtag(tag_or_id):
+            for tag in self.items[item_id]["tags"]:
+                self.tag_index[tag].discard(item_id)
+            del self.items[item_id]
+
+    def move(self, tag_or_id, dx, dy):
+        self.calls += 1
+        for item_id in self.find_withtag(tag_or_id):
+            coords = self.items[item_id]["coords"]
+            coords[0::2] = [cx + dx for cx in coords[0::2]]
+            coords[1::2] = [cy + dy for cy in coords[1::2]]
+
+    def scale(self, tag_or_id, x, y, sx, sy):
+        self.calls += 1
+        for item_id in self.find_withtag(tag_or_id):
+            coords = self.items[item_id]["coords"]
+            coords[0::2] = [x + (cx - x) * sx for cx in coords[0::2]]
+            coords[1::2] = [y + (cy - y) * sy for cy in coords[1::2]]
+
+    def tag_raise(self, *args):
+        self.calls += 1
+
+    def tag_lower(self, *args):
+        self.calls += 1
+
+    def configure(self, **options):
+        self.calls += 1
+        if "scrollregion" in options:
+            self.scroll_region = tuple(options["scrollregion"])
+
+    config = configure
+
+    def update_idletasks(self):
+        pass
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasx(self, x):
+        return x + self.view_x
+
+    def canvasy(self, y):
+        return y + self.view_y
+
+    def xview_moveto(self, fraction):
+        self.view_x = self.scroll_region[0] + fraction * (self.scroll_region[2] - self.scroll_region[0])
+
+    def yview_moveto(self, fraction):
+        self.view_y = self.scroll_region[1] + fraction * (self.scroll_region[3] - self.scroll_region[1])
+
+    def scan_mark(self, x, y):
+        self.scan_start = (x, y, self.view_x, self.view_y)
+
+    def scan_dragto(self, x, y, gain=10):
+        start_x, start_y, view_x, view_y = self.scan_start
+        self.view_x = view_x - (x - start_x) * gain
+        self.view_y = view_y - (y - start_y) * gain
+
+class StaticPhoto:
+    """Stand-in for ImageTk.PhotoImage that just keeps the PIL image."""
+
+    def __init__(self, image):
+        self.image = image
+
+    def width(self):
+        return self.image.size[0]
+
+    def height(self):
+        return self.image.size[1]
+
+    def paste(self, image):
+        self.image = image
+
+class RecordingTreeview:
+    """Headless stand-in for ttk.Treeview holding rows in an ordered dict."""
+
+    def __init__(self):
+        self.rows = {}
+        self.calls = 0
+        self.options = {"columns": ()}
+
+    def __getitem__(self, key):
+        return self.options[key]
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    def heading(self, *args, **kwargs):
+        pass
+
+    def column(self, *args, **kwargs):
+        pass
+
+    def get_children(self, item=""):
+        return tuple(self.rows)
+
+    def delete(self, *item_ids):
+        self.calls += 1
+        for item_id in item_ids:
+            self.rows.pop(item_id, None)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.calls += 1
+        self.rows[iid] = list(values)
+        return iid
+
+    def exists(self, item_id):
+        return item_id in self.rows
+
+    def item(self, item_id, values=None):
+        self.calls += 1
+        if values is not None:
+            self.rows[item_id] = list(values)
+        return {"values": self.rows.get(item_id, [])}
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def yview_scroll(self, number, what):
+        pass
+
+    def after_idle(self, func, *args):
+        func(*args)
+
+class NullWidget:
+    """Accepts and ignores any widget call, e.g. for dropdowns and scrollbars."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    def __setitem__(self, key, value):
+        pass
+
+class StaticVar:
+    """Stand-in for a tk StringVar."""
+
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+def make_shelf_tab(controller, canvas):
+    """Build a ShelfTab drawing onto a RecordingCanvas, without creating any Tk widgets."""
+    from shelf_tab import ShelfTab
+    from shelf_scene import ShelfSceneCache
+    view = types.SimpleNamespace(
+        category_colors={}, family_color_usage={}, available_colors=CATEGORY_PALETTE,
+        show_message=lambda title, message: None
+    )
+    shelf_tab = ShelfTab(NullWidget(), controller, view)
+    shelf_tab.canvas = canvas
+    shelf_tab.scene_cache = ShelfSceneCache(canvas, photo_factory=StaticPhoto)
+    for name in ('section_dropdown', 'aisle_dropdown', 'side_dropdown', 'family_dropdown', 'category_dropdown',
+                 'clear_button', 'fit_button', 'panorama_button'):
+        setattr(shelf_tab, name, NullWidget())
+    for name in ('section_var', 'aisle_var', 'side_var', 'family_var', 'category_var'):
+        setattr(shelf_tab, name, StaticVar())
+    view.shelf_tab = shelf_tab
+    return shelf_tab
+
+def make_table_tab(controller, visible_rows=30):
+    """Build a TableTab filling a RecordingTreeview, without creating any Tk widgets."""
+    from table_tab import TableTab
+    table_tab = TableTab(NullWidget(), controller, None)
+    table_tab.tree = RecordingTreeview()
+    table_tab.yscroll = NullWidget()
+    table_tab.visible_rows = visible_rows
+    return table_tab
@@ -0,0 +1,96 @@
+import os
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from constants import FAMILY_FILE, SHELF_INFO_FILE, OUTPUT_FILE, ASSIGNMENT_COLUMNS
+
+class StoreConfig:
+    """Size of a synthetic store; every section gets the same aisles, sides, levels and shelves."""
+
+    def __init__(self, sections=4, aisles=10, sides=2, levels=6, shelves=16, families=20,
+                 categories_per_family=30, fill=0.5, seed=0):
+        self.sections = sections
+        self.aisles = aisles
+        self.sides = sides
+        self.levels = levels
+        self.shelves = shelves
+        self.families = families
+        self.categories_per_family = categories_per_family
+        self.fill = fill  # Fraction of shelves that get a Family and Category
+        self.seed = seed
+
+    def shelf_count(self):
+        """Return the number of shelves in the store."""
+        return self.sections * self.aisles * self.sides * self.levels * self.shelves
+
+    def to_dict(self):
+        """Return the configuration as a plain dict for the results file."""
+        return dict(vars(self), shelf_count=self.shelf_count())
+
+def section_names(config):
+    """Return the section names of a store: S01, S02, ..."""
+    return [f"S{i + 1:02d}" for i in range(config.sections)]
+
+def family_catalog(config):
+    """Return {family: [categories]} with generated, multi-word category names."""
+    return {
+        f"Family {f + 1}": [f"Category {f + 1}-{c + 1} long name" for c in range(config.categories_per_family)]
+        for f in range(config.families)
+    }
+
+def write_shelf_information(config, path):
+    """Write the shelf structure workbook: one row per section."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Shelf information"
+    sheet.append(['section', 'aisles', 'sides', 'levels max', 'shelves max'])
+    for section in section_names(config):
+        sheet.append([section, config.aisles, config.sides, config.levels, config.shelves])
+    workbook.save(path)
+
+def write_family_information(config, path):
+    """Write the family workbook: one sheet per family, the family in A2 and its categories from B2."""
+    workbook = Workbook(write_only=True)
+    for number, (family, categories) in enumerate(family_catalog(config).items(), start=1):
+        sheet = workbook.create_sheet(f"{number:02d}")
+        sheet.append([f"{number:02d}"] + [f"{i:02d}" for i in range(1, len(categories) + 1)])
+        sheet.append([family] + categories)
+    workbook.save(path)
+
+def assignment_frame(config):
+    """Return a shelf assignment frame for the store with a random fill of families and categories."""
+    rng = np.random.default_rng(config.seed)
+    shape = (config.sections, config.aisles, config.sides, config.levels, config.shelves)
+    coordinates = np.indices(shape).reshape(5, -1)
+    row_count = coordinates.shape[1]
+    catalog = family_catalog(config)
+    families = np.array(list(catalog), dtype=object)
+    family_index = rng.integers(0, len(families), row_count)
+    category_index = rng.integers(0, config.categories_per_family, row_count)
+    filled = rng.random(row_count) < config.fill
+    family_values = np.where(filled, families[family_index], "")
+    category_values = np.array([
+        catalog[family][category] if family else ""
+        for family, category in zip(family_values, category_index)
+    ], dtype=object)
+    return pd.DataFrame({
+        'Section': np.array(section_names(config), dtype=object)[coordinates[0]],
+        'Aisle': coordinates[1] + 1,
+        'Side': coordinates[2] + 1,
+        'Level': coordinates[3] + 1,
+        'Shelf': coordinates[4] + 1,
+        'Family': family_values,
+        'Category': category_values
+    }, columns=ASSIGNMENT_COLUMNS)
+
+def write_store(config, directory, with_assignments=True):
+    """Write the input files of a synthetic store into a directory, named as the app expects them.
+
+    The app resolves its data files relative to the working directory, so running it from
+    this directory loads the synthetic store.
+    """
+    os.makedirs(directory, exist_ok=True)
+    write_shelf_information(config, os.path.join(directory, SHELF_INFO_FILE))
+    write_family_information(config, os.path.join(directory, FAMILY_FILE))
+    if with_assignments:
+        assignment_frame(config).to_excel(os.path.join(directory, OUTPUT_FILE), index=False)
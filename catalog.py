@@ -0,0 +1,55 @@
+import json
+import os
+from openpyxl import load_workbook
+from constants import FAMILY_FILE, CATALOG_CACHE_FILE
+
+def read_catalog(file_path=FAMILY_FILE):
+    """Read families and categories from the family workbook.
+
+    Each sheet holds one family: the family name in A2 and its categories in B2 onward.
+    Only row 2 of each sheet is parsed, from a single read-only workbook.
+    """
+    families = []
+    categories = {}
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            row = next(sheet.iter_rows(min_row=2, max_row=2, values_only=True), None)
+            if not row or row[0] is None:
+                print(f"No family in cell A2 of sheet: {sheet.title}")
+                continue
+            family = str(row[0])
+            if family:
+                families.append(family)
+                categories[family] = [str(cat) for cat in row[1:] if cat is not None]
+    finally:
+        workbook.close()
+    return families, categories
+
+def load_catalog(file_path=FAMILY_FILE, cache_path=CATALOG_CACHE_FILE):
+    """Return (families, categories), using the sidecar cache while the workbook is unchanged."""
+    stat = os.stat(file_path)
+    signature = {
+        "path": os.path.abspath(file_path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size
+    }
+
+    # Use the cached catalog if it was built from the same version of the workbook
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("source") == signature:
+            print(f"Loaded family catalog from cache: {cache_path}")
+            return cache["families"], cache["categories"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    families, categories = read_catalog(file_path)
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"source": signature, "families": families, "categories": categories}, f)
+        print(f"Wrote family catalog cache: {cache_path}")
+    except OSError as e:
+        print(f"Failed to write family catalog cache: {str(e)}")
+    return families, categories
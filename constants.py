@@ -1,21 +1,89 @@
 # File paths (relative to the current directory)
 FAMILY_FILE = "./family information.xlsx"
 SHELF_INFO_FILE = "./shelf_information.xlsx"  # New file for shelf structure
-OUTPUT_FILE = "./Shelf_Assignment_Reversed_Output.xlsx"
+CATALOG_CACHE_FILE = "./family_information_cache.json"  # Families and categories parsed from FAMILY_FILE
+OUTPUT_FILE = "./Shelf_Assignment_Reversed_Output.xlsx"  # Excel import/export format
+WORKING_FILE = "./shelf_assignment.npz"  # Columnar working store loaded at startup and written on Save
+JOURNAL_FILE = "./shelf_assignment.journal"  # Edits made since WORKING_FILE was last written
 LOGO_FILE = "./enson_logo.jpg"
 
+# Model settings
+ASSIGNMENT_COLUMNS = ['Section', 'Aisle', 'Side', 'Level', 'Shelf', 'Family', 'Category']
+CHANGE_LOG_LIMIT = 500  # Number of recent edits kept for incremental view refreshes
+JOURNAL_COMPACT_THRESHOLD = 200  # Journaled edits that trigger a background compaction
+HISTORY_LIMIT = 200  # Number of edits that can be undone
+
+# Instrumentation (see instrumentation.py)
+LOG_LEVEL_ENV = "SHELF_LOG_LEVEL"  # Environment variable with the console log level, e.g. DEBUG
+TRACE_FILE_ENV = "SHELF_TRACE_FILE"  # Environment variable naming a Chrome trace file to write timing spans to
+TRACE_EVENT_LIMIT = 200000  # Spans kept in memory per run
+
 # Styling constants
 LARGE_FONT = ('Helvetica', 14)
 DROPDOWN_FONT = ('Helvetica', 16)
 BUTTON_FONT = ('Helvetica', 16, 'bold')
 SHELF_TEXT_FONT_BASE = 4
 LABEL_FONT_BASE = 5
+SCENE_CACHE_ITEM_LIMIT = 60000  # Canvas items kept in hidden shelf scenes of recently viewed bays
+RASTER_CELL_THRESHOLD = 400  # Bays with more shelves than this are drawn as one image instead of canvas items
+RASTER_PIXELS_PER_ITEM = 100  # Image pixels counted as one canvas item against the scene cache limit
+LABEL_LAYOUT_CACHE_SIZE = 4096  # Memoized category label layouts kept by label_layout
+RASTER_VIEWPORT_MARGIN = 0.25  # Part of the visible width/height also rendered on each side of a raster scene
+
+# Shelf View zoom, pan and level of detail
+ZOOM_STEP = 1.2  # Zoom factor per mouse wheel notch
+ZOOM_MIN = 0.5  # Zoom limits, relative to the bay fitted to the canvas
+ZOOM_MAX = 8.0
+VIEW_SETTLE_DELAY_MS = 200  # Idle time after resizing, zooming or panning before labels and images are refit
+LOD_TEXT_MIN_CELL_WIDTH = 30  # Category labels are hidden on shelves narrower or lower than this (pixels)
+LOD_TEXT_MIN_CELL_HEIGHT = 20
+LOD_SIDE_MIN_DEPTH = 3  # Top and right 3D faces are hidden when the depth is below this (pixels)
+
+# Shelf View panorama of a whole aisle or section
+PANORAMA_BAY_SCALE = 0.5  # Size of each bay relative to the single-bay view
+PANORAMA_TITLE_HEIGHT = 40  # Space above each bay for its title, before scaling
+PANORAMA_PRELOAD = 0.5  # Bays within this fraction of the visible width/height beyond the window are built ahead
+PANORAMA_RELEASE = 1.0  # Bays further than this fraction beyond the window have their canvas items deleted
+
+# Batch PDF export
+BATCH_EXPORT_WORKERS = None  # Render processes; None uses one per CPU
+BATCH_EXPORT_PAGE_SIZE = (2000, 1200)  # Pixel size each bay is rendered at before it is placed on a page
+BATCH_EXPORT_CANCEL_POLL = 0.1  # Seconds between cancel checks while waiting for a page to render
+
+# Table View virtual scrolling
+TABLE_ROW_HEIGHT = 35  # Must match the Treeview rowheight in styles.py
+TABLE_ROW_BUFFER = 50  # Extra rows materialized above and below the visible window
 
 # Default colors for shelves
 SHELF_FRONT_COLOR = "#d3d3d3"
 SHELF_TOP_COLOR = "#f0f0f0"
 SHELF_RIGHT_COLOR = "#c0c0c0"
 CANVAS_BG_COLOR = "#f0f0e8"  # Changed from #ffffff (white) to a soft grayish-beige
+DEFAULT_BAR_COLORS = {'front': "gray", 'top': "lightgray", 'right': "darkgray"}  # Categories without a palette entry
+
+# Category bar colors, assigned to categories in order within each family
+CATEGORY_PALETTE = [
+    {'front': "#87CEEB", 'top': "#B0E0E6", 'right': "#5F9EA0"},
+    {'front': "#90EE90", 'top': "#ADFF2F", 'right': "#7FFF00"},
+    {'front': "#F08080", 'top': "#FF4040", 'right': "#CD5C5C"},
+    {'front': "#FFFF99", 'top': "#FFFFCC", 'right': "#EEE8AA"},
+    {'front': "#FFB6C1", 'top': "#FFC1CC", 'right': "#FF9999"},
+    {'front': "#E0FFFF", 'top': "#EFFFFF", 'right': "#B0E0E6"},
+    {'front': "#FFA07A", 'top': "#FFBB99", 'right': "#FF8C69"},
+    {'front': "#D3D3D3", 'top': "#E6E6E6", 'right': "#C0C0C0"},
+    {'front': "#98FB98", 'top': "#BFFFBA", 'right': "#90EE90"},
+    {'front': "#FFDAB9", 'top': "#FFE4C4", 'right': "#FFCC99"},
+    {'front': "#FFECB3", 'top': "#FFF9C4", 'right': "#FFD54F"},
+    {'front': "#B0C4DE", 'top': "#C6D9F1", 'right': "#9AC0CD"},
+    {'front': "#F0E68C", 'top': "#FFFACD", 'right': "#EEE8AA"},
+    {'front': "#FFE4E1", 'top': "#FFE4E4", 'right': "#FFB6C1"},
+    {'front': "#E6E6FA", 'top': "#F0F0FF", 'right': "#D8BFD8"},
+    {'front': "#FFDEAD", 'top': "#FFEFD5", 'right': "#FFCE96"},
+    {'front': "#DDA0DD", 'top': "#E6B0E6", 'right': "#DA70D6"},
+    {'front': "#F5F5DC", 'top': "#FFFFE4", 'right': "#F0EAD6"},
+    {'front': "#AFEEEE", 'top': "#C1F0F0", 'right': "#96CDCD"},
+    {'front': "#FFFACD", 'top': "#FFFDE7", 'right': "#FFFACD"},
+]
 
 # Theme and style settings for ttk widgets
 CUSTOM_FRAME_STYLE = "Custom.TFrame"
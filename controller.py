@@ -1,3 +1,11 @@
+import queue
+from tkinter import ttk, filedialog
+from model import LOAD_STEPS
+from constants import ASSIGNMENT_COLUMNS, ZOOM_STEP, VIEW_SETTLE_DELAY_MS
+from instrumentation import get_logger, span
+
+log = get_logger("controller")
+
 class ShelfController:
     def __init__(self, root, model, view):
         print("Starting ShelfController initialization")
@@ -9,19 +17,82 @@ class ShelfController:
         self.selection_rect = None
         self.clear_values_mode = False  # Toggle for clearing values during selection
         self.is_ui_ready = False  # Flag to ensure UI is ready
-        self.resize_timer = None  # Timer for debouncing resize events
+        self.settle_timer = None  # Timer for debouncing resize, zoom and pan events
+        self.loaded_steps = set()  # Model load steps finished so far (see LOAD_STEPS)
+        self.save_poll_id = None  # Pending root.after ID while waiting for background saves
         print("ShelfController initialization completed")
 
     def set_ui_ready(self):
         """Mark the UI as ready for interaction."""
         self.is_ui_ready = True
 
+    def is_loaded(self, step):
+        """Return True once the given model load step has finished."""
+        return step in self.loaded_steps
+
+    def start_loading(self):
+        """Load the model in the background and fill in the UI as each part arrives."""
+        self.view.show_loading_progress(len(LOAD_STEPS), LOAD_STEPS[0][1])
+        self.model.load_async()
+        self.view.root.after(50, self.poll_loading)
+
+    def poll_loading(self):
+        """Handle load events posted by the model's worker thread."""
+        while True:
+            try:
+                step, error = self.model.load_events.get_nowait()
+            except queue.Empty:
+                break
+            if error is not None:
+                self.view.hide_loading_progress()
+                self.view.show_message("Error", f"Failed to load data: {error}")
+                return
+            self.loaded_steps.add(step)
+            self.on_step_loaded(step)
+            if len(self.loaded_steps) == len(LOAD_STEPS):
+                self.view.hide_loading_progress()
+                print("Finished loading model data")
+                return
+            next_text = LOAD_STEPS[len(self.loaded_steps)][1]
+            self.view.update_loading_progress(len(self.loaded_steps), next_text)
+        self.view.root.after(50, self.poll_loading)
+
+    def on_step_loaded(self, step):
+        """Activate the parts of the UI that depend on a finished load step."""
+        print(f"Load step finished: {step}")
+        if step == "structure":
+            self.view.shelf_tab.set_sections(self.model.get_sections(), self.model.get_shelf_structure())
+        elif step == "families":
+            self.view.shelf_tab.set_families(self.model.families)
+            self.view.initialize_dropdowns()
+        elif step == "assignments":
+            self.view.table_tab_component.set_columns(self.get_columns())
+            self.view.table_tab_component.update_treeview()
+            self.update_shelf_view()
+
     def get_columns(self):
+        if self.model.df is None:
+            return list(ASSIGNMENT_COLUMNS)
         return list(self.model.df.columns)
 
     def get_data(self):
         return self.model.df
 
+    def get_row_count(self):
+        return self.model.get_row_count()
+
+    def get_rows(self, start, stop):
+        return self.model.get_rows(start, stop)
+
+    def get_rows_by_id(self, row_ids):
+        return self.model.get_rows_by_id(row_ids)
+
+    def get_data_version(self):
+        return self.model.version
+
+    def get_changes_since(self, version):
+        return self.model.get_changes_since(version)
+
     def get_families(self):
         return self.model.families
 
@@ -33,6 +104,62 @@ class ShelfController:
         # Only show message if there is an error during saving
         if not success:
             self.view.show_message("Warning", message)
+            return
+        self.watch_saving()
+
+    def watch_saving(self):
+        """Start polling the model's save worker unless a poll is already scheduled."""
+        if self.save_poll_id is None:
+            self.save_poll_id = self.view.root.after(100, self.poll_saving)
+
+    def poll_saving(self):
+        """Report finished background saves; keep polling while the save worker is busy."""
+        self.save_poll_id = None
+        save_worker = self.model.save_worker
+        while True:
+            try:
+                success, message = save_worker.results.get_nowait()
+            except queue.Empty:
+                break
+            # Only show message if there is an error during saving
+            if not success:
+                self.view.show_message("Warning", message)
+        if save_worker.is_busy() or not save_worker.results.empty():
+            self.watch_saving()
+
+    def import_excel(self):
+        """Replace the working data with an Excel workbook chosen by the user."""
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Excel files", "*.xlsx")],
+            title="Import Shelf Assignment from Excel"
+        )
+        if not file_path:
+            return
+        success, message = self.model.import_excel(file_path)
+        self.view.show_message("Success" if success else "Error", message)
+        if success:
+            self.view.table_tab_component.refresh_treeview()
+            self.update_shelf_view()
+            self.watch_saving()
+
+    def export_excel(self):
+        """Export the working data to an Excel workbook chosen by the user."""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx")],
+            title="Export Shelf Assignment to Excel"
+        )
+        if not file_path:
+            return
+        success, message = self.model.export_excel(file_path)
+        self.view.show_message("Success" if success else "Error", message)
+
+    def export_layouts(self):
+        """Export the shelf layouts of a selection of bays to one multi-page PDF."""
+        if not self.is_loaded("assignments"):
+            self.view.show_message("Warning", "Please wait for the shelf assignments to finish loading.")
+            return
+        self.view.open_batch_export_dialog()
 
     def generate_shelf_assignment(self):
         """Generate the shelf assignment output file and refresh the view."""
@@ -43,8 +170,9 @@ class ShelfController:
         self.view.show_message("Shelf Assignment Generation", message)
         if success:
             # Refresh the Table View and Shelf View to reflect the new data
-            self.view.table_tab_component.update_treeview()
+            self.view.table_tab_component.refresh_treeview()
             self.update_shelf_view()
+            self.watch_saving()
 
     def toggle_clear_values_mode(self):
         """Toggle the clear values mode and update the button label."""
@@ -94,8 +222,6 @@ class ShelfController:
             full_values = self.model.families
             dropdown["values"] = full_values
             current_value = str(self.model.df.at[int(row_id), "Family"])
-            if pd.isna(current_value) or current_value == "nan":
-                current_value = ""
             if current_value in full_values:
                 dropdown.set(current_value)
             else:
@@ -103,13 +229,9 @@ class ShelfController:
             print(f"Family dropdown created with values: {full_values}, current: {current_value}")
         else:
             family = str(self.model.df.at[int(row_id), "Family"])
-            if pd.isna(family) or family == "nan":
-                family = ""
             full_values = self.model.categories.get(family, ["No Categories Available"])
             dropdown["values"] = full_values
             current_value = str(self.model.df.at[int(row_id), "Category"])
-            if pd.isna(current_value) or current_value == "nan":
-                current_value = ""
             if current_value in dropdown["values"]:
                 dropdown.set(current_value)
             else:
@@ -221,6 +343,10 @@ class ShelfController:
         section = self.view.shelf_tab.section_var.get()
         aisle = self.view.shelf_tab.aisle_var.get()
         side = self.view.shelf_tab.side_var.get()
+        if not self.is_loaded("assignments"):
+            # Keep showing the reminder until the shelf assignments have loaded
+            self.view.shelf_tab.draw_shelf_view(None, section, aisle, side)
+            return
         # Ensure aisle and side are valid integers
         try:
             aisle = int(aisle) if aisle else 0
@@ -228,8 +354,11 @@ class ShelfController:
         except ValueError:
             print(f"Invalid aisle or side value: Aisle='{aisle}', Side='{side}'")
             return
+        if self.view.shelf_tab.panorama_mode is not None and section and aisle:
+            self.view.shelf_tab.draw_panorama(section, aisle)
+            return
         filtered_df = self.model.get_filtered_data(section, aisle, side)
-        print(f"Updating shelf view with filtered_df: {filtered_df.shape if filtered_df is not None else 'None'}")
+        log.debug("Updating shelf view with filtered_df: %s", filtered_df.shape if filtered_df is not None else 'None')
         self.view.shelf_tab.draw_shelf_view(filtered_df, section, aisle, side)
 
     def on_resize(self, event):
@@ -237,11 +366,6 @@ class ShelfController:
             self.view.show_message("Warning", "Please wait for the UI to fully initialize.")
             return
         
-        # Cancel any previously scheduled redraw
-        if self.resize_timer is not None:
-            self.view.root.after_cancel(self.resize_timer)
-            print("Cancelled previous resize timer")
-        
         # Update scale factor
         new_width = self.view.shelf_tab.canvas.winfo_width()
         new_height = self.view.shelf_tab.canvas.winfo_height()
@@ -250,22 +374,93 @@ class ShelfController:
         scale_width = new_width / initial_width
         scale_height = new_height / initial_height
         self.view.shelf_tab.scale_factor = min(scale_width, scale_height)
-        print(f"Window resized: new width={new_width}, new height={new_height}, scale_factor={self.view.shelf_tab.scale_factor}")
+        log.debug("Window resized: new width=%s, new height=%s, scale_factor=%s", new_width, new_height, self.view.shelf_tab.scale_factor)
         
-        # Schedule a redraw after a 200ms delay to debounce the resize event
-        self.resize_timer = self.view.root.after(200, self._perform_redraw)
-        print("Scheduled redraw after 200ms")
+        # Scale the displayed scene right away; without one, redraw once resizing stops
+        if self.view.shelf_tab.fit_to_canvas():
+            self.schedule_settle(self.view.shelf_tab.settle_view)
+        else:
+            self.schedule_settle(self.update_shelf_view)
 
-    def _perform_redraw(self):
-        """Perform the actual redraw of the shelf view after resizing."""
-        print("Performing redraw after resize")
+    def on_mouse_wheel(self, event):
+        """Zoom the shelf view around the mouse pointer."""
+        if not self.is_ui_ready or not hasattr(self.view, 'shelf_tab') or self.view.shelf_tab is None:
+            return
+        # X11 reports the wheel as buttons 4 (up) and 5 (down), Windows and macOS as a delta
+        zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+        factor = ZOOM_STEP if zoom_in else 1 / ZOOM_STEP
+        canvas = self.view.shelf_tab.canvas
+        if self.view.shelf_tab.zoom_at(canvas.canvasx(event.x), canvas.canvasy(event.y), factor):
+            self.schedule_settle(self.view.shelf_tab.settle_view)
+
+    def start_pan(self, event):
+        """Start panning the shelf view with the middle mouse button."""
+        if not self.is_ui_ready or not hasattr(self.view, 'shelf_tab') or self.view.shelf_tab is None:
+            return
+        self.view.shelf_tab.canvas.scan_mark(event.x, event.y)
+
+    def pan(self, event):
+        """Scroll the shelf view along with the mouse while panning."""
+        if not self.is_ui_ready or not hasattr(self.view, 'shelf_tab') or self.view.shelf_tab is None:
+            return
+        self.view.shelf_tab.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.view.shelf_tab.cull_panorama()
+        self.schedule_settle(self.view.shelf_tab.settle_view)
+
+    def toggle_panorama_mode(self):
+        """Cycle the Shelf View between the single bay, its whole aisle and its whole section."""
+        if not self.is_ui_ready or not hasattr(self.view, 'shelf_tab') or self.view.shelf_tab is None:
+            self.view.show_message("Warning", "Please wait for the UI to fully initialize.")
+            return
+        modes = [None, "aisle", "section"]
+        mode = modes[(modes.index(self.view.shelf_tab.panorama_mode) + 1) % len(modes)]
+        self.set_panorama_mode(mode)
         self.update_shelf_view()
-        self.resize_timer = None  # Clear the timer
+
+    def set_panorama_mode(self, mode):
+        """Switch the Shelf View to a panorama mode ("aisle" or "section") or back to a single bay (None)."""
+        self.view.shelf_tab.panorama_mode = mode
+        self.view.shelf_tab.panorama_button.config(text=f"Panorama: {mode.capitalize() if mode else 'Off'}")
+        print(f"Panorama mode: {mode or 'off'}")
+
+    def open_panorama_bay(self, event):
+        """Open the panorama bay under the mouse in the single-bay view."""
+        if not self.is_ui_ready or not hasattr(self.view, 'shelf_tab') or self.view.shelf_tab is None:
+            return
+        panorama = self.view.shelf_tab.panorama
+        if panorama is None:
+            return
+        canvas = self.view.shelf_tab.canvas
+        bay = panorama.bay_at(canvas.canvasx(event.x), canvas.canvasy(event.y))
+        if bay is None:
+            return
+        self.view.shelf_tab.select_bay(*bay)
+        self.set_panorama_mode(None)
+        self.update_shelf_view()
+
+    def reset_zoom(self):
+        """Fit the displayed bay to the canvas again."""
+        if self.view.shelf_tab.reset_zoom():
+            self.view.shelf_tab.settle_view()
+
+    def schedule_settle(self, callback):
+        """Run callback once no resize, zoom or pan event arrived for VIEW_SETTLE_DELAY_MS."""
+        if self.settle_timer is not None:
+            self.view.root.after_cancel(self.settle_timer)
+        self.settle_timer = self.view.root.after(VIEW_SETTLE_DELAY_MS, self._run_settled, callback)
+
+    def _run_settled(self, callback):
+        """Run a callback scheduled by schedule_settle."""
+        self.settle_timer = None
+        log.debug("Shelf view settled; running %s", callback.__name__)
+        callback()
 
     def start_selection(self, event):
         if not self.is_ui_ready or not hasattr(self.view, 'shelf_tab') or self.view.shelf_tab is None:
             self.view.show_message("Warning", "Please wait for the UI to fully initialize.")
             return
+        if self.view.shelf_tab.panorama is not None:
+            return  # Panoramas are for reviewing; bays are edited in the single-bay view
         # Check if any dropdown is empty
         section = self.view.shelf_tab.section_var.get()
         aisle = self.view.shelf_tab.aisle_var.get()
@@ -279,12 +474,14 @@ class ShelfController:
             self.start_x, self.start_y, self.start_x, self.start_y,
             outline="blue", dash=(2, 2)
         )
-        print(f"Started selection at ({self.start_x}, {self.start_y})")
+        log.debug("Started selection at (%s, %s)", self.start_x, self.start_y)
 
     def update_selection(self, event):
         if not self.is_ui_ready or not hasattr(self.view, 'shelf_tab') or self.view.shelf_tab is None:
             self.view.show_message("Warning", "Please wait for the UI to fully initialize.")
             return
+        if self.view.shelf_tab.panorama is not None:
+            return
         # Check if any dropdown is empty
         section = self.view.shelf_tab.section_var.get()
         aisle = self.view.shelf_tab.aisle_var.get()
@@ -296,21 +493,22 @@ class ShelfController:
         current_y = self.view.shelf_tab.canvas.canvasy(event.y)
         self.view.shelf_tab.canvas.coords(self.selection_rect, self.start_x, self.start_y, current_x, current_y)
         
-        self.selected_cells.clear()
-        for (level, shelf), (x1, y1, x2, y2) in self.view.shelf_tab.get_selection_coords().items():
-            sel_x1, sel_y1, sel_x2, sel_y2 = self.view.shelf_tab.canvas.coords(self.selection_rect)
-            if (min(sel_x1, sel_x2) <= x2 and max(sel_x1, sel_x2) >= x1 and
-                min(sel_y1, sel_y2) <= y2 and max(sel_y1, sel_y2) >= y1):
-                self.selected_cells.add((level, shelf))
-                self.view.shelf_tab.highlight_shelf(level, shelf, "lightblue")
-            else:
+        # Hit-test the grid arithmetically and restyle only the cells whose state changed
+        with span("update_selection"):
+            new_selection = self.view.shelf_tab.get_cells_in_rect(self.start_x, self.start_y, current_x, current_y)
+            for level, shelf in self.selected_cells - new_selection:
                 self.view.shelf_tab.highlight_shelf(level, shelf, "#d3d3d3")
-        print(f"Updated selection: {len(self.selected_cells)} cells selected")
+            for level, shelf in new_selection - self.selected_cells:
+                self.view.shelf_tab.highlight_shelf(level, shelf, "lightblue")
+        self.selected_cells = new_selection
+        log.debug("Updated selection: %s cells selected", len(self.selected_cells))
 
     def end_selection(self, event):
         if not self.is_ui_ready or not hasattr(self.view, 'shelf_tab') or self.view.shelf_tab is None:
             self.view.show_message("Warning", "Please wait for the UI to fully initialize.")
             return
+        if self.view.shelf_tab.panorama is not None:
+            return
         # Check if any dropdown is empty
         section = self.view.shelf_tab.section_var.get()
         aisle = self.view.shelf_tab.aisle_var.get()
@@ -322,7 +520,7 @@ class ShelfController:
         self.selection_rect = None
         self.start_x = None
         self.start_y = None
-        print(f"Ended selection with {len(self.selected_cells)} cells selected")
+        log.debug("Ended selection with %s cells selected", len(self.selected_cells))
         if self.selected_cells:
             if self.clear_values_mode:
                 self.clear_selected_values()
@@ -353,26 +551,12 @@ class ShelfController:
             self.view.show_message("Warning", "Invalid Aisle or Side value.")
             return
         
-        updated_rows = 0
-        for level, shelf in self.selected_cells:
-            mask = (
-                (self.model.df['Section'] == section) &
-                (self.model.df['Aisle'] == aisle) &
-                (self.model.df['Side'] == side) &
-                (self.model.df['Level'] == level) &
-                (self.model.df['Shelf'] == shelf)
-            )
-            row_idx = self.model.df.index[mask]
-            if not row_idx.empty:
-                row_idx = row_idx[0]
-                self.model.df.at[row_idx, 'Family'] = ""
-                self.model.df.at[row_idx, 'Category'] = ""
-                updated_rows += 1
-                print(f"Cleared row {row_idx}: Family and Category set to empty")
-        
-        print(f"Cleared Family and Category for {updated_rows} shelves")
+        success, message = self.model.clear_selection(self.selected_cells, section, aisle, side)
+        if not success:
+            self.view.show_message("Warning", message)
+        changed_cells = set(self.selected_cells)
         self.selected_cells.clear()
-        self.update_shelf_view()
+        self.refresh_cells(changed_cells)
 
     def apply_selection(self):
         if not self.is_ui_ready or not hasattr(self.view, 'shelf_tab') or self.view.shelf_tab is None:
@@ -391,11 +575,46 @@ class ShelfController:
             self.view.show_message("Warning", "Invalid Aisle or Side value.")
             return
         
-        print(f"Applying selection with Section: {section}, Aisle: {aisle}, Side: {side}, Family: {family}, Category: {category}")
+        log.info("Applying selection with Section: %s, Aisle: %s, Side: %s, Family: %s, Category: %s", section, aisle, side, family, category)
         success, message = self.model.apply_selection(self.selected_cells, section, aisle, side, family, category)
         # Only show message if there is an error
         if not success:
             self.view.show_message("Warning", message)
         if success:
+            changed_cells = set(self.selected_cells)
             self.selected_cells.clear()
+            self.refresh_cells(changed_cells)
+
+    def undo(self, event=None):
+        """Revert the most recent edit and repaint what it touched."""
+        self.apply_history_step(self.model.undo)
+
+    def redo(self, event=None):
+        """Reapply the most recently undone edit and repaint what it touched."""
+        self.apply_history_step(self.model.redo)
+
+    def apply_history_step(self, step):
+        """Run model.undo or model.redo and refresh the views incrementally."""
+        if not self.is_loaded("assignments"):
+            return
+        success, message, rows = step()
+        if not success:
+            print(message)
+            return
+        section = self.view.shelf_tab.section_var.get()
+        aisle = self.view.shelf_tab.aisle_var.get()
+        side = self.view.shelf_tab.side_var.get()
+        cells = self.model.get_cells_in_bay(rows, section, aisle, side)
+        # A panorama repaints whichever of its bays the step touched
+        if cells or self.view.shelf_tab.panorama is not None:
+            self.refresh_cells(cells)
+        self.view.table_tab_component.refresh_treeview()
+
+    def refresh_cells(self, cells):
+        """Repaint only the given (level, shelf) cells of the displayed bay after an edit."""
+        section = self.view.shelf_tab.section_var.get()
+        aisle = self.view.shelf_tab.aisle_var.get()
+        side = self.view.shelf_tab.side_var.get()
+        filtered_df = self.model.get_filtered_data(section, aisle, side)
+        if not self.view.shelf_tab.repaint_cells(filtered_df, cells):
             self.update_shelf_view()
\ No newline at end of file
@@ -0,0 +1,59 @@
+from collections import deque
+from constants import HISTORY_LIMIT
+
+class EditDiff:
+    """One undoable edit: the rows it changed and their category codes before and after.
+
+    old_codes and new_codes map each written column to a code array aligned with rows,
+    so an edit costs a few bytes per changed shelf instead of a copy of the frame.
+    """
+
+    __slots__ = ("rows", "old_codes", "new_codes")
+
+    def __init__(self, rows, old_codes, new_codes):
+        self.rows = rows
+        self.old_codes = old_codes
+        self.new_codes = new_codes
+
+    def nbytes(self):
+        """Return the memory held by the diff's arrays."""
+        return self.rows.nbytes + sum(
+            codes.nbytes for side in (self.old_codes, self.new_codes) for codes in side.values()
+        )
+
+class EditHistory:
+    """Bounded undo and redo stacks of EditDiff objects; the oldest edits fall off first."""
+
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = deque(maxlen=limit)
+
+    def record(self, diff):
+        """Push a new edit; anything that could be redone is no longer reachable."""
+        self.undo_stack.append(diff)
+        self.redo_stack.clear()
+
+    def undo(self):
+        """Move the newest edit to the redo stack and return it, or None if there is none."""
+        if not self.undo_stack:
+            return None
+        diff = self.undo_stack.pop()
+        self.redo_stack.append(diff)
+        return diff
+
+    def redo(self):
+        """Move the newest undone edit back to the undo stack and return it, or None."""
+        if not self.redo_stack:
+            return None
+        diff = self.redo_stack.pop()
+        self.undo_stack.append(diff)
+        return diff
+
+    def clear(self):
+        """Forget all edits, e.g. when the frame they refer to is replaced."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def nbytes(self):
+        """Return the memory held by both stacks."""
+        return sum(diff.nbytes() for diff in self.undo_stack) + sum(diff.nbytes() for diff in self.redo_stack)
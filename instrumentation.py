@@ -0,0 +1,160 @@
+import atexit
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from constants import LOG_LEVEL_ENV, TRACE_FILE_ENV, TRACE_EVENT_LIMIT
+
+# Parent of every application logger; get_logger("model") returns "shelf.model"
+ROOT_LOGGER_NAME = "shelf"
+
+def get_logger(name):
+    """Return the named application logger."""
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+def configure_logging(level=None):
+    """Send application log records to stdout, at the level named by SHELF_LOG_LEVEL (default INFO).
+
+    Messages keep the plain print() look of the console output. Per-shelf and per-event
+    messages are logged at DEBUG, so they are skipped without being formatted by default.
+    """
+    root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, "INFO")
+    invalid_level = None
+    if isinstance(level, str):
+        level = level.upper()
+        # getLevelName maps a known level name to its number and returns a string otherwise
+        if not isinstance(logging.getLevelName(level), int):
+            invalid_level, level = level, "INFO"
+    root_logger.setLevel(level)
+    if not root_logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        root_logger.addHandler(handler)
+        root_logger.propagate = False
+    if invalid_level is not None:
+        root_logger.warning("Unknown log level %r; using INFO", invalid_level)
+
+class Tracer:
+    """Collects timing spans and writes them as a Chrome trace (chrome://tracing, Perfetto).
+
+    Events are kept in memory, up to TRACE_EVENT_LIMIT, and written by write().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.events = []
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.origin_ns = time.perf_counter_ns()
+
+    def add(self, name, start_ns, end_ns, args):
+        """Record one complete span."""
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start_ns - self.origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": threading.get_ident()
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        with self.lock:
+            if len(self.events) < TRACE_EVENT_LIMIT:
+                self.events.append(event)
+            else:
+                self.dropped += 1
+
+    def write(self, path=None):
+        """Write the collected spans to a JSON trace file and return its path."""
+        path = path or self.path
+        with self.lock:
+            events = list(self.events)
+            dropped = self.dropped
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"Wrote {len(events)} trace events to {path}" + (f" ({dropped} dropped)" if dropped else ""))
+        return path
+
+class Span:
+    """Context manager that records the time spent in its block on the active tracer."""
+
+    __slots__ = ("name", "args", "start_ns")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # The tracer may have been turned off while the span was open
+        if tracer is not None:
+            tracer.add(self.name, self.start_ns, time.perf_counter_ns(), self.args)
+        return False
+
+class NullSpan:
+    """Shared do-nothing span handed out while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NULL_SPAN = NullSpan()
+tracer = None  # Active Tracer, or None while tracing is off
+
+def enable_tracing(path):
+    """Start collecting spans; they are written to path on exit or by write_trace()."""
+    global tracer
+    if tracer is None:
+        tracer = Tracer(path)
+        atexit.register(write_trace)
+    else:
+        tracer.path = path
+    return tracer
+
+def disable_tracing():
+    """Stop collecting spans and discard the ones collected so far."""
+    global tracer
+    tracer = None
+
+def write_trace(path=None):
+    """Write the collected spans, if tracing is on; returns the trace file path or None."""
+    if tracer is None:
+        return None
+    return tracer.write(path)
+
+def span(name, **args):
+    """Return a context manager timing a block as a named span; costs one check while tracing is off."""
+    if tracer is None:
+        return NULL_SPAN
+    return Span(name, args)
+
+def traced(name):
+    """Decorator that records every call of a function as a span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if tracer is None:
+                return func(*args, **kwargs)
+            with Span(name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Tracing is opt-in per run: SHELF_TRACE_FILE=trace.json python main.py
+if os.environ.get(TRACE_FILE_ENV):
+    enable_tracing(os.environ[TRACE_FILE_ENV])
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+
+class EditJournal:
+    """Append-only log of the edits made since the working file was last written.
+
+    Each line is one JSON record {"rows": [...], "values": {column: value}, "layout": id},
+    where a value may also be a list holding one value per row (as written by undo and redo)
+    and layout is the id of the row layout the row indices refer to. Records are
+    flushed and synced to disk as they are appended, so they survive a crash and can be
+    replayed on top of the working file at the next startup.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.epoch = 0  # Incremented whenever the journal is cleared
+        self.lock = threading.Lock()
+        self.record_count = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                self.record_count = sum(1 for _ in f)
+
+    def append(self, rows, values, layout_id=""):
+        """Append one edit record and sync it to disk."""
+        record = {"rows": [int(row) for row in rows], "values": values, "layout": layout_id}
+        line = json.dumps(record) + "\n"
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.record_count += 1
+
+    def read(self):
+        """Return all complete records in the journal, oldest first."""
+        records = []
+        with self.lock:
+            if not os.path.exists(self.path):
+                return records
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # A partially written last line from a crash; everything before it is intact
+                        print(f"Skipping incomplete journal record in {self.path}")
+                        break
+        return records
+
+    def position(self):
+        """Return an (epoch, size) marker of the current end of the journal."""
+        with self.lock:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            return self.epoch, size
+
+    def discard_before(self, position):
+        """Drop the records up to a position returned by position(), keeping later ones."""
+        epoch, size = position
+        with self.lock:
+            if epoch != self.epoch or size == 0 or not os.path.exists(self.path):
+                return
+            with open(self.path, "rb") as f:
+                f.seek(size)
+                remainder = f.read()
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(remainder)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self.record_count = remainder.count(b"\n")
+
+    def clear(self):
+        """Remove every record, e.g. when the data they apply to is replaced."""
+        with self.lock:
+            self.epoch += 1
+            self.record_count = 0
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,69 @@
+from functools import lru_cache
+from constants import LABEL_LAYOUT_CACHE_SIZE
+
+def layout_label(category, cell_width, cell_height):
+    """Return the (font_size, lines) layout of a category label for a shelf of the given size.
+
+    Cell sizes are rounded to whole pixels so that redraws and resizes at the same size
+    reuse the memoized layout.
+    """
+    return fit_label(category, int(round(cell_width)), int(round(cell_height)))
+
+@lru_cache(maxsize=LABEL_LAYOUT_CACHE_SIZE)
+def fit_label(category, cell_width, cell_height):
+    """Find the font size and word-wrapped lines that fit a category label inside a shelf.
+
+    The result only depends on the arguments, so it is memoized; callers should pass
+    quantized cell sizes (see layout_label) to get cache hits across redraws.
+    """
+    # Step 1: Calculate the maximum font size based on shelf dimensions
+    max_width = cell_width - 20  # Padding to prevent overflow
+    max_height = cell_height - 20  # Padding to prevent overflow
+
+    # Start with a conservative font size
+    font_size = int(cell_width / 15)
+    font_size = max(font_size, 6)  # Minimum font size
+
+    # Split the text into words
+    words = category.split()  # Split at spaces
+    lines = []
+
+    # Step 2: Adjust font size and calculate lines to fit within the shelf
+    while font_size > 6:  # Minimum font size
+        avg_char_width = font_size * 0.7  # Adjusted multiplier for better fit
+        max_chars_per_line = int(max_width / avg_char_width)
+
+        # Split text into lines based on the current font size
+        lines = []
+        current_line = []
+        current_char_count = 0
+
+        for word in words:
+            word_length = len(word)
+            # Account for the space between words (1 char per space)
+            space_needed = 1 if current_line else 0
+            if current_char_count + word_length + space_needed <= max_chars_per_line:
+                current_line.append(word)
+                current_char_count += word_length + space_needed
+            else:
+                if current_line:
+                    lines.append(" ".join(current_line))
+                current_line = [word]
+                current_char_count = word_length
+        if current_line:
+            lines.append(" ".join(current_line))
+
+        # Check if the text fits within the shelf dimensions
+        line_spacing = font_size * 1.1
+        total_text_height = len(lines) * line_spacing
+        fits_width = all(len(line) * avg_char_width <= max_width for line in lines)
+        fits_height = total_text_height <= max_height
+
+        if fits_width and fits_height:
+            break  # Font size is good
+        font_size -= 1  # Reduce font size and try again
+
+    # Step 3: Reduce font size by 30% as requested
+    font_size = int(font_size * 0.7)
+    font_size = max(font_size, 6)  # Ensure minimum font size
+    return font_size, tuple(lines)
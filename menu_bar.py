@@ -8,5 +8,27 @@ def create_menu_bar(root, controller):
     # File menu
     file_menu = tk.Menu(menubar, tearoff=0)
     menubar.add_cascade(label="File", menu=file_menu)
+    file_menu.add_command(label="Import from Excel...", command=controller.import_excel)
+    file_menu.add_command(label="Export to Excel...", command=controller.export_excel)
+    file_menu.add_command(label="Export Shelf Layouts to PDF...", command=controller.export_layouts)
+    file_menu.add_separator()
     file_menu.add_command(label="Exit", command=root.quit)
-    print("Created menu bar")
\ No newline at end of file
+    
+    # Edit menu
+    edit_menu = tk.Menu(menubar, tearoff=0)
+    menubar.add_cascade(label="Edit", menu=edit_menu)
+    edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=controller.undo)
+    edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=controller.redo)
+    bind_edit_shortcut(root, "<Control-z>", controller.undo)
+    bind_edit_shortcut(root, "<Control-y>", controller.redo)
+    bind_edit_shortcut(root, "<Control-Shift-Z>", controller.redo)
+    print("Created menu bar")
+
+def bind_edit_shortcut(root, sequence, command):
+    """Bind an undo/redo shortcut app-wide, except in text fields, which keep it for their own editing."""
+    def on_shortcut(event):
+        # ttk Entry and Combobox widgets are tk.Entry subclasses
+        if isinstance(event.widget, (tk.Entry, tk.Text)):
+            return
+        command(event)
+    root.bind(sequence, on_shortcut)
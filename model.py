@@ -1,17 +1,94 @@
+import numpy as np
 import pandas as pd
 import os
-from constants import FAMILY_FILE, SHELF_INFO_FILE, OUTPUT_FILE
+import queue
+import threading
+import uuid
+from constants import (FAMILY_FILE, SHELF_INFO_FILE, OUTPUT_FILE, WORKING_FILE, JOURNAL_FILE,
+                       CHANGE_LOG_LIMIT, JOURNAL_COMPACT_THRESHOLD, ASSIGNMENT_COLUMNS)
+from storage import save_frame, load_frame
+from catalog import load_catalog
+from journal import EditJournal
+from save_worker import SaveWorker
+from history import EditDiff, EditHistory
+from instrumentation import get_logger, traced
+
+log = get_logger("model")
+
+# Columns stored as categoricals, with "" as the empty value, and the small unsigned coordinate columns
+CATEGORICAL_COLUMNS = ['Section', 'Family', 'Category']
+COORDINATE_COLUMNS = ['Aisle', 'Side', 'Level', 'Shelf']
+
+def normalize_frame(df):
+    """Convert an assignment frame to compact dtypes and return it.
+
+    Section, Family and Category become categoricals in which empty cells (NaN from Excel)
+    are the "" category, and the coordinates become uint16. Rows with a blank coordinate
+    are dropped; a coordinate that is not a whole number from 1 to 65535 raises ValueError.
+    """
+    coordinates = df[COORDINATE_COLUMNS].apply(pd.to_numeric)
+    blank = coordinates.isna().any(axis=1)
+    if blank.any():
+        log.warning("Skipping %s rows with a blank Aisle, Side, Level or Shelf", int(blank.sum()))
+        df = df[~blank].reset_index(drop=True)
+        coordinates = coordinates[~blank].reset_index(drop=True)
+    limit = np.iinfo(np.uint16).max
+    for column in COORDINATE_COLUMNS:
+        values = coordinates[column]
+        invalid = (values < 1) | (values > limit) | (values % 1 != 0)
+        if invalid.any():
+            examples = values[invalid].unique()[:5].tolist()
+            raise ValueError(f"{column} values must be whole numbers from 1 to {limit}; found {examples}")
+    for column in CATEGORICAL_COLUMNS:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            if "" not in values.cat.categories:
+                values = values.cat.add_categories([""])
+            df[column] = values.fillna("")
+        else:
+            df[column] = values.fillna("").astype(str).astype("category")
+            if "" not in df[column].cat.categories:
+                df[column] = df[column].cat.add_categories([""])
+    for column in COORDINATE_COLUMNS:
+        df[column] = coordinates[column].astype(np.uint16)
+    return df
+
+def build_bay_grid(filtered_df):
+    """Build a {(level, shelf): (family, category)} lookup for one bay in a single pass."""
+    cells = zip(filtered_df['Level'].tolist(), filtered_df['Shelf'].tolist())
+    values = zip(filtered_df['Family'].tolist(), filtered_df['Category'].tolist())
+    return dict(zip(cells, values))
+
+# Background load steps in order, with the progress text shown while each one runs
+LOAD_STEPS = [
+    ("structure", "Loading shelf structure..."),
+    ("families", "Loading families and categories..."),
+    ("assignments", "Loading shelf assignments...")
+]
 
 class ShelfModel:
-    def __init__(self):
+    def __init__(self, autoload=True):
         self.df = None
+        self.location_index = {}  # Maps (section, aisle, side, level, shelf) to a row index
+        self.bay_index = {}  # Maps (section, aisle, side) to an array of row positions
+        self.bay_frames = {}  # Cached per-bay frames, dropped when a bay is written to
+        self.bay_grids = {}  # Cached per-bay (level, shelf) -> (family, category) grids, dropped the same way
+        self.version = 0  # Incremented on every change to self.df
+        self.change_log = []  # (version, changed row indices or None for a full reload)
+        self.layout_id = ""  # Id of the row layout of self.df, stamped into the working file and journal
         self.families = []
         self.categories = {}  # Maps family to list of categories
         self.shelf_structure = {}  # Maps section to its configuration
         self.sections = []  # List of sections
-        self.load_shelf_structure()  # Load shelf structure first
-        self.load_data()
+        self.load_events = None  # Queue of (step, error) events while loading in the background
+        self.journal = EditJournal(JOURNAL_FILE)  # Edits not yet folded into the working file
+        self.history = EditHistory()  # Undo/redo stacks of compact edit diffs
+        self.save_worker = SaveWorker(self._write_snapshot)  # Writes the working file off the main thread
+        if autoload:
+            self.load_shelf_structure()  # Load shelf structure first
+            self.load_data()
 
+    @traced("load_shelf_structure")
     def load_shelf_structure(self):
         """Load the shelf structure from the shelf information Excel file."""
         try:
@@ -49,70 +126,209 @@ class ShelfModel:
             
             # Populate sections list
             self.sections = list(self.shelf_structure.keys())
-            print(f"Loaded shelf structure: {self.shelf_structure}")
-            print(f"Sections: {self.sections}")
+            log.debug("Loaded shelf structure: %s", self.shelf_structure)
+            log.info("Sections: %s", self.sections)
             
         except Exception as e:
-            print(f"Error loading shelf structure: {str(e)}")
+            log.error("Error loading shelf structure: %s", e)
             raise
 
     def load_data(self):
-        """Load data from the Excel files."""
+        """Load the working data and the family information."""
+        self.load_families()
+        self.load_assignments()
+
+    @traced("load_families")
+    def load_families(self):
+        """Load the families and their categories from the family information file."""
         try:
-            # Read the output file if it exists
-            if os.path.exists(OUTPUT_FILE):
-                self.df = pd.read_excel(OUTPUT_FILE)
-                print(f"Read output file. Rows: {len(self.df)}")
-                print(f"Columns in output file: {list(self.df.columns)}")
+            self.families, self.categories = load_catalog(FAMILY_FILE)
+            log.debug("Families loaded: %s", self.families)
+            log.debug("Categories loaded: %s", self.categories)
+        except Exception as e:
+            log.error("Error loading families: %s", e)
+            raise
+
+    @traced("load_assignments")
+    def load_assignments(self):
+        """Load the shelf assignments from the working file, importing the Excel output file the first time."""
+        try:
+            output_df = None
+            from_working_file = os.path.exists(WORKING_FILE)
+            layout_id = None
+            if from_working_file:
+                output_df, layout_id = load_frame(WORKING_FILE)
+                log.info("Read working file. Rows: %s", len(output_df))
+            elif os.path.exists(OUTPUT_FILE):
+                output_df = pd.read_excel(OUTPUT_FILE)
+                log.info("Imported output file %s. Rows: %s", OUTPUT_FILE, len(output_df))
             else:
-                # If the file doesn't exist, set df to None; it will be generated later
-                self.df = None
-                print(f"Output file {OUTPUT_FILE} does not exist. It will be generated if needed.")
+                # If neither file exists, output_df stays None; it will be generated later
+                log.info("Output file %s does not exist. It will be generated if needed.", OUTPUT_FILE)
+            if output_df is not None:
+                log.debug("Columns in working data: %s", list(output_df.columns))
+            self.set_frame(output_df, layout_id)
+            if output_df is not None and not from_working_file:
+                save_frame(self.df, WORKING_FILE, self.layout_id)
+                log.info("Created working file: %s", WORKING_FILE)
             
-            # Read family information to get families and categories
-            xls = pd.ExcelFile(FAMILY_FILE)
-            for sheet_name in xls.sheet_names:
-                df = pd.read_excel(FAMILY_FILE, sheet_name=sheet_name)
-                print(f"\nReading sheet: {sheet_name}")
-                print(f"First few rows of the sheet:\n{df.head()}")
-                
-                # Read family name from cell A2 (row 2 in Excel, index 0 in pandas)
-                family_row = 0
-                family = str(df.iloc[family_row, 0]) if not pd.isna(df.iloc[family_row, 0]) else ""
-                print(f"Family in cell A2 (row 2, index {family_row}): {family}")
-                
-                if family:
-                    category_row = family_row
-                    categories = df.iloc[category_row, 1:].dropna().tolist()
-                    print(f"Raw categories in row 2 (B2 onward, index {category_row}): {categories}")
-                    categories = [str(cat) for cat in categories]
-                    print(f"Categories after converting to strings: {categories}")
-                    
-                    self.families.append(family)
-                    self.categories[family] = categories
-            print(f"\nFamilies loaded: {self.families}")
-            print(f"Categories loaded: {self.categories}")
-            
-            # Ensure Family and Category columns exist if df is loaded
-            if self.df is not None:
-                if 'Family' not in self.df.columns:
-                    self.df['Family'] = ""
-                if 'Category' not in self.df.columns:
-                    self.df['Category'] = ""
+            # Edits journaled after the working file was last written are replayed on top of it
+            if from_working_file:
+                self.replay_journal()
+            else:
+                self.journal.clear()
         except Exception as e:
-            print(f"Error loading data: {str(e)}")
+            log.error("Error loading data: %s", e)
             raise
 
+    def replay_journal(self):
+        """Apply the unsaved edits recorded in the journal, then fold them into the working file."""
+        records = self.journal.read()
+        if not records:
+            return
+        row_count = len(self.df)
+        replayed = 0
+        for record in records:
+            # Row indices of records made before the frame was replaced refer to another layout
+            if record.get("layout", "") != self.layout_id:
+                continue
+            replayed += 1
+            rows = np.asarray(record["rows"], dtype=np.int64)
+            in_range = (rows >= 0) & (rows < row_count)
+            values = record["values"]
+            if any(isinstance(value, list) for value in values.values()):
+                # Undo and redo write a separate value per row
+                codes = {}
+                for column, labels in values.items():
+                    labels = np.asarray(labels, dtype=object)[in_range]
+                    self.add_categories(column, labels.tolist())
+                    codes[column] = self.df[column].cat.categories.get_indexer(labels)
+                self.write_codes(rows[in_range], codes, journal=False)
+            else:
+                self.write_values(rows[in_range].tolist(), values, journal=False, record=False)
+        skipped = len(records) - replayed
+        log.info("Replayed %s unsaved edits from %s", replayed, self.journal.path)
+        if skipped:
+            log.warning("Skipped %s journaled edits made before the data was replaced", skipped)
+        self.compact_async()
+
+    def compact_async(self):
+        """Fold the journal into the working file on the save worker's thread.
+
+        The frame is snapshotted here, on the calling thread, together with its layout id
+        and the end of the journal it includes. Back-to-back requests are coalesced by the
+        save worker.
+        """
+        if self.df is None:
+            return
+        self.save_worker.submit((self.df.copy(), self.layout_id, self.journal.position()))
+
+    @traced("save")
+    def _write_snapshot(self, job):
+        """Write a snapshot to the working file and drop the journal records it contains."""
+        snapshot, layout_id, journal_position = job
+        save_frame(snapshot, WORKING_FILE, layout_id)
+        self.journal.discard_before(journal_position)
+        log.info("Updated data saved to: %s", WORKING_FILE)
+        return f"Data saved successfully to {WORKING_FILE}"
+
+    def load_async(self):
+        """Load the model on a worker thread, reporting each finished step on self.load_events.
+
+        Events are (step, error) tuples in LOAD_STEPS order, where error is None on success.
+        Loading stops at the first failed step. Tk must not be touched from the worker, so
+        the UI polls the queue from the main thread.
+        """
+        self.load_events = queue.Queue()
+        worker = threading.Thread(target=self._load_worker, daemon=True)
+        worker.start()
+
+    def _load_worker(self):
+        """Run the load steps in order on the worker thread."""
+        loaders = {
+            "structure": self.load_shelf_structure,
+            "families": self.load_families,
+            "assignments": self._load_or_generate_assignments
+        }
+        for step, _ in LOAD_STEPS:
+            try:
+                loaders[step]()
+            except Exception as e:
+                self.load_events.put((step, str(e)))
+                return
+            self.load_events.put((step, None))
+
+    def _load_or_generate_assignments(self):
+        """Load the shelf assignments, generating them if neither data file exists."""
+        self.load_assignments()
+        if self.df is None:
+            log.info("No shelf assignment data found. Generating a new one...")
+            success, message = self.generate_shelf_assignment()
+            if not success:
+                raise RuntimeError(message)
+
+    def set_frame(self, df, layout_id=None):
+        """Replace the assignment data and rebuild everything derived from it.
+
+        layout_id identifies the row layout of df; a frame without one gets a new id, so
+        journal records made against the previous frame are never replayed onto it.
+        """
+        # Ensure Family and Category columns exist if df is loaded
+        if df is not None:
+            if 'Family' not in df.columns:
+                df['Family'] = ""
+            if 'Category' not in df.columns:
+                df['Category'] = ""
+            df = normalize_frame(df)
+        self.df = df
+        self.layout_id = layout_id if layout_id is not None else uuid.uuid4().hex
+        self.history.clear()  # Diffs hold category codes of the previous frame
+        self.build_location_index()
+        self.build_bay_index()
+        self.mark_changed()
+
     def save_data(self):
-        """Save the updated data back to the Excel file."""
+        """Save the updated data to the working file.
+
+        Edits are already durable in the journal, so this only hands a snapshot to the
+        save worker; the outcome of the write is posted to self.save_worker.results.
+        """
+        if self.df is None:
+            return False, "Error saving data: no data loaded"
+        self.compact_async()
+        log.info("Scheduled save to: %s", WORKING_FILE)
+        return True, f"Saving data to {WORKING_FILE}"
+
+    @traced("import_excel")
+    def import_excel(self, file_path):
+        """Replace the working data with the contents of an Excel workbook."""
+        try:
+            df = pd.read_excel(file_path)
+            missing = [col for col in ASSIGNMENT_COLUMNS[:5] if col not in df.columns]
+            if missing:
+                return False, f"Excel file missing required columns: {missing}"
+            self.set_frame(df)
+            # The journaled edits carry the old layout id, so they are skipped by replay and
+            # dropped once the imported data is written to the working file
+            self.compact_async()
+            log.info("Imported %s rows from %s", len(self.df), file_path)
+            return True, f"Imported {len(self.df)} rows from {file_path}"
+        except Exception as e:
+            log.error("Error importing Excel file: %s", e)
+            return False, f"Error importing Excel file: {str(e)}"
+
+    @traced("export_excel")
+    def export_excel(self, file_path=OUTPUT_FILE):
+        """Write the working data to an Excel workbook."""
         try:
-            self.df.to_excel(OUTPUT_FILE, index=False)
-            print(f"Updated data saved to: {OUTPUT_FILE}")
-            return True, f"Data saved successfully to {OUTPUT_FILE}"
+            self.df.to_excel(file_path, index=False)
+            log.info("Exported data to: %s", file_path)
+            return True, f"Data exported successfully to {file_path}"
         except Exception as e:
-            print(f"Error saving data: {str(e)}")
-            return False, f"Error saving data: {str(e)}"
+            log.error("Error exporting data: %s", e)
+            return False, f"Error exporting data: {str(e)}"
 
+    @traced("apply_selection")
     def apply_selection(self, selected_cells, section, aisle, side, family, category):
         """Apply the selected Family and Category to the selected shelves in the DataFrame."""
         if not section or not aisle or not side or not family or not category:
@@ -121,95 +337,312 @@ class ShelfModel:
         if not selected_cells:
             return False, "Please select at least one shelf in the grid."
         
-        updated_rows = 0
-        for level, shelf in selected_cells:
-            mask = (
-                (self.df['Section'] == section) &
-                (self.df['Aisle'] == int(aisle)) &
-                (self.df['Side'] == int(side)) &
-                (self.df['Level'] == level) &
-                (self.df['Shelf'] == shelf)
-            )
-            row_idx = self.df.index[mask]
-            if not row_idx.empty:
-                row_idx = row_idx[0]
-                self.df.at[row_idx, 'Family'] = family
-                self.df.at[row_idx, 'Category'] = category
-                updated_rows += 1
-                print(f"Updated row {row_idx}: Family={family}, Category={category}")
-        print(f"Applied Family: {family}, Category: {category} to {updated_rows} shelves")
+        rows = self.get_row_indices(selected_cells, section, aisle, side)
+        self.set_family_category(rows, family, category)
+        updated_rows = len(rows)
+        log.info("Applied Family: %s, Category: %s to %s shelves", family, category, updated_rows)
         return True, f"Family and Category values applied to {updated_rows} shelves."
 
+    @traced("clear_selection")
+    def clear_selection(self, selected_cells, section, aisle, side):
+        """Clear the Family and Category of the selected shelves in the DataFrame."""
+        if not section or not aisle or not side:
+            return False, "Please select Section, Aisle, and Side values."
+        
+        rows = self.get_row_indices(selected_cells, section, aisle, side)
+        self.set_family_category(rows, "", "")
+        updated_rows = len(rows)
+        log.info("Cleared Family and Category for %s shelves", updated_rows)
+        return True, f"Family and Category values cleared for {updated_rows} shelves."
+
+    def build_location_index(self):
+        """Build the (Section, Aisle, Side, Level, Shelf) to row index lookup.
+
+        Writes only ever touch Family and Category, so the index stays valid until
+        self.df is replaced (load or generation), which rebuilds it.
+        """
+        if self.df is None:
+            self.location_index = {}
+            return
+        keys = zip(
+            self.df['Section'].astype(str).tolist(),
+            self.df['Aisle'].astype(int).tolist(),
+            self.df['Side'].astype(int).tolist(),
+            self.df['Level'].astype(int).tolist(),
+            self.df['Shelf'].astype(int).tolist()
+        )
+        self.location_index = dict(zip(keys, self.df.index.tolist()))
+        log.info("Built location index with %s shelves", len(self.location_index))
+
+    def build_bay_index(self):
+        """Partition the rows into (Section, Aisle, Side) bays for constant-time lookups."""
+        self.bay_frames = {}
+        self.bay_grids = {}
+        if self.df is None:
+            self.bay_index = {}
+            return
+        groups = self.df.groupby([
+            self.df['Section'].astype(str),
+            self.df['Aisle'].astype(int),
+            self.df['Side'].astype(int)
+        ], sort=False).indices
+        self.bay_index = {
+            (section, int(aisle), int(side)): positions
+            for (section, aisle, side), positions in groups.items()
+        }
+        log.info("Built bay index with %s bays", len(self.bay_index))
+
+    def invalidate_bays(self, rows):
+        """Drop the cached frames and grids of the bays containing the given row indices."""
+        if not (self.bay_frames or self.bay_grids) or len(rows) == 0:
+            return
+        bays = self.df.loc[rows, ['Section', 'Aisle', 'Side']].drop_duplicates()
+        for section, aisle, side in bays.itertuples(index=False):
+            key = (str(section), int(aisle), int(side))
+            self.bay_frames.pop(key, None)
+            self.bay_grids.pop(key, None)
+
+    def get_row_indices(self, selected_cells, section, aisle, side):
+        """Return the row indices of the selected (level, shelf) cells in one bay."""
+        section = str(section)
+        aisle = int(aisle)
+        side = int(side)
+        rows = []
+        for level, shelf in selected_cells:
+            row_idx = self.location_index.get((section, aisle, side, int(level), int(shelf)))
+            if row_idx is not None:
+                rows.append(row_idx)
+        return rows
+
+    def set_family_category(self, rows, family, category):
+        """Set Family and Category for the given row indices in one batch update."""
+        self.write_values(rows, {'Family': family, 'Category': category})
+
+    def write_values(self, rows, values, journal=True, record=True):
+        """Write {column: value} to the given row indices as one batch and record the change.
+
+        Every edit goes through here so that it is journaled for crash recovery, shows up
+        in the change log and can be undone; journal=False and record=False are used when
+        replaying the journal itself.
+        """
+        if not rows:
+            return
+        for column, value in values.items():
+            if column in CATEGORICAL_COLUMNS:
+                self.add_categories(column, [value])
+        positions = np.asarray(rows, dtype=np.int64)
+        old_codes = self.get_codes(positions, values) if record else None
+        self.df.loc[rows, list(values)] = list(values.values())
+        if record:
+            self.record_diff(positions, old_codes, self.get_codes(positions, values))
+        self.invalidate_bays(rows)
+        self.mark_changed(rows)
+        if journal:
+            self.log_edit(rows, values)
+
+    def write_codes(self, rows, codes, journal=True):
+        """Write per-row category codes, {column: codes aligned with rows}, as one vectorized batch."""
+        for column, column_codes in codes.items():
+            values = self.df[column]
+            all_codes = values.cat.codes.to_numpy().copy()
+            all_codes[rows] = column_codes
+            self.df[column] = pd.Categorical.from_codes(all_codes, dtype=values.dtype)
+        rows = rows.tolist()
+        self.invalidate_bays(rows)
+        self.mark_changed(rows)
+        if journal:
+            labels = {
+                column: self.df[column].cat.categories.take(column_codes).tolist()
+                for column, column_codes in codes.items()
+            }
+            self.log_edit(rows, labels)
+
+    def log_edit(self, rows, values):
+        """Append an edit to the journal, compacting it in the background once it grows large."""
+        self.journal.append(rows, values, self.layout_id)
+        # A compaction already in flight will pick these records up or leave them for the next one;
+        # requesting another now would only copy the whole frame again
+        if self.journal.record_count >= JOURNAL_COMPACT_THRESHOLD and not self.save_worker.is_busy():
+            self.compact_async()
+
+    def get_codes(self, positions, columns):
+        """Return {column: category codes at the given row positions} for categorical columns."""
+        return {
+            column: self.df[column].cat.codes.to_numpy()[positions]
+            for column in columns if column in CATEGORICAL_COLUMNS
+        }
+
+    def record_diff(self, positions, old_codes, new_codes):
+        """Push the rows whose codes actually changed onto the undo stack."""
+        if not old_codes:
+            return
+        changed = np.zeros(len(positions), dtype=bool)
+        for column in old_codes:
+            changed |= old_codes[column] != new_codes[column]
+        if not changed.any():
+            return
+        self.history.record(EditDiff(
+            positions[changed].astype(np.int32),
+            {column: codes[changed] for column, codes in old_codes.items()},
+            {column: codes[changed] for column, codes in new_codes.items()}
+        ))
+
+    @traced("undo")
+    def undo(self):
+        """Revert the most recent edit; returns (success, message, changed row indices)."""
+        diff = self.history.undo()
+        if diff is None:
+            return False, "Nothing to undo", []
+        self.write_codes(diff.rows, diff.old_codes)
+        log.info("Undid edit of %s shelves", len(diff.rows))
+        return True, f"Undid edit of {len(diff.rows)} shelves", diff.rows.tolist()
+
+    @traced("redo")
+    def redo(self):
+        """Reapply the most recently undone edit; returns (success, message, changed row indices)."""
+        diff = self.history.redo()
+        if diff is None:
+            return False, "Nothing to redo", []
+        self.write_codes(diff.rows, diff.new_codes)
+        log.info("Redid edit of %s shelves", len(diff.rows))
+        return True, f"Redid edit of {len(diff.rows)} shelves", diff.rows.tolist()
+
+    def add_categories(self, column, values):
+        """Make sure the given values are categories of a categorical column before writing them."""
+        missing = [value for value in dict.fromkeys(values) if value not in self.df[column].cat.categories]
+        if missing:
+            self.df[column] = self.df[column].cat.add_categories(missing)
+
+    def mark_changed(self, rows=None):
+        """Record a change to the given row indices, or to the whole frame if rows is None."""
+        self.version += 1
+        self.change_log.append((self.version, None if rows is None else list(rows)))
+        if len(self.change_log) > CHANGE_LOG_LIMIT:
+            del self.change_log[:len(self.change_log) - CHANGE_LOG_LIMIT]
+
+    def get_changes_since(self, version):
+        """Return the set of row indices changed after version, or None if a full refresh is needed."""
+        if version == self.version:
+            return set()
+        if version is None or not self.change_log or self.change_log[0][0] > version + 1:
+            return None  # Older than the retained log
+        changed = set()
+        for entry_version, rows in self.change_log:
+            if entry_version <= version:
+                continue
+            if rows is None:
+                return None
+            changed.update(rows)
+        return changed
+
     def update_cell(self, row_id, column_name, value):
         """Update a specific cell in the DataFrame."""
-        self.df.at[int(row_id), column_name] = value
+        values = {column_name: value}
         if column_name == "Family":
-            self.df.at[int(row_id), "Category"] = ""  # Reset Category if Family changes
+            values["Category"] = ""  # Reset Category if Family changes
+        self.write_values([int(row_id)], values)
         return list(self.df.iloc[int(row_id)])
 
+    @traced("get_filtered_data")
     def get_filtered_data(self, section, aisle, side):
         """Get filtered data for the selected Section, Aisle, and Side."""
         if not section or not aisle or not side:
-            print(f"Cannot filter data: Section='{section}', Aisle='{aisle}', Side='{side}'")
+            log.debug("Cannot filter data: Section='%s', Aisle='%s', Side='%s'", section, aisle, side)
             return None
         if self.df is None:
-            print("Dataframe is not loaded.")
-            return None
-        filtered_df = self.df[
-            (self.df['Section'] == section) &
-            (self.df['Aisle'] == int(aisle)) &
-            (self.df['Side'] == int(side))
-        ]
-        if filtered_df.empty:
-            print(f"No data found for Section='{section}', Aisle='{aisle}', Side='{side}'")
+            log.debug("Dataframe is not loaded.")
             return None
+        key = (str(section), int(aisle), int(side))
+        filtered_df = self.bay_frames.get(key)
+        if filtered_df is None:
+            positions = self.bay_index.get(key)
+            if positions is None or len(positions) == 0:
+                log.debug("No data found for Section='%s', Aisle='%s', Side='%s'", section, aisle, side)
+                return None
+            filtered_df = self.df.iloc[positions]
+            self.bay_frames[key] = filtered_df
         return filtered_df
 
+    def get_cells_in_bay(self, rows, section, aisle, side):
+        """Return the (level, shelf) cells of the given row indices that belong to one bay."""
+        if self.df is None or not section or not aisle or not side:
+            return set()
+        subset = self.df.iloc[rows]
+        in_bay = subset[(subset['Section'] == str(section)) & (subset['Aisle'] == int(aisle)) & (subset['Side'] == int(side))]
+        return set(zip(in_bay['Level'].tolist(), in_bay['Shelf'].tolist()))
+
+    @traced("get_bay_grid")
+    def get_bay_grid(self, section, aisle, side):
+        """Return a {(level, shelf): (family, category)} grid of a bay, with "" for empty values."""
+        filtered_df = self.get_filtered_data(section, aisle, side)
+        if filtered_df is None:
+            return {}
+        key = (str(section), int(aisle), int(side))
+        grid = self.bay_grids.get(key)
+        if grid is None:
+            grid = build_bay_grid(filtered_df)
+            self.bay_grids[key] = grid
+        return grid
+
+    def get_row_count(self):
+        """Return the number of rows in the DataFrame."""
+        return 0 if self.df is None else len(self.df)
+
+    def get_rows(self, start, stop):
+        """Return (row_id, values) pairs for the rows in positions [start, stop)."""
+        if self.df is None:
+            return []
+        window = self.df.iloc[start:stop]
+        return list(zip(window.index.tolist(), window.values.tolist()))
+
+    def get_rows_by_id(self, row_ids):
+        """Return (row_id, values) pairs for the given row indices."""
+        if self.df is None or not row_ids:
+            return []
+        rows = self.df.loc[list(row_ids)]
+        return list(zip(rows.index.tolist(), rows.values.tolist()))
+
     def get_unique_values(self, column):
         """Get unique values for a given column in the DataFrame."""
         if self.df is None or column not in self.df.columns:
             return []
-        return sorted(self.df[column].unique().tolist())
+        # "" is the empty value of the categorical columns, not a value to offer or filter by
+        return sorted(value for value in self.df[column].unique().tolist() if value != "")
 
+    @traced("generate_shelf_assignment")
     def generate_shelf_assignment(self):
-        """Generate the shelf assignment output file based on shelf structure."""
+        """Generate the shelf assignment data based on shelf structure and save it in the background."""
         try:
-            data = []
+            sections = []
+            coordinates = []
             for section, config in self.shelf_structure.items():
-                aisles = config["aisles"]
-                sides = config["sides"]
-                max_levels = config["max_levels"]
-                max_shelves = config["max_shelves"]
-                
-                for aisle in range(1, aisles + 1):
-                    for side in range(1, sides + 1):
-                        for level in range(1, max_levels + 1):
-                            for shelf in range(1, max_shelves + 1):
-                                data.append({
-                                    'Section': section,
-                                    'Aisle': aisle,
-                                    'Side': side,
-                                    'Level': level,
-                                    'Shelf': shelf,
-                                    'Family': '',
-                                    'Category': ''
-                                })
+                shape = (config["aisles"], config["sides"], config["max_levels"], config["max_shelves"])
+                # Every (aisle, side, level, shelf) combination in loop order, numbered from 1
+                section_coordinates = np.indices(shape).reshape(4, -1) + 1
+                coordinates.append(section_coordinates)
+                sections.append(np.full(section_coordinates.shape[1], section, dtype=object))
             
-            # Create DataFrame and save to Excel
-            output_df = pd.DataFrame(data)
-            output_df.to_excel(OUTPUT_FILE, index=False)
+            coordinates = np.concatenate(coordinates, axis=1) if coordinates else np.empty((4, 0), dtype=int)
+            row_count = coordinates.shape[1]
+            output_df = pd.DataFrame({
+                'Section': np.concatenate(sections) if sections else np.empty(0, dtype=object),
+                'Aisle': coordinates[0],
+                'Side': coordinates[1],
+                'Level': coordinates[2],
+                'Shelf': coordinates[3],
+                'Family': np.full(row_count, "", dtype=object),
+                'Category': np.full(row_count, "", dtype=object)
+            })
+            self.set_frame(output_df)
             
-            # Reload the data to update the model
-            self.df = pd.read_excel(OUTPUT_FILE)
-            if 'Family' not in self.df.columns:
-                self.df['Family'] = ""
-            if 'Category' not in self.df.columns:
-                self.df['Category'] = ""
-                
-            print(f"Shelf assignment generated and saved to {OUTPUT_FILE}")
-            return True, f"Shelf assignment generated and saved to {OUTPUT_FILE}"
+            # Journaled edits carry the old layout id, so replay skips them whichever working
+            # file a crash leaves behind; they are dropped once the compaction thread has written the new one
+            self.compact_async()
+            
+            log.info("Shelf assignment generated with %s shelves; saving to %s", row_count, WORKING_FILE)
+            return True, f"Shelf assignment generated with {row_count} shelves and saved to {WORKING_FILE}"
         except Exception as e:
-            print(f"Error generating shelf assignment: {str(e)}")
+            log.error("Error generating shelf assignment: %s", e)
             return False, f"Error generating shelf assignment: {str(e)}"
 
     def get_shelf_structure(self):
@@ -218,4 +651,8 @@ class ShelfModel:
 
     def get_sections(self):
         """Return the list of sections."""
-        return self.sections
\ No newline at end of file
+        return self.sections
+
+    def get_bays(self):
+        """Return the (section, aisle, side) keys of every bay with data, in sorted order."""
+        return sorted(self.bay_index)
\ No newline at end of file
@@ -0,0 +1,60 @@
+import queue
+import threading
+
+class SaveWorker:
+    """Runs save jobs one at a time on a background thread.
+
+    Jobs are handed over with submit() and written by the write function given to the
+    constructor. Only the newest waiting job is kept: a job submitted while another one
+    is being written replaces any older waiting job, so a burst of saves costs at most
+    one extra write. The outcome of each write is posted to self.results as a
+    (success, message) tuple, for the UI to collect from the main thread.
+    """
+
+    def __init__(self, write):
+        self.write = write
+        self.results = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending = None  # Newest job waiting to be written
+        self.thread = None  # Worker thread, or None while idle
+
+    def submit(self, job):
+        """Queue a job for writing, replacing any job that has not started yet."""
+        with self.lock:
+            if self.pending is not None:
+                print("Coalesced save request with a newer one")
+            self.pending = job
+            if self.thread is None:
+                # Not a daemon thread, so a save in progress finishes before the app exits
+                self.thread = threading.Thread(target=self._run)
+                self.thread.start()
+
+    def is_busy(self):
+        """Return True while a job is waiting or being written."""
+        with self.lock:
+            return self.thread is not None
+
+    def wait(self):
+        """Block until every submitted job has been written."""
+        while True:
+            with self.lock:
+                thread = self.thread
+            if thread is None:
+                return
+            thread.join()
+
+    def _run(self):
+        """Write waiting jobs until there are none left."""
+        while True:
+            with self.lock:
+                job = self.pending
+                self.pending = None
+                if job is None:
+                    self.thread = None
+                    return
+            try:
+                message = self.write(job)
+                self.results.put((True, message))
+            except Exception as e:
+                print(f"Error saving data: {str(e)}")
+                self.results.put((False, f"Error saving data: {str(e)}"))
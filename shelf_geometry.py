@@ -0,0 +1,157 @@
+import math
+from constants import LABEL_FONT_BASE, LOD_TEXT_MIN_CELL_WIDTH, LOD_TEXT_MIN_CELL_HEIGHT, LOD_SIDE_MIN_DEPTH
+
+# Size of the drawing area the base cell sizes are computed for (before scaling)
+CANVAS_WIDTH_BASE = 1000
+CANVAS_HEIGHT_BASE = 600
+
+class ShelfGeometry:
+    """Layout of one bay's shelf grid: cell sizes, 3D depth and the grid offset on the canvas."""
+
+    def __init__(self, max_level, max_shelf, cell_width, cell_height, depth, offset_x, offset_y, scale_factor):
+        self.max_level = max_level
+        self.max_shelf = max_shelf
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.depth = depth
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.scale_factor = scale_factor
+        label_font_size = int(LABEL_FONT_BASE * scale_factor)
+        self.label_font = ('Helvetica', max(label_font_size, 6))
+
+    def key(self):
+        """Return a tuple identifying this layout, used to skip redundant re-layouts."""
+        return (self.max_level, self.max_shelf, self.cell_width, self.cell_height,
+                self.depth, self.offset_x, self.offset_y)
+
+    def scaled(self, x, y, factor):
+        """Return this layout zoomed by factor around the canvas point (x, y).
+
+        Every position in the layout is linear in its parameters, so the result matches
+        what canvas.scale(tag, x, y, factor, factor) does to the items of the layout.
+        """
+        return ShelfGeometry(
+            self.max_level, self.max_shelf, self.cell_width * factor, self.cell_height * factor,
+            self.depth * factor, x + (self.offset_x - x) * factor, y + (self.offset_y - y) * factor,
+            self.scale_factor * factor
+        )
+
+    def moved(self, dx, dy):
+        """Return this layout shifted by (dx, dy) on the canvas."""
+        return ShelfGeometry(
+            self.max_level, self.max_shelf, self.cell_width, self.cell_height,
+            self.depth, self.offset_x + dx, self.offset_y + dy, self.scale_factor
+        )
+
+    def detail(self):
+        """Return the level of detail (show_text, show_sides) for the cell size of this layout."""
+        show_text = self.cell_width >= LOD_TEXT_MIN_CELL_WIDTH and self.cell_height >= LOD_TEXT_MIN_CELL_HEIGHT
+        show_sides = self.depth >= LOD_SIDE_MIN_DEPTH
+        return show_text, show_sides
+
+    def cell_rect(self, level, shelf):
+        """Return the (x1, y1, x2, y2) front rectangle of a shelf; level 1 is the bottom row."""
+        display_row = self.max_level - level
+        x1 = (shelf - 1) * self.cell_width + self.offset_x
+        y1 = display_row * self.cell_height + self.offset_y
+        return x1, y1, x1 + self.cell_width, y1 + self.cell_height
+
+    def cell_faces(self, level, shelf):
+        """Return the front, top and right polygon coordinates of a shelf."""
+        x1, y1, x2, y2 = self.cell_rect(level, shelf)
+        d = self.depth
+        front = (x1 + d, y1, x2 + d, y1, x2, y2, x1, y2)
+        top = (x1 + d, y1, x2 + d, y1, x2, y1 - d, x1, y1 - d)
+        right = (x2 + d, y1, x2, y1 - d, x2 - d, y2 - d, x2, y2)
+        return front, top, right
+
+    def bar_faces(self, level, shelf):
+        """Return the front, top and right polygon coordinates of a shelf's category bar."""
+        x1, y1, x2, y2 = self.cell_rect(level, shelf)
+        d = self.depth
+        bar_height = self.cell_height * 0.4  # 40% of the shelf height
+        bar_x1 = x1 + d  # Span the full width of the shelf
+        bar_x2 = x2 + d
+        bar_y1 = (y1 + y2) / 2 - bar_height / 2  # Center the bar vertically
+        bar_y2 = bar_y1 + bar_height
+        front = (bar_x1, bar_y1, bar_x2, bar_y1, bar_x2, bar_y2, bar_x1, bar_y2)
+        top = (bar_x1, bar_y1, bar_x2, bar_y1, bar_x2 - d, bar_y1 - d, bar_x1 - d, bar_y1 - d)
+        right = (bar_x2, bar_y1, bar_x2 - d, bar_y1 - d, bar_x2 - d, bar_y2 - d, bar_x2, bar_y2)
+        return front, top, right
+
+    def text_center(self, level, shelf):
+        """Return the center point of a shelf's category text."""
+        x1, y1, x2, y2 = self.cell_rect(level, shelf)
+        return (x1 + x2) / 2 + self.depth / 2, (y1 + y2) / 2
+
+    def cells_in_rect(self, x1, y1, x2, y2):
+        """Return the set of (level, shelf) cells whose front rectangle overlaps the given rectangle.
+
+        Computed from the uniform grid spacing, so the cost depends on the size of the
+        selection rather than on the number of cells in the bay.
+        """
+        left, right = min(x1, x2), max(x1, x2)
+        top, bottom = min(y1, y2), max(y1, y2)
+        # Column c spans [offset_x + c * cell_width, offset_x + (c + 1) * cell_width]
+        first_col = max(math.ceil((left - self.offset_x) / self.cell_width - 1), 0)
+        last_col = min(math.floor((right - self.offset_x) / self.cell_width), self.max_shelf - 1)
+        # Display row r (0 at the top) spans [offset_y + r * cell_height, offset_y + (r + 1) * cell_height]
+        first_row = max(math.ceil((top - self.offset_y) / self.cell_height - 1), 0)
+        last_row = min(math.floor((bottom - self.offset_y) / self.cell_height), self.max_level - 1)
+        return {
+            (self.max_level - row, col + 1)
+            for row in range(first_row, last_row + 1)
+            for col in range(first_col, last_col + 1)
+        }
+
+    def bounds(self):
+        """Return the (x1, y1, x2, y2) box covering the grid, its 3D edges and the S/L labels."""
+        x1 = self.offset_x - 50 * self.scale_factor - self.depth
+        y1 = self.offset_y - 30 * self.scale_factor - self.depth
+        x2 = self.offset_x + self.max_shelf * self.cell_width + self.depth
+        y2 = self.offset_y + self.max_level * self.cell_height
+        return math.floor(x1), math.floor(y1), math.ceil(x2) + 1, math.ceil(y2) + 1
+
+    def shelf_label_position(self, shelf):
+        """Return the position of the S<n> label above a shelf column."""
+        x = (shelf - 1) * self.cell_width + self.offset_x + self.cell_width / 2
+        y = self.offset_y - self.depth - 10 * self.scale_factor
+        return x, y
+
+    def level_label_position(self, level):
+        """Return the position of the L<n> label left of a level row."""
+        display_row = self.max_level - level
+        x = self.offset_x - self.depth - 30 * self.scale_factor
+        y = display_row * self.cell_height + self.offset_y + self.cell_height / 2
+        return x, y
+
+def base_cell_size(max_level, max_shelf):
+    """Return the unscaled (cell_width, cell_height) of a bay."""
+    return min(CANVAS_WIDTH_BASE // max_shelf, 60), min(CANVAS_HEIGHT_BASE // max_level, 80)
+
+def compute_geometry(max_level, max_shelf, scale_factor, canvas_width, canvas_height, aspect_ratio=None):
+    """Compute the centered grid layout of a bay for the given canvas size and scale factor.
+
+    If aspect_ratio is given, the cell height is adjusted so cells keep that width/height ratio.
+    """
+    cell_width_base, cell_height_base = base_cell_size(max_level, max_shelf)
+
+    # Apply the scale factor to maintain aspect ratio
+    cell_width = cell_width_base * scale_factor
+    cell_height = cell_height_base * scale_factor
+    if aspect_ratio is not None and abs(cell_width / cell_height - aspect_ratio) > 0.01:
+        cell_height = cell_width / aspect_ratio
+
+    # Scale the depth dynamically
+    depth = 10 * scale_factor
+
+    # Center the shelf grid in the canvas, including space for labels
+    label_space_left = 50 * scale_factor
+    label_space_top = 30 * scale_factor
+    total_width = max_shelf * cell_width + depth + label_space_left
+    total_height = max_level * cell_height + depth + label_space_top
+    offset_x = (canvas_width - total_width) // 2 + label_space_left
+    offset_y = (canvas_height - total_height) // 2 + label_space_top
+
+    return ShelfGeometry(max_level, max_shelf, cell_width, cell_height, depth, offset_x, offset_y, scale_factor)
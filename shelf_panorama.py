@@ -0,0 +1,172 @@
+import math
+from constants import PANORAMA_TITLE_HEIGHT, PANORAMA_PRELOAD, PANORAMA_RELEASE
+from shelf_geometry import CANVAS_WIDTH_BASE, CANVAS_HEIGHT_BASE, compute_geometry
+from shelf_scene import create_scene
+from shelf_raster import tk_photo
+from instrumentation import get_logger
+
+log = get_logger("shelf_panorama")
+
+class ShelfPanorama:
+    """Bays of an aisle or a section laid out side by side on one scrollable canvas.
+
+    rows holds the (section, aisle, side) keys of the bays, one list per aisle. Every bay
+    gets a slot of the same size, laid out with compute_geometry() like the single-bay
+    view. Only bays in or near the visible part of the canvas have a scene; bays that
+    scroll far enough out of view have theirs destroyed, so the number of canvas items
+    stays bounded by the window size rather than by the size of the section.
+    """
+
+    def __init__(self, canvas, rows, scale, aspect_ratio, get_size, paint_bay, photo_factory=tk_photo):
+        self.canvas = canvas
+        self.rows = rows
+        self.scale = scale
+        self.aspect_ratio = aspect_ratio
+        self.get_size = get_size  # (section, aisle, side) -> (max_level, max_shelf), or None for an empty bay
+        self.paint_bay = paint_bay  # (scene, (section, aisle, side)) -> paints the scene from the model
+        self.photo_factory = photo_factory
+        self.sizes = {}
+        self.live = {}  # (row, col) -> (scene or None, title item ID) of the bays that have canvas items
+        self.next_id = 0
+
+    def slot_size(self):
+        """Return the (width, height) of one bay's slot, including its title."""
+        return CANVAS_WIDTH_BASE * self.scale, (CANVAS_HEIGHT_BASE + PANORAMA_TITLE_HEIGHT) * self.scale
+
+    def size(self):
+        """Return the (width, height) of the whole panorama."""
+        slot_width, slot_height = self.slot_size()
+        return max(len(row) for row in self.rows) * slot_width, len(self.rows) * slot_height
+
+    def row_of(self, aisle):
+        """Return the row index of an aisle, or None if it isn't part of the panorama."""
+        for index, row in enumerate(self.rows):
+            if row and row[0][1] == aisle:
+                return index
+        return None
+
+    def bay_geometry(self, row, col):
+        """Return the geometry of a bay in its slot, or None if the bay has no shelves."""
+        bay = self.rows[row][col]
+        if bay not in self.sizes:
+            self.sizes[bay] = self.get_size(bay)
+        if self.sizes[bay] is None:
+            return None
+        max_level, max_shelf = self.sizes[bay]
+        slot_width, slot_height = self.slot_size()
+        title_height = PANORAMA_TITLE_HEIGHT * self.scale
+        geometry = compute_geometry(
+            max_level, max_shelf, self.scale, slot_width, slot_height - title_height, self.aspect_ratio
+        )
+        return geometry.moved(col * slot_width, row * slot_height + title_height)
+
+    def slots_in(self, x1, y1, x2, y2):
+        """Return the (row, col) slots overlapping a canvas box."""
+        slot_width, slot_height = self.slot_size()
+        first_row = max(int(math.floor(y1 / slot_height)), 0)
+        last_row = min(int(math.floor(y2 / slot_height)), len(self.rows) - 1)
+        slots = set()
+        for row in range(first_row, last_row + 1):
+            first_col = max(int(math.floor(x1 / slot_width)), 0)
+            last_col = min(int(math.floor(x2 / slot_width)), len(self.rows[row]) - 1)
+            slots.update((row, col) for col in range(first_col, last_col + 1))
+        return slots
+
+    def slots_near(self, viewport, fraction):
+        """Return the slots within fraction of the viewport's size beyond its edges."""
+        x1, y1, x2, y2 = viewport
+        margin_x = (x2 - x1) * fraction
+        margin_y = (y2 - y1) * fraction
+        return self.slots_in(x1 - margin_x, y1 - margin_y, x2 + margin_x, y2 + margin_y)
+
+    def update(self, viewport):
+        """Build the bays coming into view and release those far out of it; returns (built, released)."""
+        wanted = self.slots_near(viewport, PANORAMA_PRELOAD)
+        # Release with a wider margin than preloading, so panning back and forth doesn't rebuild bays
+        kept = self.slots_near(viewport, PANORAMA_RELEASE)
+        released = [slot for slot in self.live if slot not in kept]
+        for slot in released:
+            self.release(slot)
+        built = [slot for slot in sorted(wanted) if slot not in self.live]
+        for slot in built:
+            self.build(*slot)
+        if built or released:
+            log.debug("Panorama built %s and released %s bays; %s bays live", len(built), len(released), len(self.live))
+        return len(built), len(released)
+
+    def build(self, row, col):
+        """Create the scene and title of one bay and paint it from the model."""
+        bay = self.rows[row][col]
+        slot_width, slot_height = self.slot_size()
+        section, aisle, side = bay
+        title_id = self.canvas.create_text(
+            (col + 0.5) * slot_width, row * slot_height + PANORAMA_TITLE_HEIGHT * self.scale / 2,
+            text=f"Section {section} - Aisle {aisle} - Side {side}", font=self.title_font(),
+            fill="black", anchor="center", tags="panorama_title"
+        )
+        geometry = self.bay_geometry(row, col)
+        scene = None
+        if geometry is not None:
+            self.next_id += 1
+            scene = create_scene(
+                self.canvas, geometry.max_level, geometry.max_shelf, f"panorama_{self.next_id}", self.photo_factory
+            )
+            scene.layout(geometry)
+            self.paint_bay(scene, bay)
+        self.live[(row, col)] = (scene, title_id)
+
+    def release(self, slot):
+        """Delete the canvas items of one bay."""
+        scene, title_id = self.live.pop(slot)
+        if scene is not None:
+            scene.destroy()
+        self.canvas.delete(title_id)
+
+    def title_font(self):
+        """Return the font of the bay titles at the current scale."""
+        return ('Helvetica', max(int(round(12 * self.scale)), 6), 'bold')
+
+    def rescale(self, scale):
+        """Scale every live bay to a new scale with canvas transforms; slots scale around the canvas origin.
+
+        Returns the factor canvas positions were scaled by.
+        """
+        factor = scale / self.scale
+        self.scale = scale
+        self.canvas.scale("panorama_title", 0, 0, factor, factor)
+        for (row, col), (scene, title_id) in self.live.items():
+            if scene is not None:
+                scene.transform(self.bay_geometry(row, col))
+        return factor
+
+    def refresh(self):
+        """Repaint the shelves of live bays that changed in the model."""
+        for (row, col), (scene, title_id) in self.live.items():
+            if scene is not None:
+                self.paint_bay(scene, self.rows[row][col])
+
+    def settle(self):
+        """Refit label fonts and re-render raster bays once zooming or panning stops."""
+        self.canvas.itemconfig("panorama_title", font=self.title_font())
+        for scene, title_id in self.live.values():
+            if scene is not None:
+                scene.refit_text()
+                scene.flush()
+
+    def bay_at(self, x, y):
+        """Return the (section, aisle, side) of the bay at a canvas point, or None."""
+        slot_width, slot_height = self.slot_size()
+        row = int(math.floor(y / slot_height))
+        col = int(math.floor(x / slot_width))
+        if 0 <= row < len(self.rows) and 0 <= col < len(self.rows[row]):
+            return self.rows[row][col]
+        return None
+
+    def item_count(self):
+        """Return the number of canvas items held by the live bays."""
+        return sum(1 + (scene.item_count() if scene is not None else 0) for scene, title_id in self.live.values())
+
+    def clear(self):
+        """Delete the canvas items of every bay."""
+        for slot in list(self.live):
+            self.release(slot)
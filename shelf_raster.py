@@ -0,0 +1,266 @@
+from PIL import Image
+from constants import SHELF_FRONT_COLOR, CANVAS_BG_COLOR, RASTER_PIXELS_PER_ITEM, RASTER_VIEWPORT_MARGIN
+from shelf_renderer import bay_drawing, render_commands
+from instrumentation import get_logger, traced
+
+log = get_logger("shelf_raster")
+
+def tk_photo(image):
+    """Convert a PIL image to a Tk photo image (needs a Tk root window)."""
+    from PIL import ImageTk
+    return ImageTk.PhotoImage(image)
+
+def canvas_viewport(canvas):
+    """Return the (x1, y1, x2, y2) canvas box that is visible in the window."""
+    x1 = canvas.canvasx(0)
+    y1 = canvas.canvasy(0)
+    return x1, y1, x1 + max(canvas.winfo_width(), 1), y1 + max(canvas.winfo_height(), 1)
+
+class RasterShelfScene:
+    """A bay layout drawn into one image item instead of thousands of canvas items.
+
+    Has the same interface as ShelfScene. Painting a shelf only records its state; flush()
+    then renders the whole bay with PIL and swaps the image in, so redraws and resizes cost
+    pixels rather than canvas items. Only the visible part of the bay plus a margin is
+    rendered, so zooming in doesn't grow the image. Highlighted shelves are drawn as small
+    polygons on top of the image, so dragging a selection doesn't re-render the bay.
+    """
+
+    def __init__(self, canvas, max_level, max_shelf, tag="scene", photo_factory=tk_photo):
+        self.canvas = canvas
+        self.max_level = max_level
+        self.max_shelf = max_shelf
+        self.tag = tag
+        self.highlight_tag = f"{tag}_highlight"
+        self.photo_factory = photo_factory
+        self.geometry = None
+        self.layout_key = None
+        self.visible = True
+        self.version = None  # Model data version the scene was last painted at
+        self.dirty = True  # Image is out of date with the layout or the painted shelves
+        self.show_text = True  # Level of detail, see ShelfGeometry.detail()
+        self.show_sides = True
+
+        self.image_id = None
+        self.photo = None  # Keeps the Tk photo alive while the canvas shows it
+        self.image = None  # Last rendered PIL image and the canvas box it covers
+        self.image_box = None
+        # (family, category, front, top, right) currently painted on each shelf; None for an empty shelf
+        self.painted = {cell: None for cell in self.cells()}
+        self.highlights = {}  # Overlay item ID and color of each highlighted shelf
+
+        # Budget against the scene cache as the pixels of a canvas-sized image
+        self.canvas.update_idletasks()
+        pixels = max(self.canvas.winfo_width(), 1) * max(self.canvas.winfo_height(), 1)
+        self.cost = max(pixels // RASTER_PIXELS_PER_ITEM, 1)
+
+    def cells(self):
+        """Iterate over all (level, shelf) cells of the layout."""
+        for level in range(1, self.max_level + 1):
+            for shelf in range(1, self.max_shelf + 1):
+                yield level, shelf
+
+    def has_cell(self, cell):
+        """Return True if the (level, shelf) cell is part of the layout."""
+        return cell in self.painted
+
+    def layout(self, geometry):
+        """Switch to the given geometry; the image is re-rendered on the next flush()."""
+        self.geometry = geometry
+        if geometry.key() == self.layout_key:
+            return False
+        self.layout_key = geometry.key()
+        self.dirty = True
+        for (level, shelf), (item_id, color) in self.highlights.items():
+            self.canvas.coords(item_id, *geometry.cell_faces(level, shelf)[0])
+        self.set_detail(*geometry.detail())
+        return True
+
+    def transform(self, geometry):
+        """Scale the current image and highlights to a uniformly scaled geometry until the next flush()."""
+        if geometry.key() == self.layout_key:
+            self.geometry = geometry
+            return False
+        old = self.geometry
+        factor_x = geometry.cell_width / old.cell_width
+        factor_y = geometry.cell_height / old.cell_height
+        self.canvas.scale(self.tag, 0, 0, factor_x, factor_y)
+        self.canvas.move(self.tag, geometry.offset_x - old.offset_x * factor_x, geometry.offset_y - old.offset_y * factor_y)
+        self.geometry = geometry
+        self.layout_key = geometry.key()
+        self.dirty = True
+        self.set_detail(*geometry.detail())
+
+        # Stretch the last image as a preview, unless it would outgrow what flush() renders
+        if self.image is not None:
+            width = max(int(self.image.size[0] * factor_x), 1)
+            height = max(int(self.image.size[1] * factor_y), 1)
+            if width * height <= self.max_pixels():
+                self.image = self.image.resize((width, height), Image.BILINEAR)
+                self._show_image(self.image, self.canvas.coords(self.image_id)[:2])
+            else:
+                self.image = None
+                self.canvas.itemconfig(self.image_id, state="hidden")
+        return True
+
+    def refit_text(self):
+        """Nothing to do: flush() renders the labels at the current cell size."""
+        return False
+
+    def set_detail(self, show_text, show_sides):
+        """Drop the category labels and the 3D side faces from the next rendered image."""
+        if (show_text, show_sides) != (self.show_text, self.show_sides):
+            self.show_text = show_text
+            self.show_sides = show_sides
+            self.dirty = True
+
+    def paint_cell(self, level, shelf, family, category, colors):
+        """Record the category bar and label of a shelf; a no-op if nothing changed."""
+        state = (family, category, colors['front'], colors['top'], colors['right']) if category else None
+        if self.painted.get((level, shelf), None) == state:
+            return False
+        self.painted[(level, shelf)] = state
+        self.dirty = True
+        return True
+
+    def viewport(self):
+        """Return the canvas box that is visible in the window."""
+        return canvas_viewport(self.canvas)
+
+    def max_pixels(self):
+        """Return the pixel size of the largest image flush() renders: the viewport plus its margins."""
+        x1, y1, x2, y2 = self.viewport()
+        return int((x2 - x1) * (y2 - y1) * (1 + 2 * RASTER_VIEWPORT_MARGIN) ** 2)
+
+    def render_box(self):
+        """Return the part of the bay to render: its bounds clipped to the viewport plus margins."""
+        bounds = self.geometry.bounds()
+        x1, y1, x2, y2 = self.viewport()
+        margin_x = (x2 - x1) * RASTER_VIEWPORT_MARGIN
+        margin_y = (y2 - y1) * RASTER_VIEWPORT_MARGIN
+        box = (
+            max(bounds[0], int(x1 - margin_x)), max(bounds[1], int(y1 - margin_y)),
+            min(bounds[2], int(x2 + margin_x)), min(bounds[3], int(y2 + margin_y))
+        )
+        return box if box[0] < box[2] and box[1] < box[3] else None
+
+    def needs_render(self):
+        """Return True if the image is out of date or no longer covers the visible part of the bay."""
+        if self.dirty:
+            return True
+        if self.image_box is None:
+            return self.render_box() is not None
+        bounds = self.geometry.bounds()
+        x1, y1, x2, y2 = self.viewport()
+        visible = (max(bounds[0], x1), max(bounds[1], y1), min(bounds[2], x2), min(bounds[3], y2))
+        if visible[0] >= visible[2] or visible[1] >= visible[3]:
+            return False
+        box = self.image_box
+        return visible[0] < box[0] or visible[1] < box[1] or visible[2] > box[2] or visible[3] > box[3]
+
+    @traced("render_raster_scene")
+    def flush(self):
+        """Re-render the bay image if it is out of date or panned out of the rendered area."""
+        if self.geometry is None or not self.needs_render():
+            return False
+        self.dirty = False
+        box = self.render_box()
+        if box is None:
+            # Entirely outside the viewport: drop the image until the bay is scrolled back into view
+            self.image = None
+            self.image_box = None
+            if self.image_id is not None:
+                self.canvas.itemconfig(self.image_id, state="hidden")
+            return False
+        x1, y1, x2, y2 = box
+        grid = {}
+        category_colors = {}
+        for cell, state in self.painted.items():
+            if state is not None:
+                family, category, front, top, right = state
+                grid[cell] = (family, category)
+                category_colors[f"{family}|{category}"] = {'front': front, 'top': top, 'right': right}
+        image = Image.new("RGB", (x2 - x1, y2 - y1), CANVAS_BG_COLOR)
+        commands = bay_drawing(self.geometry, grid, category_colors, self.show_text, self.show_sides)
+        render_commands(image, commands, (x1, y1), self.font_scale())
+        self.image = image
+        self.image_box = box
+        self._show_image(image, (x1, y1))
+        log.debug("Rendered %sx%s shelf image for %s shelves", image.size[0], image.size[1], len(self.painted))
+        return True
+
+    def _show_image(self, image, position):
+        """Put a PIL image on the canvas with its top-left corner at position."""
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == image.size:
+            self.photo.paste(image)
+        else:
+            self.photo = self.photo_factory(image)
+            if self.image_id is not None:
+                self.canvas.itemconfig(self.image_id, image=self.photo)
+        if self.image_id is None:
+            self.image_id = self.canvas.create_image(
+                *position, image=self.photo, anchor="nw", state="normal" if self.visible else "hidden", tags=self.tag
+            )
+            self.canvas.tag_raise(self.highlight_tag)
+        else:
+            self.canvas.coords(self.image_id, *position)
+            if self.visible:
+                self.canvas.itemconfig(self.image_id, state="normal")
+
+    def font_scale(self):
+        """Return the pixels per point Tk uses for fonts, so labels match the vector scene."""
+        try:
+            return float(self.canvas.tk.call("tk", "scaling"))
+        except AttributeError:
+            return 1.0
+
+    def reset_highlights(self):
+        """Restore the default front face color on every shelf."""
+        self.canvas.delete(self.highlight_tag)
+        self.highlights.clear()
+
+    def highlight(self, level, shelf, color):
+        """Cover the front face of one shelf with the given color; the default color removes the cover."""
+        item_id, current = self.highlights.get((level, shelf), (None, None))
+        if color == current or (item_id is None and color == SHELF_FRONT_COLOR):
+            return
+        if color == SHELF_FRONT_COLOR:
+            self.canvas.delete(item_id)
+            del self.highlights[(level, shelf)]
+            return
+        if item_id is None:
+            # Stippled, so the category bar stays readable under the selection
+            item_id = self.canvas.create_polygon(
+                *self.geometry.cell_faces(level, shelf)[0], fill=color, outline="black", stipple="gray50",
+                state="normal" if self.visible else "hidden", tags=(self.tag, self.highlight_tag)
+            )
+        else:
+            self.canvas.itemconfig(item_id, fill=color)
+        self.highlights[(level, shelf)] = (item_id, color)
+
+    def hide(self):
+        """Hide the image and its highlights, keeping them for a later show()."""
+        if self.visible:
+            self.canvas.itemconfig(self.tag, state="hidden")
+            self.visible = False
+
+    def show(self):
+        """Show the scene again as it was when it was hidden."""
+        if not self.visible:
+            self.canvas.itemconfig(self.tag, state="normal")
+            self.canvas.tag_raise(self.tag)
+            self.visible = True
+
+    def item_count(self):
+        """Return the scene's cost in canvas items, counting its image by pixels."""
+        return self.cost
+
+    def destroy(self):
+        """Delete the image and highlights of this scene."""
+        self.canvas.delete(self.tag)
+        self.image_id = None
+        self.photo = None
+        self.image = None
+        self.image_box = None
+        self.painted.clear()
+        self.highlights.clear()
@@ -0,0 +1,172 @@
+from functools import lru_cache
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas as reportlab_canvas
+from constants import SHELF_FRONT_COLOR, SHELF_TOP_COLOR, SHELF_RIGHT_COLOR, CANVAS_BG_COLOR, DEFAULT_BAR_COLORS
+from shelf_geometry import compute_geometry
+from label_layout import layout_label
+
+# TrueType fonts tried in order for image output; PIL's default font is the last resort
+PIL_FONT_FILES = {
+    False: ["DejaVuSans.ttf", "arial.ttf", "Arial.ttf", "Helvetica.ttc"],
+    True: ["DejaVuSans-Bold.ttf", "arialbd.ttf", "Arial Bold.ttf", "Helvetica.ttc"]
+}
+LINE_SPACING = 1.15  # Line height of multi-line category labels, relative to the font size
+
+def fit_geometry(max_level, max_shelf, width, height, aspect_ratio=None):
+    """Return the geometry of a bay scaled to fill a width x height drawing area.
+
+    Every length in compute_geometry is proportional to the scale factor, so the scale
+    that fits the area follows from the bay's bounds at scale 1. aspect_ratio is the cell
+    width/height ratio the Shelf View draws with, so pages match the screen.
+    """
+    x1, y1, x2, y2 = compute_geometry(max_level, max_shelf, 1, 0, 0, aspect_ratio).bounds()
+    scale_factor = min(width / (x2 - x1), height / (y2 - y1))
+    geometry = compute_geometry(max_level, max_shelf, scale_factor, width, height, aspect_ratio)
+    # Center the full bounds, which include the 3D edge above the labels, in the area
+    x1, y1, x2, y2 = geometry.bounds()
+    return geometry.moved((width - x1 - x2) / 2, (height - y1 - y2) / 2)
+
+def bay_drawing(geometry, grid, category_colors, show_text=True, show_sides=True):
+    """Return the drawing commands of a bay, in canvas coordinates and back-to-front order.
+
+    Commands are ("polygon", points, fill, outline) and ("text", x, y, lines, font_size, bold),
+    mirroring the items ShelfScene creates on the canvas: labels and shelf faces first,
+    then the category bars, then the category labels. show_text and show_sides drop the
+    category labels and the top/right 3D faces, as the level of detail rules do on screen.
+    """
+    commands = []
+    for shelf in range(1, geometry.max_shelf + 1):
+        x, y = geometry.shelf_label_position(shelf)
+        commands.append(("text", x, y, (f"S{shelf}",), geometry.label_font[1], False))
+    for level in range(1, geometry.max_level + 1):
+        x, y = geometry.level_label_position(level)
+        commands.append(("text", x, y, (f"L{level}",), geometry.label_font[1], False))
+
+    cells = [(level, shelf) for level in range(1, geometry.max_level + 1) for shelf in range(1, geometry.max_shelf + 1)]
+    for level, shelf in cells:
+        front, top, right = geometry.cell_faces(level, shelf)
+        commands.append(("polygon", front, SHELF_FRONT_COLOR, "black"))
+        if show_sides:
+            commands.append(("polygon", top, SHELF_TOP_COLOR, "black"))
+            commands.append(("polygon", right, SHELF_RIGHT_COLOR, "black"))
+
+    labels = []
+    for level, shelf in cells:
+        family, category = grid.get((level, shelf), ("", ""))
+        if not category:
+            continue
+        colors = category_colors.get(f"{family}|{category}", DEFAULT_BAR_COLORS)
+        front, top, right = geometry.bar_faces(level, shelf)
+        commands.append(("polygon", front, colors['front'], None))
+        if show_sides:
+            commands.append(("polygon", top, colors['top'], None))
+            commands.append(("polygon", right, colors['right'], None))
+        if not show_text:
+            continue
+        font_size, lines = layout_label(category, geometry.cell_width, geometry.cell_height)
+        if lines:
+            x, y = geometry.text_center(level, shelf)
+            labels.append(("text", x, y, lines, font_size, True))
+    commands.extend(labels)
+    return commands
+
+@lru_cache(maxsize=64)
+def pil_font(size, bold):
+    """Return a PIL font of the given pixel size, preferring a TrueType Helvetica look-alike."""
+    for font_file in PIL_FONT_FILES[bold]:
+        try:
+            return ImageFont.truetype(font_file, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+def render_commands(image, commands, origin=(0, 0), font_scale=1.0):
+    """Draw bay_drawing() commands onto a PIL image whose top-left corner is at origin in canvas coordinates.
+
+    font_scale converts label font sizes to pixels, e.g. Tk's pixels per point on screen.
+    """
+    draw = ImageDraw.Draw(image)
+    origin_x, origin_y = origin
+    for command in commands:
+        if command[0] == "polygon":
+            _, points, fill, outline = command
+            xy = [(x - origin_x, y - origin_y) for x, y in zip(points[::2], points[1::2])]
+            draw.polygon(xy, fill=fill, outline=outline)
+        else:
+            _, x, y, lines, font_size, bold = command
+            pixel_size = max(int(round(font_size * font_scale)), 1)
+            draw.multiline_text(
+                (x - origin_x, y - origin_y), "\n".join(lines), fill="black", font=pil_font(pixel_size, bold),
+                anchor="mm", align="center", spacing=pixel_size * (LINE_SPACING - 1)
+            )
+
+def render_bay_image(grid, max_level, max_shelf, category_colors, width=2400, height=1440, background=CANVAS_BG_COLOR,
+                     aspect_ratio=None):
+    """Render a bay to a PIL image of the given size, independent of any window or display."""
+    geometry = fit_geometry(max_level, max_shelf, width, height, aspect_ratio)
+    image = Image.new("RGB", (width, height), background)
+    render_commands(image, bay_drawing(geometry, grid, category_colors))
+    return image
+
+def pdf_color(color):
+    """Convert a Tk color (hex or name) to the (r, g, b) floats reportlab expects."""
+    return tuple(channel / 255 for channel in ImageColor.getrgb(color)[:3])
+
+def draw_bay_pdf(pdf, grid, max_level, max_shelf, category_colors, x, y, width, height, aspect_ratio=None):
+    """Draw a bay as vector graphics into the box with lower-left corner (x, y) of a reportlab canvas."""
+    geometry = fit_geometry(max_level, max_shelf, width, height, aspect_ratio)
+    top = y + height  # Canvas y grows downwards, PDF y upwards
+    pdf.saveState()
+    pdf.setLineWidth(max(geometry.scale_factor * 0.5, 0.25))
+    for command in bay_drawing(geometry, grid, category_colors):
+        if command[0] == "polygon":
+            _, points, fill, outline = command
+            path = pdf.beginPath()
+            path.moveTo(x + points[0], top - points[1])
+            for i in range(2, len(points), 2):
+                path.lineTo(x + points[i], top - points[i + 1])
+            path.close()
+            pdf.setFillColorRGB(*pdf_color(fill))
+            if outline:
+                pdf.setStrokeColorRGB(*pdf_color(outline))
+            pdf.drawPath(path, stroke=1 if outline else 0, fill=1)
+        else:
+            _, text_x, text_y, lines, font_size, bold = command
+            pdf.setFillColorRGB(0, 0, 0)
+            pdf.setFont("Helvetica-Bold" if bold else "Helvetica", font_size)
+            line_height = font_size * LINE_SPACING
+            # Center the block of lines on the anchor point; baselines sit ~0.3 em below line centers
+            first_line_y = top - text_y + (len(lines) - 1) * line_height / 2 - font_size * 0.3
+            for i, line in enumerate(lines):
+                pdf.drawCentredString(x + text_x, first_line_y - i * line_height, line)
+    pdf.restoreState()
+
+def draw_page_header(pdf, section, aisle, side):
+    """Draw the bay header of a landscape letter page; returns the (x, y, width, height) box left for the layout."""
+    page_width, page_height = landscape(letter)
+    pdf.setFont("Helvetica-Bold", 16)
+    pdf.drawCentredString(page_width / 2, page_height - 50, "Shelf Layout")
+    pdf.setFont("Helvetica", 12)
+    pdf.drawCentredString(page_width / 2, page_height - 80, f"Section: {section}")
+    pdf.drawCentredString(page_width / 2, page_height - 100, f"Aisle: {aisle}")
+    pdf.drawCentredString(page_width / 2, page_height - 120, f"Side: {side}")
+
+    # The printable area below the header
+    margin = 0.5 * inch
+    header_height = 150
+    return margin, margin, page_width - 2 * margin, page_height - 2 * margin - header_height
+
+def draw_bay_page(pdf, grid, max_level, max_shelf, category_colors, section, aisle, side, aspect_ratio=None):
+    """Draw one landscape letter page with the bay header and its shelf layout."""
+    x, y, width, height = draw_page_header(pdf, section, aisle, side)
+    draw_bay_pdf(pdf, grid, max_level, max_shelf, category_colors, x, y, width, height, aspect_ratio)
+    pdf.showPage()
+
+def write_bay_pdf(file_path, grid, max_level, max_shelf, category_colors, section, aisle, side, aspect_ratio=None):
+    """Write a one-page PDF with the vector shelf layout of a bay."""
+    pdf = reportlab_canvas.Canvas(file_path, pagesize=landscape(letter))
+    pdf.setTitle(f"Shelf Layout {section}-{aisle}-{side}")
+    draw_bay_page(pdf, grid, max_level, max_shelf, category_colors, section, aisle, side, aspect_ratio)
+    pdf.save()
@@ -0,0 +1,306 @@
+from collections import OrderedDict
+from constants import (SHELF_FRONT_COLOR, SHELF_TOP_COLOR, SHELF_RIGHT_COLOR,
+                       SCENE_CACHE_ITEM_LIMIT, RASTER_CELL_THRESHOLD)
+from label_layout import layout_label
+from shelf_raster import RasterShelfScene, tk_photo
+from instrumentation import get_logger
+
+log = get_logger("shelf_scene")
+
+class ShelfScene:
+    """Retained canvas items for one bay layout.
+
+    Items are created once per (max_level, max_shelf) layout and then moved with coords()
+    and restyled with itemconfig() instead of being deleted and recreated on every redraw.
+    A scene can be hidden and shown again as a whole, so it can be kept for a later visit.
+    Zooming and resizing use transform(), which scales the existing items with canvas.scale().
+    """
+
+    def __init__(self, canvas, max_level, max_shelf, tag="scene"):
+        self.canvas = canvas
+        self.max_level = max_level
+        self.max_shelf = max_shelf
+        self.tag = tag
+        self.base_tag = f"{tag}_base"  # Labels and shelf faces, always shown with the scene
+        self.painted_tag = f"{tag}_painted"  # Bars and texts of shelves that have a category
+        self.side_tag = f"{tag}_side"  # Top and right 3D faces of shelves and bars
+        self.text_tag = f"{tag}_text"  # Category labels
+        self.label_tag = f"{tag}_label"  # S<n> and L<n> labels
+        self.geometry = None
+        self.layout_key = None
+        self.visible = True
+        self.version = None  # Model data version the scene was last painted at
+        self.show_text = True  # Level of detail, see ShelfGeometry.detail()
+        self.show_sides = True
+        self.text_stale = False  # Label fonts don't match the cell size since the last transform()
+
+        # Item IDs per shelf: 'front', 'top', 'right' faces, 'bar_front', 'bar_top', 'bar_right' and 'text'
+        self.items = {}
+        self.shelf_label_ids = {}
+        self.level_label_ids = {}
+        # (family, category, colors) currently painted on each shelf; None for an empty shelf
+        self.painted = {}
+        self.build()
+
+    def cells(self):
+        """Iterate over all (level, shelf) cells of the layout."""
+        for level in range(1, self.max_level + 1):
+            for shelf in range(1, self.max_shelf + 1):
+                yield level, shelf
+
+    def has_cell(self, cell):
+        """Return True if the (level, shelf) cell is part of the layout."""
+        return cell in self.items
+
+    def build(self):
+        """Create every canvas item of the layout with placeholder coordinates."""
+        placeholder = (0, 0, 0, 0, 0, 0, 0, 0)
+        for shelf in range(1, self.max_shelf + 1):
+            self.shelf_label_ids[shelf] = self.canvas.create_text(
+                0, 0, text=f"S{shelf}", fill="black", anchor="center", tags=(self.tag, self.base_tag, self.label_tag)
+            )
+        for level in range(1, self.max_level + 1):
+            self.level_label_ids[level] = self.canvas.create_text(
+                0, 0, text=f"L{level}", fill="black", anchor="center", tags=(self.tag, self.base_tag, self.label_tag)
+            )
+
+        # Shelf faces first so that category bars and text stack above every shelf
+        for level, shelf in self.cells():
+            front_face_tag = f"front_face_{level}_{shelf}"
+            self.items[(level, shelf)] = {
+                'front': self.canvas.create_polygon(
+                    *placeholder, fill=SHELF_FRONT_COLOR, outline="black",
+                    tags=(self.tag, self.base_tag, "front_face", front_face_tag)
+                ),
+                'top': self.canvas.create_polygon(
+                    *placeholder, fill=SHELF_TOP_COLOR, outline="black", tags=(self.tag, self.base_tag, self.side_tag)
+                ),
+                'right': self.canvas.create_polygon(
+                    *placeholder, fill=SHELF_RIGHT_COLOR, outline="black", tags=(self.tag, self.base_tag, self.side_tag)
+                ),
+            }
+            self.painted[(level, shelf)] = None
+        for level, shelf in self.cells():
+            items = self.items[(level, shelf)]
+            items['bar_front'] = self.canvas.create_polygon(*placeholder, outline="", state="hidden", tags=self.tag)
+            for face in ('bar_top', 'bar_right'):
+                items[face] = self.canvas.create_polygon(
+                    *placeholder, outline="", state="hidden", tags=(self.tag, self.side_tag)
+                )
+        for level, shelf in self.cells():
+            self.items[(level, shelf)]['text'] = self.canvas.create_text(
+                0, 0, text="", fill="black", anchor="center", justify="center",
+                state="hidden", tags=(self.tag, self.text_tag)
+            )
+
+    def layout(self, geometry):
+        """Move every item to the given geometry; a no-op if the layout is unchanged."""
+        self.geometry = geometry
+        if geometry.key() == self.layout_key:
+            return False
+        self.layout_key = geometry.key()
+
+        for shelf, item_id in self.shelf_label_ids.items():
+            self.canvas.coords(item_id, *geometry.shelf_label_position(shelf))
+            self.canvas.itemconfig(item_id, font=geometry.label_font)
+        for level, item_id in self.level_label_ids.items():
+            self.canvas.coords(item_id, *geometry.level_label_position(level))
+            self.canvas.itemconfig(item_id, font=geometry.label_font)
+
+        for (level, shelf), items in self.items.items():
+            front, top, right = geometry.cell_faces(level, shelf)
+            self.canvas.coords(items['front'], *front)
+            self.canvas.coords(items['top'], *top)
+            self.canvas.coords(items['right'], *right)
+            bar_front, bar_top, bar_right = geometry.bar_faces(level, shelf)
+            self.canvas.coords(items['bar_front'], *bar_front)
+            self.canvas.coords(items['bar_top'], *bar_top)
+            self.canvas.coords(items['bar_right'], *bar_right)
+            self.canvas.coords(items['text'], *geometry.text_center(level, shelf))
+            # The label font depends on the cell size, so refit painted labels
+            painted = self.painted[(level, shelf)]
+            if painted is not None:
+                self._set_text(items['text'], painted[1])
+        self.text_stale = False
+        self.set_detail(*geometry.detail())
+        return True
+
+    def transform(self, geometry):
+        """Scale and move the laid-out items to a uniformly scaled geometry without re-running layout.
+
+        Label fonts keep their size until refit_text(), as canvas.scale() doesn't scale text.
+        """
+        if geometry.key() == self.layout_key:
+            self.geometry = geometry
+            return False
+        old = self.geometry
+        factor_x = geometry.cell_width / old.cell_width
+        factor_y = geometry.cell_height / old.cell_height
+        self.canvas.scale(self.tag, 0, 0, factor_x, factor_y)
+        self.canvas.move(self.tag, geometry.offset_x - old.offset_x * factor_x, geometry.offset_y - old.offset_y * factor_y)
+        self.geometry = geometry
+        self.layout_key = geometry.key()
+        self.text_stale = True
+        self.set_detail(*geometry.detail())
+        return True
+
+    def refit_text(self):
+        """Fit the label fonts to the cell size after one or more transform() calls."""
+        if not self.text_stale:
+            return False
+        self.canvas.itemconfig(self.label_tag, font=self.geometry.label_font)
+        for cell, painted in self.painted.items():
+            if painted is not None:
+                self._set_text(self.items[cell]['text'], painted[1])
+        self.text_stale = False
+        return True
+
+    def set_detail(self, show_text, show_sides):
+        """Show or hide the category labels and the 3D side faces of the whole scene."""
+        if self.visible and show_sides != self.show_sides:
+            if show_sides:
+                self.canvas.itemconfig(f"{self.side_tag}&&{self.base_tag}", state="normal")
+                self.canvas.itemconfig(f"{self.side_tag}&&{self.painted_tag}", state="normal")
+            else:
+                self.canvas.itemconfig(self.side_tag, state="hidden")
+        if self.visible and show_text != self.show_text:
+            self.canvas.itemconfig(self.text_tag, state="hidden")
+            if show_text:
+                self.canvas.itemconfig(f"{self.text_tag}&&{self.painted_tag}", state="normal")
+        self.show_text = show_text
+        self.show_sides = show_sides
+
+    def paint_cell(self, level, shelf, family, category, colors):
+        """Show or hide the category bar and label of a shelf; a no-op if nothing changed."""
+        state = (family, category, colors['front'], colors['top'], colors['right']) if category else None
+        if self.painted.get((level, shelf), None) == state:
+            return False
+        self.painted[(level, shelf)] = state
+        items = self.items[(level, shelf)]
+
+        # While the scene is hidden, the painted tag alone records what show() must reveal
+        if state is None:
+            for face in ('bar_front', 'bar_top', 'bar_right', 'text'):
+                self.canvas.itemconfig(items[face], state="hidden")
+                self.canvas.dtag(items[face], self.painted_tag)
+            return True
+
+        shown = "normal" if self.visible else "hidden"
+        side_shown = "normal" if self.visible and self.show_sides else "hidden"
+        self.canvas.itemconfig(items['bar_front'], fill=colors['front'], state=shown)
+        self.canvas.itemconfig(items['bar_top'], fill=colors['top'], state=side_shown)
+        self.canvas.itemconfig(items['bar_right'], fill=colors['right'], state=side_shown)
+        self._set_text(items['text'], category)
+        self.canvas.itemconfig(items['text'], state="normal" if self.visible and self.show_text else "hidden")
+        for face in ('bar_front', 'bar_top', 'bar_right', 'text'):
+            self.canvas.addtag_withtag(self.painted_tag, items[face])
+        return True
+
+    def flush(self):
+        """Nothing to do: paint_cell() updates the canvas items directly."""
+        return False
+
+    def _set_text(self, item_id, category):
+        """Fit the category text to the current cell size and apply it to a text item."""
+        font_size, lines = layout_label(category, self.geometry.cell_width, self.geometry.cell_height)
+        self.canvas.itemconfig(item_id, text="\n".join(lines), font=('Helvetica', font_size, 'bold'))
+
+    def reset_highlights(self):
+        """Restore the default front face color on every shelf."""
+        self.canvas.itemconfig(f"front_face&&{self.tag}", fill=SHELF_FRONT_COLOR)
+
+    def highlight(self, level, shelf, color):
+        """Fill the front face of one shelf with the given color."""
+        self.canvas.itemconfig(self.items[(level, shelf)]['front'], fill=color)
+
+    def hide(self):
+        """Hide every item of the scene, keeping it for a later show()."""
+        if self.visible:
+            self.canvas.itemconfig(self.tag, state="hidden")
+            self.visible = False
+
+    def show(self):
+        """Show the scene again with the bars and texts it had when it was hidden."""
+        if not self.visible:
+            self.canvas.itemconfig(self.base_tag, state="normal")
+            self.canvas.itemconfig(self.painted_tag, state="normal")
+            if not self.show_sides:
+                self.canvas.itemconfig(self.side_tag, state="hidden")
+            if not self.show_text:
+                self.canvas.itemconfig(self.text_tag, state="hidden")
+            self.canvas.tag_raise(self.tag)
+            self.visible = True
+
+    def item_count(self):
+        """Return the number of canvas items held by the scene."""
+        return 7 * len(self.items) + len(self.shelf_label_ids) + len(self.level_label_ids)
+
+    def destroy(self):
+        """Delete all canvas items of this scene."""
+        self.canvas.delete(self.tag)
+        self.items.clear()
+        self.painted.clear()
+
+def create_scene(canvas, max_level, max_shelf, tag, photo_factory=tk_photo):
+    """Build the scene of a bay: canvas items, or one image for bays over RASTER_CELL_THRESHOLD shelves."""
+    if max_level * max_shelf > RASTER_CELL_THRESHOLD:
+        return RasterShelfScene(canvas, max_level, max_shelf, tag, photo_factory)
+    return ShelfScene(canvas, max_level, max_shelf, tag)
+
+class ShelfSceneCache:
+    """Least recently used cache of hidden ShelfScenes, keyed by (section, aisle, side).
+
+    The total number of canvas items is capped at item_limit; the least recently shown
+    scenes are destroyed first. Each scene gets its own tag so it can be hidden and shown
+    as a whole. Bays with more than RASTER_CELL_THRESHOLD shelves get a RasterShelfScene.
+    """
+
+    def __init__(self, canvas, item_limit=SCENE_CACHE_ITEM_LIMIT, photo_factory=tk_photo):
+        self.canvas = canvas
+        self.item_limit = item_limit
+        self.photo_factory = photo_factory
+        self.scenes = OrderedDict()
+        self.item_count = 0
+        self.next_id = 0
+
+    def get(self, key, max_level, max_shelf):
+        """Return the cached scene of a bay, or None if it is missing or has other dimensions."""
+        scene = self.scenes.get(key)
+        if scene is None:
+            return None
+        if (scene.max_level, scene.max_shelf) != (max_level, max_shelf):
+            self.discard(key)
+            return None
+        self.scenes.move_to_end(key)
+        return scene
+
+    def create(self, key, max_level, max_shelf):
+        """Build a new scene for a bay and cache it, evicting old scenes over the item limit."""
+        self.discard(key)
+        self.next_id += 1
+        scene = create_scene(self.canvas, max_level, max_shelf, f"scene_{self.next_id}", self.photo_factory)
+        self.scenes[key] = scene
+        self.item_count += scene.item_count()
+        # Never evict the scene just created, even if it exceeds the limit on its own
+        while self.item_count > self.item_limit and len(self.scenes) > 1:
+            old_key = next(iter(self.scenes))
+            self.discard(old_key)
+            log.debug("Evicted cached shelf scene for %s", old_key)
+        return scene
+
+    def discard(self, key):
+        """Destroy the cached scene of a bay, if any."""
+        scene = self.scenes.pop(key, None)
+        if scene is not None:
+            self.item_count -= scene.item_count()
+            scene.destroy()
+
+    def hide_all(self):
+        """Hide every cached scene."""
+        for scene in self.scenes.values():
+            scene.hide()
+
+    def clear(self):
+        """Destroy every cached scene."""
+        for key in list(self.scenes):
+            self.discard(key)
@@ -1,18 +1,18 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
 import os
 import subprocess
 import platform
-import pyautogui
 import shutil
-from PIL import Image, ImageTk
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfgen import canvas as reportlab_canvas
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Image as ReportLabImage
 from constants import *
+from shelf_geometry import base_cell_size, compute_geometry
+from shelf_scene import ShelfSceneCache
+from shelf_raster import canvas_viewport
+from shelf_panorama import ShelfPanorama
+from shelf_renderer import write_bay_pdf
+from instrumentation import get_logger, traced
+
+log = get_logger("shelf_view")
 
 try:
     import win32api
@@ -39,10 +39,16 @@ class ShelfTab:
         self.initial_cell_height = None
         self.initial_aspect_ratio = None
         self.scale_factor = 1.0
+        self.zoom = 1.0  # User zoom on top of the scale that fits the bay to the canvas
         
-        # Dictionary to store front face item IDs for each shelf
-        self.front_face_ids = {}
-        self.cell_coords = {}
+        # Retained canvas items for the displayed bay and its current layout
+        self.scene = None
+        self.scene_cache = None  # Hidden scenes of recently viewed bays, created with the canvas
+        self.geometry = None
+        self.bay_key = None  # (section, aisle, side) of the displayed bay
+        self.panorama = None  # ShelfPanorama shown instead of a single bay, if any
+        self.panorama_mode = None  # None for the single-bay view, "aisle" or "section" for a panorama
+        self.scroll_region = None  # Canvas box the view scrolls over
         
         # Dropdown variables
         self.section_var = None
@@ -59,6 +65,8 @@ class ShelfTab:
         self.canvas = None
         self.clear_button = None
         self.print_button = None
+        self.fit_button = None
+        self.panorama_button = None
 
         # Base dimensions for dropdowns (to be scaled), reduced by 50%
         self.base_dropdown_width = 7  # Reduced from 15 to 7 (50% reduction)
@@ -84,7 +92,7 @@ class ShelfTab:
         # Section dropdown
         ttk.Label(self.dropdown_frame, text="Section:", font=LARGE_FONT).grid(row=0, column=0, padx=5, sticky="e")
         self.section_var = tk.StringVar()
-        self.section_dropdown = ttk.Combobox(self.dropdown_frame, textvariable=self.section_var, values=self.sections, state="readonly", style=COMBOBOX_STYLE, font=DROPDOWN_FONT, width=self.base_dropdown_width)
+        self.section_dropdown = ttk.Combobox(self.dropdown_frame, textvariable=self.section_var, values=self.sections, state="readonly" if self.sections else "disabled", style=COMBOBOX_STYLE, font=DROPDOWN_FONT, width=self.base_dropdown_width)
         self.section_dropdown.grid(row=0, column=1, padx=5, sticky="w")
         self.section_dropdown.bind("<<ComboboxSelected>>", self.on_section_changed)
         print("Added Section dropdown")
@@ -108,7 +116,7 @@ class ShelfTab:
         # Family dropdown
         ttk.Label(self.dropdown_frame, text="Family:", font=LARGE_FONT).grid(row=0, column=6, padx=5, sticky="e")
         self.family_var = tk.StringVar()
-        self.family_dropdown = ttk.Combobox(self.dropdown_frame, textvariable=self.family_var, values=self.families, state="readonly", style=COMBOBOX_STYLE, font=DROPDOWN_FONT, width=self.base_dropdown_width)
+        self.family_dropdown = ttk.Combobox(self.dropdown_frame, textvariable=self.family_var, values=self.families, state="readonly" if self.families else "disabled", style=COMBOBOX_STYLE, font=DROPDOWN_FONT, width=self.base_dropdown_width)
         self.family_dropdown.grid(row=0, column=7, padx=5, sticky="w")
         self.family_dropdown.bind("<<ComboboxSelected>>", self.controller.on_family_changed)
         print("Added Family dropdown")
@@ -116,7 +124,7 @@ class ShelfTab:
         # Category dropdown
         ttk.Label(self.dropdown_frame, text="Category:", font=LARGE_FONT).grid(row=0, column=8, padx=5, sticky="e")
         self.category_var = tk.StringVar()
-        self.category_dropdown = ttk.Combobox(self.dropdown_frame, textvariable=self.category_var, state="readonly", style=COMBOBOX_STYLE, font=DROPDOWN_FONT, width=self.base_dropdown_width)
+        self.category_dropdown = ttk.Combobox(self.dropdown_frame, textvariable=self.category_var, state="readonly" if self.families else "disabled", style=COMBOBOX_STYLE, font=DROPDOWN_FONT, width=self.base_dropdown_width)
         self.category_dropdown.grid(row=0, column=9, padx=5, sticky="w")
         print("Added Category dropdown")
         
@@ -127,6 +135,7 @@ class ShelfTab:
         
         self.canvas = tk.Canvas(self.canvas_frame, bg=CANVAS_BG_COLOR)
         self.canvas.pack(fill="both", expand=True)
+        self.scene_cache = ShelfSceneCache(self.canvas)
         print("Created canvas for 3D shelf visualization")
         
         # Bind mouse events for selection
@@ -139,6 +148,17 @@ class ShelfTab:
         self.canvas.bind("<Configure>", self.controller.on_resize)
         print("Bound resize event to canvas")
         
+        # Mouse wheel zooms (Button-4/5 on X11), the middle button pans
+        self.canvas.bind("<MouseWheel>", self.controller.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self.controller.on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self.controller.on_mouse_wheel)
+        self.canvas.bind("<ButtonPress-2>", self.controller.start_pan)
+        self.canvas.bind("<B2-Motion>", self.controller.pan)
+        print("Bound zoom and pan events to canvas")
+        
+        # Double-clicking a bay in a panorama opens it in the single-bay view
+        self.canvas.bind("<Double-Button-1>", self.controller.open_panorama_bay)
+        
         # Create buttons frame
         button_frame = ttk.Frame(frame, style=CUSTOM_FRAME_STYLE)
         button_frame.pack(pady=10)
@@ -152,6 +172,16 @@ class ShelfTab:
         self.print_button = ttk.Button(button_frame, text="Print Shelf Layout", command=self.print_shelf_layout, style=BUTTON_STYLE)
         self.print_button.grid(row=0, column=1, padx=5)
         print("Added Print Shelf Layout button to Shelf View tab")
+        
+        # Add Fit to Window button to undo zooming and panning
+        self.fit_button = ttk.Button(button_frame, text="Fit to Window", command=self.controller.reset_zoom, style=BUTTON_STYLE)
+        self.fit_button.grid(row=0, column=2, padx=5)
+        print("Added Fit to Window button to Shelf View tab")
+        
+        # Add Panorama button cycling between the single bay, its aisle and its section
+        self.panorama_button = ttk.Button(button_frame, text="Panorama: Off", command=self.controller.toggle_panorama_mode, style=BUTTON_STYLE)
+        self.panorama_button.grid(row=0, column=3, padx=5)
+        print("Added Panorama button to Shelf View tab")
 
     def initialize_dropdowns(self):
         """Initialize dropdown values after the UI is fully ready."""
@@ -163,9 +193,31 @@ class ShelfTab:
             self.update_category_dropdown(categories)
         print("Initialized shelf view with dropdown values (Section, Aisle, Side left blank)")
 
+    def set_sections(self, sections, shelf_structure):
+        """Populate the Section dropdown once the shelf structure has loaded."""
+        self.sections = sections
+        self.shelf_structure = shelf_structure
+        self.section_dropdown['values'] = sections
+        self.section_dropdown.configure(state="readonly")
+        print(f"Sections available: {sections}")
+
+    def set_families(self, families):
+        """Populate the Family dropdown once the families have loaded."""
+        self.families = families
+        self.family_dropdown['values'] = families
+        self.family_dropdown.configure(state="readonly")
+        self.category_dropdown.configure(state="readonly")
+        print(f"Families available: {families}")
+
     def on_section_changed(self, event):
         """Update the Aisle and Side dropdowns based on the selected section."""
-        selected_section = self.section_var.get()
+        self.update_bay_dropdowns(self.section_var.get())
+        
+        # Trigger an update to refresh the view
+        self.controller.on_section_changed(event)
+
+    def update_bay_dropdowns(self, selected_section):
+        """Fill the Aisle and Side dropdowns for a section and select the first aisle and side."""
         if selected_section and selected_section in self.shelf_structure:
             config = self.shelf_structure[selected_section]
             self.aisles = list(range(1, config["aisles"] + 1))
@@ -180,9 +232,13 @@ class ShelfTab:
             self.side_dropdown['values'] = self.sides
             self.side_var.set(self.sides[0] if self.sides else "")
             print(f"Updated Side dropdown for Section '{selected_section}': {self.sides}")
-        
-        # Trigger an update to refresh the view
-        self.controller.on_section_changed(event)
+
+    def select_bay(self, section, aisle, side):
+        """Select a bay in the Section, Aisle and Side dropdowns."""
+        self.section_var.set(section)
+        self.update_bay_dropdowns(section)
+        self.aisle_var.set(aisle)
+        self.side_var.set(side)
 
     def on_aisle_changed(self, event):
         """Handle Aisle dropdown change."""
@@ -218,7 +274,7 @@ class ShelfTab:
             dropdown.configure(width=new_dropdown_width)
             dropdown.configure(font=('Helvetica', new_font_size))
         
-        print(f"Updated dropdown sizes: width={new_dropdown_width}, font_size={new_font_size}")
+        log.debug("Updated dropdown sizes: width=%s, font_size=%s", new_dropdown_width, new_font_size)
 
     def print_shelf_layout(self):
         """Handle the print action for the shelf layout."""
@@ -261,7 +317,7 @@ class ShelfTab:
         ttk.Button(print_dialog, text="Cancel", width=button_width, command=print_dialog.destroy, style=BUTTON_STYLE).pack(pady=button_spacing)
 
     def save_as_pdf(self, section, aisle, side, dialog):
-        """Save the shelf layout as a PDF file using a screenshot and reportlab."""
+        """Save the shelf layout of a bay as a vector PDF file."""
         dialog.destroy()
         
         # Ask user for save location
@@ -274,79 +330,27 @@ class ShelfTab:
             return
         
         try:
-            # Ensure the window is in focus and visible for the screenshot
-            self.tab.winfo_toplevel().focus_force()
-            self.tab.winfo_toplevel().update()
-            
-            # Get the canvas coordinates and dimensions
-            self.canvas.update_idletasks()
-            x = self.canvas.winfo_rootx()
-            y = self.canvas.winfo_rooty()
-            width = self.canvas.winfo_width()
-            height = self.canvas.winfo_height()
-            
-            # Validate coordinates and dimensions
-            if width <= 0 or height <= 0:
-                raise ValueError("Canvas width or height is invalid for screenshot.")
-            
-            # Capture a screenshot of the canvas area
-            screenshot = pyautogui.screenshot(region=(x, y, width, height))
-            screenshot_path = "temp_shelf_layout.png"
-            screenshot.save(screenshot_path)
-            
-            # Verify the screenshot file exists
-            if not os.path.exists(screenshot_path):
-                raise FileNotFoundError(f"Screenshot file not created: {screenshot_path}")
-            
-            # Create a PDF using reportlab with letter size in landscape orientation
-            from reportlab.lib.pagesizes import landscape
-            pdf = SimpleDocTemplate(file_path, pagesize=landscape(letter))
-            pdf_width, pdf_height = landscape(letter)  # Letter size in landscape: 792 x 612 points
-            
-            # Create content for the PDF
-            elements = []
-            
-            # Add header text directly in the PDF (Section, Aisle, Side are already here)
-            margin = 0.5 * inch
-            c = reportlab_canvas.Canvas("temp_header.pdf", pagesize=landscape(letter))
-            c.setFont("Helvetica-Bold", 16)
-            c.drawCentredString(pdf_width / 2, pdf_height - 50, "Shelf Layout")
-            
-            c.setFont("Helvetica", 12)
-            c.drawCentredString(pdf_width / 2, pdf_height - 80, f"Section: {section}")
-            c.drawCentredString(pdf_width / 2, pdf_height - 100, f"Aisle: {aisle}")
-            c.drawCentredString(pdf_width / 2, pdf_height - 120, f"Side: {side}")
-            c.showPage()
-            c.save()
-            
-            # Load the shelf layout image
-            img = ImageReader(screenshot_path)
-            # Fit the image to the entire printable area with minimal margins
-            img_width = pdf_width - 2 * margin
-            img_height = pdf_height - 2 * margin - 150  # Leave space for header
-            image = ReportLabImage(screenshot_path, width=img_width, height=img_height)
-            image.hAlign = 'CENTER'
-            image.vAlign = 'TOP'
-            image.spaceBefore = 150  # Space for the header text
-            elements.append(image)
-            
-            # Build the PDF
-            pdf.build(elements)
-            
+            self.write_layout_pdf(file_path, section, aisle, side)
             self.view.show_message("Success", f"Shelf layout saved as PDF to {file_path}")
-            
         except Exception as e:
             self.view.show_message("Error", f"Failed to save PDF: {str(e)}")
-        
-        finally:
-            # Clean up temporary files
-            temp_files = ["temp_shelf_layout.png", "temp_header.pdf"]
-            for temp_file in temp_files:
-                if os.path.exists(temp_file):
-                    try:
-                        os.remove(temp_file)
-                    except Exception as e:
-                        print(f"Failed to remove temporary file {temp_file}: {str(e)}")
+
+    @traced("write_layout_pdf")
+    def write_layout_pdf(self, file_path, section, aisle, side):
+        """Render a bay from the model data straight to a PDF, without reading the screen."""
+        filtered_df = self.controller.model.get_filtered_data(section, aisle, side)
+        if filtered_df is None:
+            raise ValueError(f"No data found for Section {section}, Aisle {aisle}, Side {side}")
+        max_level = int(filtered_df['Level'].max())
+        max_shelf = int(filtered_df['Shelf'].max())
+        grid = self.controller.model.get_bay_grid(section, aisle, side)
+        # Use the same category colors as the on-screen view
+        self.assign_category_colors(grid.values())
+        write_bay_pdf(
+            file_path, grid, max_level, max_shelf, self.view.category_colors, section, aisle, side,
+            self.initial_aspect_ratio
+        )
+        log.info("Wrote shelf layout PDF: %s", file_path)
 
     def print_to_printer(self, section, aisle, side, dialog):
         """Print the shelf layout to a local printer."""
@@ -355,63 +359,7 @@ class ShelfTab:
         try:
             # Generate a temporary PDF file with the shelf layout
             pdf_file = "temp_shelf_layout_with_info.pdf"
-            
-            # Ensure the window is in focus and visible for the screenshot
-            self.tab.winfo_toplevel().focus_force()
-            self.tab.winfo_toplevel().update()
-            
-            # Get the canvas coordinates and dimensions
-            self.canvas.update_idletasks()
-            x = self.canvas.winfo_rootx()
-            y = self.canvas.winfo_rooty()
-            width = self.canvas.winfo_width()
-            height = self.canvas.winfo_height()
-            
-            # Validate coordinates and dimensions
-            if width <= 0 or height <= 0:
-                raise ValueError("Canvas width or height is invalid for screenshot.")
-            
-            # Capture a screenshot of the canvas area
-            screenshot = pyautogui.screenshot(region=(x, y, width, height))
-            screenshot_path = "temp_shelf_layout.png"
-            screenshot.save(screenshot_path)
-            
-            # Verify the screenshot file exists
-            if not os.path.exists(screenshot_path):
-                raise FileNotFoundError(f"Screenshot file not created: {screenshot_path}")
-            
-            # Create a PDF using reportlab with letter size in landscape orientation
-            from reportlab.lib.pagesizes import landscape
-            pdf = SimpleDocTemplate(pdf_file, pagesize=landscape(letter))
-            pdf_width, pdf_height = landscape(letter)
-            
-            # Create content for the PDF
-            elements = []
-            
-            # Add header text directly in the PDF (Section, Aisle, Side are already here)
-            margin = 0.5 * inch
-            c = reportlab_canvas.Canvas("temp_header.pdf", pagesize=landscape(letter))
-            c.setFont("Helvetica-Bold", 16)
-            c.drawCentredString(pdf_width / 2, pdf_height - 50, "Shelf Layout")
-            
-            c.setFont("Helvetica", 12)
-            c.drawCentredString(pdf_width / 2, pdf_height - 80, f"Section: {section}")
-            c.drawCentredString(pdf_width / 2, pdf_height - 100, f"Aisle: {aisle}")
-            c.drawCentredString(pdf_width / 2, pdf_height - 120, f"Side: {side}")
-            c.showPage()
-            c.save()
-            
-            # Load the shelf layout image
-            img_width = pdf_width - 2 * margin
-            img_height = pdf_height - 2 * margin - 150
-            image = ReportLabImage(screenshot_path, width=img_width, height=img_height)
-            image.hAlign = 'CENTER'
-            image.vAlign = 'TOP'
-            image.spaceBefore = 150
-            elements.append(image)
-            
-            # Build the PDF
-            pdf.build(elements)
+            self.write_layout_pdf(pdf_file, section, aisle, side)
             
             # Platform-specific printing
             system = platform.system()
@@ -459,7 +407,7 @@ class ShelfTab:
         
         finally:
             # Clean up temporary files
-            temp_files = ["temp_shelf_layout.png", pdf_file, "temp_header.pdf"]
+            temp_files = [pdf_file]
             for temp_file in temp_files:
                 if os.path.exists(temp_file):
                     try:
@@ -467,17 +415,18 @@ class ShelfTab:
                     except Exception as e:
                         print(f"Failed to remove temporary file {temp_file}: {str(e)}")
 
+    @traced("draw_shelf_view")
     def draw_shelf_view(self, filtered_df, section, aisle, side):
         """Draw the 3D shelf visualization based on the filtered data."""
-        self.canvas.delete("all")
-        self.front_face_ids.clear()
-        
         # Update dropdown sizes before redrawing the shelf view
         self.update_dropdown_sizes()
+        self.canvas.delete("reminder")
+        self.close_panorama()
         
         # If any dropdown is empty or no data, display a reminder message instead of the shelf
         if not section or not aisle or not side or filtered_df is None:
-            print("Section, Aisle, or Side is empty or no data; displaying reminder message")
+            log.debug("Section, Aisle, or Side is empty or no data; displaying reminder message")
+            self.clear_scene()
             # Get canvas dimensions
             self.canvas.update_idletasks()
             canvas_width = self.canvas.winfo_width()
@@ -491,152 +440,138 @@ class ShelfTab:
                 text="Please select Section, Aisle, and Side values",
                 font=('Helvetica', 24, 'bold'),
                 fill="black",
-                anchor="center"
+                anchor="center",
+                tags="reminder"
             )
             return
         
         # Determine max_level and max_shelf for drawing the shelf grid
-        max_level = filtered_df['Level'].max()
-        max_shelf = filtered_df['Shelf'].max()
-        
-        self.max_level = int(max_level)
-        self.max_shelf = int(max_shelf)
-        print(f"Max Level: {self.max_level}, Max Shelf: {self.max_shelf}")
-        
-        # Calculate base cell size (before scaling)
-        canvas_width_base = 1000
-        canvas_height_base = 600
-        cell_width_base = canvas_width_base // self.max_shelf
-        cell_height_base = canvas_height_base // self.max_level
-        self.cell_width_base = min(cell_width_base, 60)
-        self.cell_height_base = min(cell_height_base, 80)
+        self.max_level = int(filtered_df['Level'].max())
+        self.max_shelf = int(filtered_df['Shelf'].max())
+        log.debug("Max Level: %s, Max Shelf: %s", self.max_level, self.max_shelf)
         
         # Calculate the initial aspect ratio (only once)
         if self.initial_aspect_ratio is None:
-            self.initial_cell_width = self.cell_width_base
-            self.initial_cell_height = self.cell_height_base
+            self.initial_cell_width, self.initial_cell_height = base_cell_size(self.max_level, self.max_shelf)
             self.initial_aspect_ratio = self.initial_cell_width / self.initial_cell_height
-            print(f"Initial aspect ratio: {self.initial_aspect_ratio}")
-        
-        # Apply the scale factor to maintain aspect ratio
-        self.cell_width = self.cell_width_base * self.scale_factor
-        self.cell_height = self.cell_height_base * self.scale_factor
-        
-        # Ensure the aspect ratio is maintained
-        current_aspect_ratio = self.cell_width / self.cell_height
-        if abs(current_aspect_ratio - self.initial_aspect_ratio) > 0.01:
-            self.cell_height = self.cell_width / self.initial_aspect_ratio
-            print(f"Adjusted cell height to maintain aspect ratio: cell_width={self.cell_width}, cell_height={self.cell_height}")
-        
-        # Scale the depth and fonts dynamically
-        self.depth = 10 * self.scale_factor
-        label_font_size = int(LABEL_FONT_BASE * self.scale_factor)  # Recalculate dynamically
-        self.label_font = ('Helvetica', max(label_font_size, 6))  # Update label font with new size
-        print(f"Scaled sizes: cell_width={self.cell_width}, cell_height={self.cell_height}, depth={self.depth}, label_font_size={label_font_size}")
-        
-        # Calculate the total size of the shelf grid (including space for labels)
-        label_space_left = 50 * self.scale_factor
-        label_space_top = 30 * self.scale_factor
-        total_width = self.max_shelf * self.cell_width + self.depth + label_space_left
-        total_height = self.max_level * self.cell_height + self.depth + label_space_top
-        
-        # Center the shelf grid in the canvas
-        self.canvas.update_idletasks()
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        offset_x = (canvas_width - total_width) // 2 + label_space_left
-        offset_y = (canvas_height - total_height) // 2 + label_space_top
-        print(f"Centering shelf grid: offset_x={offset_x}, offset_y={offset_y}")
-        
-        # Draw shelf labels (Shelf 1, Shelf 2, etc.) above the grid
-        for shelf in range(1, self.max_shelf + 1):
-            label_x = (shelf - 1) * self.cell_width + offset_x + self.cell_width / 2
-            label_y = offset_y - self.depth - 10 * self.scale_factor
-            self.canvas.create_text(
-                label_x, label_y,
-                text=f"S{shelf}",
-                font=self.label_font,
-                fill="black",
-                anchor="center"
-            )
-        
-        # Draw level labels (Level 1, Level 2, etc.) to the left of the grid
-        for level in range(1, self.max_level + 1):
-            display_row = self.max_level - level
-            label_y = display_row * self.cell_height + offset_y + self.cell_height / 2
-            label_x = offset_x - self.depth - 30 * self.scale_factor
-            self.canvas.create_text(
-                label_x, label_y,
-                text=f"L{level}",
-                font=self.label_font,
-                fill="black",
-                anchor="center"
-            )
-        
-        # Draw the shelf grid
-        self.cell_coords = {}
-        for level in range(1, self.max_level + 1):
-            display_row = self.max_level - level
-            for shelf in range(1, self.max_shelf + 1):
-                x1 = (shelf - 1) * self.cell_width + offset_x
-                y1 = display_row * self.cell_height + offset_y
-                x2 = x1 + self.cell_width
-                y2 = y1 + self.cell_height
-                
-                x1_3d = x1 + self.depth
-                y1_3d = y1
-                x2_3d = x2 + self.depth
-                y2_3d = y2
-                
-                front_face_tag = f"front_face_{level}_{shelf}"
-                front_face_id = self.canvas.create_polygon(
-                    x1_3d, y1_3d,
-                    x2_3d, y1_3d,
-                    x2, y2,
-                    x1, y2,
-                    fill=SHELF_FRONT_COLOR, outline="black",
-                    tags=front_face_tag
-                )
-                self.front_face_ids[(level, shelf)] = front_face_id
-                
-                self.canvas.create_polygon(
-                    x1_3d, y1_3d,
-                    x2_3d, y1_3d,
-                    x2_3d - self.depth, y1_3d - self.depth,
-                    x1_3d - self.depth, y1_3d - self.depth,
-                    fill=SHELF_TOP_COLOR, outline="black"
-                )
-                
-                self.canvas.create_polygon(
-                    x2_3d, y1_3d,
-                    x2_3d - self.depth, y1_3d - self.depth,
-                    x2 - self.depth, y2 - self.depth,
-                    x2, y2,
-                    fill=SHELF_RIGHT_COLOR, outline="black"
-                )
-                
-                self.cell_coords[(level, shelf)] = (x1, y1, x2, y2)
+            log.info("Initial aspect ratio: %s", self.initial_aspect_ratio)
         
-        # Only draw category information if all dropdown values are non-empty
-        if not section or not aisle or not side:
-            print("Skipping category information drawing due to empty dropdown values")
-            print(f"Drew 3D shelf grid with {self.max_level} levels and {self.max_shelf} shelves")
-            return
+        # Redrawing the displayed bay keeps its zoom and pan; another bay starts fitted to the canvas
+        bay_key = (str(section), int(aisle), int(side))
+        keep_view = (
+            bay_key == self.bay_key and self.geometry is not None
+            and (self.geometry.max_level, self.geometry.max_shelf) == (self.max_level, self.max_shelf)
+        )
+        if keep_view:
+            geometry = self.geometry
+        else:
+            self.zoom = 1.0
+            geometry = self.centered_geometry()
+        self.set_geometry(geometry)
+        
+        # Show the cached scene of the bay if it was viewed before, otherwise build one
+        if self.scene is not None and self.bay_key != bay_key:
+            self.scene.hide()
+        scene = self.scene_cache.get(bay_key, self.max_level, self.max_shelf)
+        if scene is None:
+            scene = self.scene_cache.create(bay_key, self.max_level, self.max_shelf)
+            log.debug("Created shelf scene for %s levels and %s shelves", self.max_level, self.max_shelf)
+        else:
+            scene.show()
+            scene.reset_highlights()
+        self.scene = scene
+        self.bay_key = bay_key
+        # A scene laid out before is only scaled to the new geometry
+        if self.scene.geometry is None:
+            self.scene.layout(geometry)
+            log.debug("Laid out shelf scene: cell_width=%s, cell_height=%s, depth=%s", self.cell_width, self.cell_height, self.depth)
+        else:
+            self.scene.transform(geometry)
+            self.scene.refit_text()
+        self.update_scroll_region(reset=not keep_view)
+        
+        updated_cells = self.paint_bay(self.scene, section, aisle, side)
+        log.debug("Drew 3D shelf grid with %s levels and %s shelves (%s shelves repainted)", self.max_level, self.max_shelf, updated_cells)
+
+    def paint_bay(self, scene, section, aisle, side):
+        """Bring a scene's category bars and labels up to date with the model; returns the shelves repainted."""
+        # Family and Category of every shelf, looked up once per cell instead of masking the frame
+        model = self.controller.model
+        grid = model.get_bay_grid(section, aisle, side)
+        
+        # A scene painted before only needs the shelves changed since then
+        changed_rows = model.get_changes_since(scene.version) if scene.version is not None else None
+        if changed_rows is None:
+            cells = list(scene.cells())
+            self.assign_category_colors(grid.values())
+        else:
+            cells = model.get_cells_in_bay(sorted(changed_rows), section, aisle, side)
+            self.assign_category_colors(grid[cell] for cell in cells if cell in grid)
+        scene.version = model.version
+        
+        # Update the category bars and labels; unchanged shelves are left alone
+        updated_cells = 0
+        for level, shelf in cells:
+            if scene.has_cell((level, shelf)) and self.paint_cell(grid, level, shelf, scene):
+                updated_cells += 1
+        scene.flush()
+        return updated_cells
+
+    @traced("repaint_cells")
+    def repaint_cells(self, filtered_df, cells):
+        """Repaint only the given (level, shelf) cells of the displayed bay.
+
+        Other shelves of the bay changed since the scene was last painted are repainted too,
+        so the scene can be marked current. Returns False if there is no scene to update or
+        those changes are no longer known, in which case a full draw is needed.
+        """
+        if self.panorama is not None:
+            self.panorama.refresh()
+            return True
+        if self.scene is None or filtered_df is None or self.bay_key is None:
+            return False
+        model = self.controller.model
+        # Catch up on any other shelves changed since the scene was painted, so it is current afterwards
+        changed_rows = model.get_changes_since(self.scene.version)
+        if changed_rows is None:
+            return False
+        edited_cells = set(cells)
+        cells = edited_cells | model.get_cells_in_bay(sorted(changed_rows), *self.bay_key)
+        grid = model.get_bay_grid(*self.bay_key)
+        cells = [cell for cell in sorted(cells) if self.scene.has_cell(cell)]
+        self.assign_category_colors(grid[cell] for cell in cells if cell in grid)
+        for level, shelf in cells:
+            if (level, shelf) in edited_cells:
+                self.highlight_shelf(level, shelf, SHELF_FRONT_COLOR)
+            self.paint_cell(grid, level, shelf)
+        self.scene.flush()
+        self.scene.version = model.version
+        log.debug("Repainted %s shelves", len(cells))
+        return True
+
+    def paint_cell(self, grid, level, shelf, scene=None):
+        """Update the category bar and label of one shelf from the bay grid, on the displayed scene by default."""
+        family, category = grid.get((level, shelf), ("", ""))
         
-        # Calculate the maximum number of categories in any family in the current view
-        family_category_counts = filtered_df.groupby('Family')['Category'].nunique()
-        max_categories = family_category_counts.max() if not family_category_counts.empty else 0
-        print(f"Maximum number of categories in any family in current view: {max_categories}")
+        # Get the colors for the horizontal bar using Family|Category key
+        colors = self.view.category_colors.get(f"{family}|{category}", DEFAULT_BAR_COLORS)
+        return (scene or self.scene).paint_cell(level, shelf, family, category, colors)
+
+    def assign_category_colors(self, assignments):
+        """Assign palette colors to the (family, category) pairs that don't have one yet."""
+        categories_by_family = {}
+        for family, category in assignments:
+            if category:
+                categories_by_family.setdefault(family, set()).add(category)
         
         # Assign colors to categories, reusing existing assignments and ensuring uniqueness within families
-        for family in family_category_counts.index:
+        for family in sorted(categories_by_family):
             # Initialize color usage set for this family if not already present
             if family not in self.view.family_color_usage:
                 self.view.family_color_usage[family] = set()
             
             # Get unique categories for this family, sorted alphabetically for consistency
-            categories_in_family = sorted(filtered_df[filtered_df['Family'] == family]['Category'].dropna().unique())
-            for category in categories_in_family:
+            for category in sorted(categories_by_family[family]):
                 key = f"{family}|{category}"
                 # Skip if this category already has a color assigned
                 if key in self.view.category_colors:
@@ -655,167 +590,185 @@ class ShelfTab:
                 self.view.category_colors[key] = self.view.available_colors[color_idx]
                 self.view.family_color_usage[family].add(color_idx)
         
-        print(f"Updated category color mapping: {self.view.category_colors}")
+        log.debug("Updated category color mapping: %s", self.view.category_colors)
+
+    def centered_geometry(self):
+        """Return the layout of the displayed bay centered in the canvas at the current scale and zoom."""
+        self.canvas.update_idletasks()
+        return compute_geometry(
+            self.max_level, self.max_shelf, self.scale_factor * self.zoom,
+            self.canvas.winfo_width(), self.canvas.winfo_height(),
+            self.initial_aspect_ratio
+        )
+
+    def set_geometry(self, geometry):
+        """Make geometry the current layout of the displayed bay."""
+        self.geometry = geometry
+        self.cell_width = geometry.cell_width
+        self.cell_height = geometry.cell_height
+        self.depth = geometry.depth
+        self.label_font = geometry.label_font
+
+    def apply_view(self, geometry, reset_scroll=False):
+        """Scale the displayed scene to a zoomed or resized geometry with canvas transforms."""
+        self.scene.transform(geometry)
+        self.set_geometry(geometry)
+        self.update_scroll_region(reset_scroll)
+
+    def fit_to_canvas(self):
+        """Re-center the displayed bay after the canvas was resized, keeping the zoom.
+
+        Returns False if no bay is displayed, in which case a full draw is needed.
+        """
+        if self.panorama is not None:
+            view_x, view_y = self.canvas.canvasx(0), self.canvas.canvasy(0)
+            self.rescale_panorama(view_x, view_y, 0, 0)
+            return True
+        if self.scene is None or self.geometry is None:
+            return False
+        self.apply_view(self.centered_geometry(), reset_scroll=True)
+        return True
+
+    def zoom_at(self, x, y, factor):
+        """Zoom the displayed bay by factor around the canvas point (x, y), within ZOOM_MIN..ZOOM_MAX."""
+        if self.panorama is None and (self.scene is None or self.geometry is None):
+            return False
+        zoom = min(max(self.zoom * factor, ZOOM_MIN), ZOOM_MAX)
+        if zoom == self.zoom:
+            return False
+        factor = zoom / self.zoom
+        self.zoom = zoom
+        if self.panorama is not None:
+            self.rescale_panorama(x, y, x - self.canvas.canvasx(0), y - self.canvas.canvasy(0))
+        else:
+            self.apply_view(self.geometry.scaled(x, y, factor))
+        log.debug("Zoomed shelf view to %.2fx", self.zoom)
+        return True
+
+    def reset_zoom(self):
+        """Fit the displayed bay to the canvas again, undoing zooming and panning."""
+        if self.panorama is None and (self.scene is None or self.geometry is None):
+            return False
+        self.zoom = 1.0
+        return self.fit_to_canvas()
+
+    def settle_view(self):
+        """Finish a resize, zoom or pan: refit label fonts, re-render raster scenes and update hit-testing."""
+        self.update_dropdown_sizes()
+        if self.panorama is not None:
+            self.panorama.update(canvas_viewport(self.canvas))
+            self.panorama.settle()
+            return
+        if self.scene is None or self.geometry is None:
+            return
+        self.scene.refit_text()
+        self.scene.flush()
+
+    def update_scroll_region(self, reset=False):
+        """Let the canvas scroll over the whole bay; reset scrolls back to the canvas origin."""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        x1, y1, x2, y2 = self.geometry.bounds()
+        self.set_scroll_region((min(x1, 0), min(y1, 0), max(x2, width), max(y2, height)))
+        if reset:
+            self.scroll_to(0, 0)
+
+    def set_scroll_region(self, region):
+        """Set the (x1, y1, x2, y2) canvas box the view can scroll over."""
+        self.scroll_region = region
+        self.canvas.configure(scrollregion=region)
+
+    def scroll_to(self, x, y):
+        """Scroll the canvas so that the canvas point (x, y) is at the window's top-left corner."""
+        region = self.scroll_region
+        self.canvas.xview_moveto((x - region[0]) / (region[2] - region[0]))
+        self.canvas.yview_moveto((y - region[1]) / (region[3] - region[1]))
+
+    @traced("draw_panorama")
+    def draw_panorama(self, section, aisle):
+        """Show every bay of the selected aisle, or of its whole section, side by side.
+
+        Only bays in or near the visible part of the canvas get canvas items (see ShelfPanorama).
+        """
+        self.update_dropdown_sizes()
+        self.canvas.delete("reminder")
+        config = self.shelf_structure[section]
+        aisles = [aisle] if self.panorama_mode == "aisle" else range(1, config["aisles"] + 1)
+        rows = [[(str(section), a, side) for side in range(1, config["sides"] + 1)] for a in aisles]
+        if self.panorama is not None and self.panorama.rows == rows:
+            self.panorama.refresh()
+            self.panorama.update(canvas_viewport(self.canvas))
+            return
         
-        # Draw category information on the shelves
-        for level in range(1, self.max_level + 1):
-            display_row = self.max_level - level
-            for shelf in range(1, self.max_shelf + 1):
-                x1 = (shelf - 1) * self.cell_width + offset_x
-                y1 = display_row * self.cell_height + offset_y
-                x2 = x1 + self.cell_width
-                y2 = y1 + self.cell_height
-                
-                x1_3d = x1 + self.depth
-                y1_3d = y1
-                x2_3d = x2 + self.depth
-                y2_3d = y2
-                
-                # Use filtered_df to get the Family and Category for this shelf
-                mask = (
-                    (filtered_df['Level'] == level) &
-                    (filtered_df['Shelf'] == shelf)
-                )
-                row = filtered_df[mask]
-                if not row.empty:
-                    category = str(row.iloc[0]['Category'])
-                    family = str(row.iloc[0]['Family'])
-                    if pd.isna(category) or category == "" or category == "nan":
-                        continue
-                    
-                    # Get the colors for the horizontal bar using Family|Category key
-                    key = f"{family}|{category}"
-                    colors = self.view.category_colors.get(key, {
-                        'front': "gray",
-                        'top': "lightgray",
-                        'right': "darkgray"
-                    })
-                    bar_color_front = colors['front']
-                    bar_color_top = colors['top']
-                    bar_color_right = colors['right']
-                    
-                    # Calculate the dimensions of the horizontal bar
-                    bar_width = self.cell_width  # 100% of the shelf width
-                    bar_height = self.cell_height * 0.4  # 40% of the shelf height
-                    bar_x1 = x1_3d  # Span the full width of the shelf
-                    bar_x2 = x2_3d
-                    bar_y1 = (y1_3d + y2_3d) / 2 - bar_height / 2  # Center the bar vertically
-                    bar_y2 = bar_y1 + bar_height
-                    
-                    # Draw the 3D horizontal bar
-                    # Front face
-                    print(f"Drawing 3D horizontal bar for L{level} S{shelf} (Family: {family}, Category: {category}): x1={bar_x1}, x2={bar_x2}, y1={bar_y1}, y2={bar_y2}, front_color={bar_color_front}")
-                    self.canvas.create_polygon(
-                        bar_x1, bar_y1,
-                        bar_x2, bar_y1,
-                        bar_x2, bar_y2,
-                        bar_x1, bar_y2,
-                        fill=bar_color_front, outline=""
-                    )
-                    # Top face
-                    self.canvas.create_polygon(
-                        bar_x1, bar_y1,
-                        bar_x2, bar_y1,
-                        bar_x2 - self.depth, bar_y1 - self.depth,
-                        bar_x1 - self.depth, bar_y1 - self.depth,
-                        fill=bar_color_top, outline=""
-                    )
-                    # Right face
-                    self.canvas.create_polygon(
-                        bar_x2, bar_y1,
-                        bar_x2 - self.depth, bar_y1 - self.depth,
-                        bar_x2 - self.depth, bar_y2 - self.depth,
-                        bar_x2, bar_y2,
-                        fill=bar_color_right, outline=""
-                    )
-                    
-                    # Draw the Category text in black, centered on the shelf
-                    # Step 1: Calculate the maximum font size based on shelf dimensions
-                    max_width = self.cell_width - 20  # Padding to prevent overflow
-                    max_height = self.cell_height - 20  # Padding to prevent overflow
-                    
-                    # Start with a conservative font size
-                    font_size = int(self.cell_width / 15)
-                    font_size = max(font_size, 6)  # Minimum font size
-                    
-                    # Split the text into words
-                    words = category.split()  # Split at spaces
-                    lines = []
-                    
-                    # Step 2: Adjust font size and calculate lines to fit within the shelf
-                    while font_size > 6:  # Minimum font size
-                        avg_char_width = font_size * 0.7  # Adjusted multiplier for better fit
-                        max_chars_per_line = int(max_width / avg_char_width)
-                        print(f"Trying font size {font_size}, max_chars_per_line={max_chars_per_line} for category '{category}'")
-                        
-                        # Split text into lines based on the current font size
-                        lines = []
-                        current_line = []
-                        current_char_count = 0
-                        
-                        for word in words:
-                            word_length = len(word)
-                            # Account for the space between words (1 char per space)
-                            space_needed = 1 if current_line else 0
-                            if current_char_count + word_length + space_needed <= max_chars_per_line:
-                                current_line.append(word)
-                                current_char_count += word_length + space_needed
-                            else:
-                                if current_line:
-                                    lines.append(" ".join(current_line))
-                                current_line = [word]
-                                current_char_count = word_length
-                        if current_line:
-                            lines.append(" ".join(current_line))
-                        
-                        # Calculate the total text height
-                        num_lines = len(lines)
-                        line_spacing = font_size * 1.1
-                        total_text_height = num_lines * line_spacing
-                        
-                        # Check if the text fits within the shelf dimensions
-                        fits_width = all(len(line) * avg_char_width <= max_width for line in lines)
-                        fits_height = total_text_height <= max_height
-                        print(f"Font size {font_size}: num_lines={num_lines}, total_text_height={total_text_height}, fits_width={fits_width}, fits_height={fits_height}")
-                        
-                        if fits_width and fits_height:
-                            break  # Font size is good
-                        font_size -= 1  # Reduce font size and try again
-                    
-                    # Step 3: Reduce font size by 30% as requested
-                    original_font_size = font_size
-                    font_size = int(font_size * 0.7)  # Reduce by 30%
-                    font_size = max(font_size, 6)  # Ensure minimum font size
-                    print(f"Reduced font size by 30%: from {original_font_size} to {font_size} for category '{category}'")
-                    
-                    # Recalculate line spacing and total text height with the new font size
-                    line_spacing = font_size * 1.1
-                    total_text_height = num_lines * line_spacing
-                    
-                    # Step 4: Draw the text with the adjusted font size
-                    self.shelf_text_font = ('Helvetica', font_size, 'bold')
-                    print(f"Final font size {font_size} for category '{category}' on shelf L{level} S{shelf}, lines={num_lines}")
-                    
-                    start_y = (y1 + y2) / 2 - total_text_height / 2 + line_spacing / 2
-                    
-                    for idx, line in enumerate(lines):
-                        text_x = (x1 + x2) / 2 + self.depth / 2
-                        text_y = start_y + idx * line_spacing
-                        self.canvas.create_text(
-                            text_x, text_y,
-                            text=line,
-                            font=self.shelf_text_font,
-                            fill="black",
-                            anchor="center"
-                        )
-        print(f"Drew 3D shelf grid with {self.max_level} levels and {self.max_shelf} shelves")
-
-    def get_selection_coords(self):
-        """Return the coordinates of the shelves for selection."""
-        return self.cell_coords
+        # The single-bay scene stays cached for when the panorama is closed
+        self.close_panorama()
+        self.hide_scene()
+        self.zoom = 1.0
+        self.panorama = ShelfPanorama(
+            self.canvas, rows, self.scale_factor * PANORAMA_BAY_SCALE, self.initial_aspect_ratio,
+            self.bay_size, lambda scene, bay: self.paint_bay(scene, *bay), self.scene_cache.photo_factory
+        )
+        self.update_panorama_scroll_region()
+        # Start at the selected aisle's row of a section panorama
+        row = self.panorama.row_of(aisle) or 0
+        self.scroll_to(0, row * self.panorama.slot_size()[1])
+        self.panorama.update(canvas_viewport(self.canvas))
+        log.debug("Opened %s panorama with %s bays", self.panorama_mode, sum(len(r) for r in rows))
+
+    def bay_size(self, bay):
+        """Return the (max_level, max_shelf) of a bay, or None if it has no shelves."""
+        filtered_df = self.controller.model.get_filtered_data(*bay)
+        if filtered_df is None or filtered_df.empty:
+            return None
+        return int(filtered_df['Level'].max()), int(filtered_df['Shelf'].max())
+
+    def rescale_panorama(self, x, y, window_x, window_y):
+        """Rescale the panorama to the current scale and zoom, keeping the canvas point (x, y) at window_x, window_y."""
+        factor = self.panorama.rescale(self.scale_factor * self.zoom * PANORAMA_BAY_SCALE)
+        self.update_panorama_scroll_region()
+        self.scroll_to(x * factor - window_x, y * factor - window_y)
+        self.panorama.update(canvas_viewport(self.canvas))
+
+    def update_panorama_scroll_region(self):
+        """Let the canvas scroll over the whole panorama."""
+        width, height = self.panorama.size()
+        self.set_scroll_region((0, 0, max(width, self.canvas.winfo_width()), max(height, self.canvas.winfo_height())))
+
+    def cull_panorama(self):
+        """Build the panorama bays scrolled into view and release those scrolled far out of it."""
+        if self.panorama is not None:
+            self.panorama.update(canvas_viewport(self.canvas))
+
+    def close_panorama(self):
+        """Delete the canvas items of the panorama, if one is shown."""
+        if self.panorama is not None:
+            self.panorama.clear()
+            self.panorama = None
+
+    def hide_scene(self):
+        """Hide the displayed shelf scene; it stays cached for the next visit to its bay."""
+        if self.scene is not None:
+            self.scene.hide()
+            self.scene = None
+        self.bay_key = None
+        self.geometry = None
+
+    def clear_scene(self):
+        """Hide the displayed shelf scene and scroll back to the canvas origin."""
+        self.hide_scene()
+        # Scroll back to the canvas origin, where the reminder message is drawn
+        self.set_scroll_region((0, 0, self.canvas.winfo_width(), self.canvas.winfo_height()))
+        self.scroll_to(0, 0)
+
+    def get_cells_in_rect(self, x1, y1, x2, y2):
+        """Return the (level, shelf) cells overlapped by a selection rectangle on the canvas."""
+        if self.scene is None or self.geometry is None:
+            return set()
+        return self.geometry.cells_in_rect(x1, y1, x2, y2)
 
     def highlight_shelf(self, level, shelf, color):
         """Highlight the front face of a shelf with the given color."""
-        front_face_tag = f"front_face_{level}_{shelf}"
-        self.canvas.itemconfig(front_face_tag, fill=color)
-        print(f"{'Highlighted' if color == 'lightblue' else 'Reset color for'} shelf (L{level}, S{shelf}) with tag {front_face_tag}")
\ No newline at end of file
+        if self.scene is None or not self.scene.has_cell((level, shelf)):
+            return
+        self.scene.highlight(level, shelf, color)
+        log.debug("%s shelf (L%s, S%s)", 'Highlighted' if color == 'lightblue' else 'Reset color for', level, shelf)
\ No newline at end of file
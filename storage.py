@@ -0,0 +1,53 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Prefixes of the arrays stored for each column in the .npz working file
+VALUES_PREFIX = "values:"  # Numeric column values, or the codes of a string column
+LABELS_PREFIX = "labels:"  # Distinct values of a string column, indexed by its codes
+COLUMNS_KEY = "columns"
+LAYOUT_KEY = "layout"  # Id of the row layout the frame belongs to, matched against journal records
+
+def save_frame(df, path, layout_id=""):
+    """Save the assignment frame and the id of its row layout to a columnar NumPy .npz file.
+
+    Numeric columns are stored as-is; string columns are dictionary-encoded as integer
+    codes plus a small array of distinct labels, with missing values stored as "".
+    Categorical columns are written straight from their codes and categories.
+    """
+    arrays = {COLUMNS_KEY: np.array([str(column) for column in df.columns]), LAYOUT_KEY: np.array(layout_id)}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            arrays[VALUES_PREFIX + column] = values.cat.codes.to_numpy().astype(np.int32)
+            arrays[LABELS_PREFIX + column] = np.array(values.cat.categories.astype(str), dtype=str)
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            arrays[VALUES_PREFIX + column] = values.to_numpy()
+        else:
+            codes, labels = pd.factorize(values.fillna("").astype(str))
+            arrays[VALUES_PREFIX + column] = codes.astype(np.int32)
+            arrays[LABELS_PREFIX + column] = np.array(labels, dtype=str)
+    # Write to a temporary file and rename it over the target, so a crash mid-write never
+    # leaves a truncated working file; the file object also stops NumPy appending .npz
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def load_frame(path):
+    """Load a frame saved by save_frame; returns (frame, layout_id), with string columns as categoricals.
+
+    Files written before layout ids were stored have the layout id "".
+    """
+    with np.load(path, allow_pickle=False) as data:
+        columns = {}
+        for column in data[COLUMNS_KEY].tolist():
+            values = data[VALUES_PREFIX + column]
+            labels_key = LABELS_PREFIX + column
+            if labels_key in data.files:
+                values = pd.Categorical.from_codes(values, categories=data[labels_key].astype(object))
+            columns[column] = values
+        layout_id = str(data[LAYOUT_KEY]) if LAYOUT_KEY in data.files else ""
+    return pd.DataFrame(columns), layout_id
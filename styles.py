@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
-from constants import BUTTON_FONT, DROPDOWN_FONT
+from constants import BUTTON_FONT, DROPDOWN_FONT, TABLE_ROW_HEIGHT
 
 def apply_styles(style):
     """Apply custom styles to ttk widgets."""
@@ -8,7 +8,7 @@ def apply_styles(style):
     style.configure("Custom.TFrame", background="#f0f0e8")
     
     # Configure the style for Treeview
-    style.configure("Treeview", rowheight=35, font=('Helvetica', 10), background="#f0f0e8")
+    style.configure("Treeview", rowheight=TABLE_ROW_HEIGHT, font=('Helvetica', 10), background="#f0f0e8")
     style.configure("Treeview.Heading", font=('Helvetica', 12, 'bold'))
     
     # Configure the style for buttons with better contrast and simulated rounded corners
@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
 from constants import *
+from instrumentation import get_logger, traced
+
+log = get_logger("table_view")
 
 class TableTab:
     def __init__(self, tab, controller, view):
@@ -9,6 +12,15 @@ class TableTab:
         self.view = view
         self.tree = None
         self.dropdown = None
+        self.yscroll = None
+        
+        # Virtual scrolling state: only rows [window_start, window_end) exist as Treeview items
+        self.row_offset = 0  # Position of the first visible row
+        self.visible_rows = 1
+        self.window_start = 0
+        self.window_end = 0
+        self.rendered_version = None  # Model version the materialized rows reflect
+        self.scrolling = False  # Set while load_window positions the Treeview itself
 
     def create(self):
         """Create the table view tab with a Treeview for data editing."""
@@ -24,17 +36,17 @@ class TableTab:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=100)
         
-        self.update_treeview()
-        
-        # Add scrollbars
-        yscroll = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        # Add scrollbars; the vertical one drives the virtual row offset over the whole data set
+        self.yscroll = ttk.Scrollbar(frame, orient="vertical", command=self.on_scrollbar)
         xscroll = ttk.Scrollbar(frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=yscroll.set, xscrollcommand=xscroll.set)
+        self.tree.configure(yscrollcommand=self.on_tree_scrolled, xscrollcommand=xscroll.set)
         print("Added scrollbars to Treeview")
         
+        self.update_treeview()
+        
         # Layout the Treeview and scrollbars
         self.tree.grid(row=0, column=0, sticky="nsew")
-        yscroll.grid(row=0, column=1, sticky="ns")
+        self.yscroll.grid(row=0, column=1, sticky="ns")
         xscroll.grid(row=1, column=0, sticky="ew")
         frame.grid_rowconfigure(0, weight=1)
         frame.grid_columnconfigure(0, weight=1)
@@ -43,25 +55,134 @@ class TableTab:
         # Bind click event to the Treeview
         self.tree.bind("<ButtonRelease-1>", self.controller.on_table_click)
         
+        # Resize and mouse wheel events move the virtual window
+        self.tree.bind("<Configure>", self.on_tree_resized)
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", self.on_mouse_wheel)  # Linux scroll up
+        self.tree.bind("<Button-5>", self.on_mouse_wheel)  # Linux scroll down
+        
         # Add Save button
         save_button = ttk.Button(frame, text="Save", command=self.controller.save_data, style=BUTTON_STYLE)
         save_button.grid(row=2, column=0, pady=10, columnspan=2)
         print("Added Save button to Table View tab")
 
+    def set_columns(self, columns):
+        """Reconfigure the Treeview columns, e.g. once the data has loaded."""
+        if list(self.tree["columns"]) == list(columns):
+            return
+        self.tree.configure(columns=columns)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100)
+        print(f"Updated Treeview columns: {columns}")
+
+    @traced("update_treeview")
     def update_treeview(self):
         """Update the Treeview with the latest data."""
-        print("Refreshing Table View")
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        log.debug("Refreshing Table View")
+        self.rendered_version = self.controller.get_data_version()
+        self.load_window(self.row_offset, force=True)
+        log.debug("Materialized rows %s-%s of %s in Treeview", self.window_start, self.window_end, self.controller.get_row_count())
+
+    @traced("refresh_treeview")
+    def refresh_treeview(self):
+        """Bring the Treeview up to date, touching only the rows changed since the last refresh."""
+        version = self.controller.get_data_version()
+        if version == self.rendered_version:
+            log.debug("Table View is up to date; skipping refresh")
+            return
+        changed = self.controller.get_changes_since(self.rendered_version)
+        if changed is None:
+            self.update_treeview()
+            return
+        
+        # Only rows that are currently materialized need updating; the rest are fetched fresh on scroll
+        visible_changed = [row_id for row_id in changed if self.tree.exists(str(row_id))]
+        for row_id, values in self.controller.get_rows_by_id(visible_changed):
+            self.tree.item(str(row_id), values=values)
+        self.rendered_version = version
+        log.debug("Updated %s of %s changed rows in Table View", len(visible_changed), len(changed))
+
+    def load_window(self, offset, force=False):
+        """Scroll the virtual table to offset, fetching rows from the model if they are not materialized."""
+        total = self.controller.get_row_count()
+        offset = max(0, min(int(offset), max(total - self.visible_rows, 0)))
+        self.row_offset = offset
+        
+        if force or offset < self.window_start or offset + self.visible_rows > self.window_end:
+            # Materialize the visible rows plus a buffer on either side
+            start = max(offset - TABLE_ROW_BUFFER, 0)
+            stop = min(offset + self.visible_rows + TABLE_ROW_BUFFER, total)
+            self.tree.delete(*self.tree.get_children())
+            for row_id, values in self.controller.get_rows(start, stop):
+                self.tree.insert("", "end", iid=str(row_id), values=values)
+            self.window_start = start
+            self.window_end = stop
         
-        # Get the latest data
-        df = self.controller.get_data()
-        for idx, row in df.iterrows():
-            self.tree.insert("", "end", iid=str(idx), values=list(row))
-        print(f"Inserted {len(df)} rows into Treeview")
+        # Scroll the Treeview so that the row at offset is the first visible item; the
+        # intermediate position after moveto(0) must not be taken for a user scroll
+        self.scrolling = True
+        try:
+            self.tree.yview_moveto(0)
+            self.tree.yview_scroll(offset - self.window_start, "units")
+        finally:
+            self.scrolling = False
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        """Position the vertical scrollbar relative to the full data set."""
+        total = self.controller.get_row_count()
+        if total == 0:
+            self.yscroll.set(0, 1)
+            return
+        first = self.row_offset / total
+        last = min((self.row_offset + self.visible_rows) / total, 1.0)
+        self.yscroll.set(first, last)
+
+    def on_scrollbar(self, *args):
+        """Handle vertical scrollbar drags and clicks."""
+        total = self.controller.get_row_count()
+        if args[0] == "moveto":
+            offset = float(args[1]) * total
+        elif args[0] == "scroll":
+            step = int(args[1])
+            offset = self.row_offset + (step * self.visible_rows if args[2] == "pages" else step)
+        else:
+            return
+        self.load_window(offset)
+
+    def on_mouse_wheel(self, event):
+        """Scroll the virtual window with the mouse wheel."""
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.load_window(self.row_offset - 3)
+        else:
+            self.load_window(self.row_offset + 3)
+        return "break"
+
+    def on_tree_scrolled(self, first, last):
+        """Track scrolling done by the Treeview itself (e.g. keyboard navigation)."""
+        count = self.window_end - self.window_start
+        if count == 0 or self.scrolling:
+            return
+        offset = self.window_start + round(float(first) * count)
+        if offset != self.row_offset:
+            self.row_offset = offset
+            at_top = offset <= self.window_start and self.window_start > 0
+            at_bottom = offset + self.visible_rows >= self.window_end and self.window_end < self.controller.get_row_count()
+            if at_top or at_bottom:
+                # Reached the edge of the materialized rows; fetch the next window once idle
+                self.tree.after_idle(self.load_window, offset)
+            self.update_scrollbar()
+
+    def on_tree_resized(self, event):
+        """Recompute how many rows fit in the Treeview and refill the window."""
+        visible_rows = max(event.height // TABLE_ROW_HEIGHT, 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.load_window(self.row_offset)
 
     def update_treeview_row(self, row_id, values):
         """Update a specific row in the Treeview."""
-        print(f"Updating Treeview row {row_id} with values: {values}")
-        self.tree.item(row_id, values=values)
\ No newline at end of file
+        log.debug("Updating Treeview row %s with values: %s", row_id, values)
+        if self.tree.exists(row_id):
+            self.tree.item(row_id, values=values)
\ No newline at end of file
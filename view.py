@@ -5,8 +5,12 @@ from .menu_bar import create_menu_bar
 from .logo_display import create_logo
 from .table_tab import TableTab
 from .shelf_tab import ShelfTab
+from .batch_export_dialog import BatchExportDialog
 from .styles import apply_styles
-from constants import LARGE_FONT
+from constants import LARGE_FONT, CATEGORY_PALETTE
+from instrumentation import get_logger
+
+log = get_logger("view")
 
 class ShelfView:
     def __init__(self, root, controller):
@@ -37,41 +41,26 @@ class ShelfView:
         self.shelf_tab = None
         self.notebook = None
         self.style = None
+        self.loading_frame = None
+        self.loading_label = None
+        self.loading_bar = None
         
         # Persistent color mapping for categories within families
         self.category_colors = {}
         self.family_color_usage = {}
-        self.available_colors = [
-            {'front': "#87CEEB", 'top': "#B0E0E6", 'right': "#5F9EA0"},
-            {'front': "#90EE90", 'top': "#ADFF2F", 'right': "#7FFF00"},
-            {'front': "#F08080", 'top': "#FF4040", 'right': "#CD5C5C"},
-            {'front': "#FFFF99", 'top': "#FFFFCC", 'right': "#EEE8AA"},
-            {'front': "#FFB6C1", 'top': "#FFC1CC", 'right': "#FF9999"},
-            {'front': "#E0FFFF", 'top': "#EFFFFF", 'right': "#B0E0E6"},
-            {'front': "#FFA07A", 'top': "#FFBB99", 'right': "#FF8C69"},
-            {'front': "#D3D3D3", 'top': "#E6E6E6", 'right': "#C0C0C0"},
-            {'front': "#98FB98", 'top': "#BFFFBA", 'right': "#90EE90"},
-            {'front': "#FFDAB9", 'top': "#FFE4C4", 'right': "#FFCC99"},
-            {'front': "#FFECB3", 'top': "#FFF9C4", 'right': "#FFD54F"},
-            {'front': "#B0C4DE", 'top': "#C6D9F1", 'right': "#9AC0CD"},
-            {'front': "#F0E68C", 'top': "#FFFACD", 'right': "#EEE8AA"},
-            {'front': "#FFE4E1", 'top': "#FFE4E4", 'right': "#FFB6C1"},
-            {'front': "#E6E6FA", 'top': "#F0F0FF", 'right': "#D8BFD8"},
-            {'front': "#FFDEAD", 'top': "#FFEFD5", 'right': "#FFCE96"},
-            {'front': "#DDA0DD", 'top': "#E6B0E6", 'right': "#DA70D6"},
-            {'front': "#F5F5DC", 'top': "#FFFFE4", 'right': "#F0EAD6"},
-            {'front': "#AFEEEE", 'top': "#C1F0F0", 'right': "#96CDCD"},
-            {'front': "#FFFACD", 'top': "#FFFDE7", 'right': "#FFFACD"},
-        ]
+        self.available_colors = CATEGORY_PALETTE
         
         # Load the original logo image to get its aspect ratio
         try:
             logo_image = Image.open("enson_logo.jpg")
             self.original_logo_width, self.original_logo_height = logo_image.size
             self.logo_aspect_ratio = self.original_logo_width / self.original_logo_height
-            print(f"Original logo dimensions: {self.original_logo_width}x{self.original_logo_height}, aspect ratio: {self.logo_aspect_ratio}")
+            log.debug(
+                "Original logo dimensions: %sx%s, aspect ratio: %s",
+                self.original_logo_width, self.original_logo_height, self.logo_aspect_ratio
+            )
         except Exception as e:
-            print(f"Failed to load original logo for aspect ratio: {str(e)}")
+            log.warning("Failed to load original logo for aspect ratio: %s", e)
             # Fallback to a default aspect ratio (2:1) if the image can't be loaded
             self.logo_aspect_ratio = 2.0
             self.original_logo_width = 100
@@ -80,7 +69,7 @@ class ShelfView:
         # Initialize UI components (without setting dropdowns)
         self.initialize_ui()
         
-        print("ShelfView initialization completed")
+        log.debug("ShelfView initialization completed")
 
     def initialize_ui(self):
         """Initialize all UI components after the controller is set."""
@@ -103,7 +92,7 @@ class ShelfView:
         self.root.bind("<Configure>", self.on_resize)
         
         # Create tabbed interface
-        print("Creating ttk.Notebook for tabbed interface")
+        log.debug("Creating ttk.Notebook for tabbed interface")
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
         
@@ -112,7 +101,7 @@ class ShelfView:
         self.shelf_tab_frame = ttk.Frame(self.notebook, style="Custom.TFrame")
         self.notebook.add(self.table_tab, text="Table View")
         self.notebook.add(self.shelf_tab_frame, text="Shelf View")
-        print("Tabs created: Table View, Shelf View")
+        log.debug("Tabs created: Table View, Shelf View")
         
         # Initialize tab views
         self.table_tab_component = TableTab(self.table_tab, self.controller, self)
@@ -122,20 +111,43 @@ class ShelfView:
         
         # Bind tab change event after tabs are fully initialized
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        
+        # Progress indicator shown below the tabs while the data loads
+        self.loading_frame = ttk.Frame(self.root, style="Custom.TFrame")
+        self.loading_label = ttk.Label(self.loading_frame, text="", font=LARGE_FONT)
+        self.loading_label.pack(side="left", padx=10)
+        self.loading_bar = ttk.Progressbar(self.loading_frame, mode="determinate", length=300)
+        self.loading_bar.pack(side="left", padx=10, pady=5)
+
+    def show_loading_progress(self, total_steps, text):
+        """Show the loading indicator with the given number of steps."""
+        self.loading_bar.configure(maximum=total_steps, value=0)
+        self.loading_label.configure(text=text)
+        self.loading_frame.pack(side="bottom", fill="x", before=self.notebook)
+
+    def update_loading_progress(self, finished_steps, text):
+        """Advance the loading indicator."""
+        self.loading_bar.configure(value=finished_steps)
+        self.loading_label.configure(text=text)
+
+    def hide_loading_progress(self):
+        """Remove the loading indicator once loading has finished or failed."""
+        self.loading_frame.pack_forget()
 
     def initialize_dropdowns(self):
         """Initialize dropdown values after the UI is fully ready."""
         if self.shelf_tab:
             self.shelf_tab.initialize_dropdowns()
         else:
-            print("Warning: ShelfTab not initialized; cannot set dropdowns.")
+            log.warning("ShelfTab not initialized; cannot set dropdowns.")
 
     def on_tab_changed(self, event):
         """Handle tab change events to refresh the Table View when selected."""
         selected_tab = self.notebook.tab(self.notebook.select(), "text")
-        print(f"Tab changed to: {selected_tab}")
+        log.debug("Tab changed to: %s", selected_tab)
         if selected_tab == "Table View":
-            self.table_tab_component.update_treeview()
+            if self.controller.is_loaded("assignments"):
+                self.table_tab_component.refresh_treeview()
         elif selected_tab == "Shelf View":
             self.controller.update_shelf_view()
 
@@ -170,13 +182,17 @@ class ShelfView:
             logo_photo = ImageTk.PhotoImage(logo_image)
             self.logo_label.configure(image=logo_photo)
             self.logo_label.image = logo_photo  # Keep a reference to avoid garbage collection
-            print(f"Resized logo to {new_logo_width}x{new_logo_height}")
+            log.debug("Resized logo to %sx%s", new_logo_width, new_logo_height)
         except Exception as e:
-            print(f"Failed to resize logo: {str(e)}")
+            log.warning("Failed to resize logo: %s", e)
+
+    def open_batch_export_dialog(self):
+        """Open the dialog that exports the layouts of many bays to one PDF."""
+        BatchExportDialog(self.root, self.controller, self)
 
     def show_message(self, title, message):
         """Display a message to the user."""
-        print(f"Showing message box: Title='{title}', Message='{message}'")
+        log.info("Showing message box: Title=%r, Message=%r", title, message)
         if "Success" not in title:
             messagebox.showwarning(title, message)
         else: